@@ -0,0 +1,7 @@
+"""
+Benchmarks del pipeline de ingesta y limpieza de datos COVID-19.
+
+Incluye un generador de reportes diarios sintéticos con la forma de los datos
+de JHU CSSE, para medir el rendimiento sin descargar el repositorio original,
+y un reporte de tiempos de importación en frío.
+"""
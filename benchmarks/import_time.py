@@ -0,0 +1,164 @@
+"""
+Reporte de tiempos de importación (arranque en frío)
+
+Importa cada módulo en un intérprete nuevo con `python -X importtime` y
+registra el tiempo de pared, el tiempo acumulado informado por Python, si se
+cargaron pandas/numpy/plotly y los módulos más costosos. Sirve para vigilar que
+importar constantes de src.config siga sin cargar pandas, y para medir el
+costo de las dependencias del dashboard (que sí carga pandas y pyarrow).
+
+Uso:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module src.config --module dashboard_deps --repeat 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+# Directorio raíz del proyecto (desde donde se importan los módulos)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directorio de los resultados (mismo que run_benchmarks, sin importar pandas aquí)
+BENCHMARK_DIR = os.path.join(BASE_DIR, 'reports', 'benchmarks')
+
+# Objetivos por defecto. Formato: 'nombre': sentencia de importación
+IMPORT_TARGETS = {
+    'src.config': 'import src.config',
+    'src.config (constantes)': 'from src.config import COUNTRY_MAPPING, DATA_PROCESSED',
+    'src.cache': 'import src.cache',
+    'src.aggregates': 'import src.aggregates',
+    'src.filtering': 'import src.filtering',
+    'dashboard_deps': 'import streamlit; import src.config, src.cache, src.aggregates, src.filtering',
+    'plotly': 'import plotly.express, plotly.graph_objects',
+}
+
+# Dependencias pesadas cuya carga se informa en el reporte
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly', 'pyarrow', 'streamlit']
+
+# Código que se ejecuta en el intérprete nuevo: mide el tiempo de pared del
+# import e informa qué dependencias pesadas quedaron cargadas
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Interpreta la salida de `python -X importtime`.
+
+    Args:
+        stderr (str): Salida de error del intérprete
+
+    Returns:
+        list: Diccionarios con 'module', 'self_us' y 'cumulative_us'
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules.append({
+            'module': fields[2].strip(),
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1]),
+        })
+    return modules
+
+
+def _run_probe(statement):
+    """Ejecuta la sonda en un intérprete nuevo y devuelve (resultado, módulos importados)."""
+    probe = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, cwd=BASE_DIR, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+
+def measure_import(statement, repeat=3, top=10, baseline=None):
+    """
+    Mide una sentencia de importación en intérpretes nuevos.
+
+    Args:
+        statement (str): Sentencia a ejecutar, por ejemplo 'import src.config'
+        repeat (int): Número de intérpretes (se informa el mejor tiempo)
+        top (int): Cantidad de módulos más costosos a informar
+        baseline (set, optional): Módulos que el intérprete importa sin la sentencia
+            (arranque y sonda); se excluyen del total y del ranking
+
+    Returns:
+        dict: 'seconds', 'loaded', 'total_import_ms' y 'heaviest'
+    """
+    if baseline is None:
+        baseline = set()
+
+    best = None
+    for _ in range(repeat):
+        result, modules = _run_probe(statement)
+        if best is None or result['seconds'] < best['seconds']:
+            best = dict(result, modules=modules)
+
+    modules = [m for m in best.pop('modules') if m['module'].strip() not in baseline]
+    total_us = sum(m['self_us'] for m in modules)
+    heaviest = sorted(modules, key=lambda m: m['self_us'], reverse=True)[:top]
+    best['total_import_ms'] = total_us / 1000
+    best['heaviest'] = [{'module': m['module'].strip(), 'self_ms': m['self_us'] / 1000} for m in heaviest]
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte de tiempos de importación en frío")
+    parser.add_argument('--module', action='append', dest='modules',
+                        help=f"Objetivo a medir (repetible). Opciones: {', '.join(IMPORT_TARGETS)}")
+    parser.add_argument('--repeat', type=int, default=3, help="Intérpretes por objetivo")
+    parser.add_argument('--top', type=int, default=5, help="Módulos más costosos a mostrar")
+    parser.add_argument('--output', help="Archivo JSON de salida")
+    args = parser.parse_args()
+
+    targets = args.modules or list(IMPORT_TARGETS)
+    _, startup_modules = _run_probe('pass')
+    baseline = {m['module'].strip() for m in startup_modules}
+
+    results = {}
+    print(f"{'Objetivo':<26} {'Tiempo':>10}  Dependencias cargadas")
+    for name in targets:
+        statement = IMPORT_TARGETS.get(name, f"import {name}")
+        try:
+            results[name] = measure_import(statement, repeat=args.repeat, top=args.top,
+                                           baseline=baseline)
+        except subprocess.CalledProcessError as e:
+            print(f"✗ {name}: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            continue
+        result = results[name]
+        print(f"{name:<26} {result['seconds'] * 1000:>8.1f}ms  {', '.join(result['loaded']) or '-'}")
+        for module in result['heaviest']:
+            print(f"{'':<28}{module['self_ms']:>8.1f}ms  {module['module']}")
+
+    output = args.output
+    if output is None:
+        output = os.path.join(BENCHMARK_DIR, f"import_time_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version.split()[0],
+                'repeat': args.repeat,
+            },
+            'targets': results,
+        }, f, indent=2)
+    print(f"\n✓ Resultados guardados en {output}")
+
+
+if __name__ == '__main__':
+    main()
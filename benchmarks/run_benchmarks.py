@@ -0,0 +1,255 @@
+"""
+Benchmark del pipeline de ingesta y limpieza
+
+Genera (o reutiliza) reportes diarios sintéticos con forma JHU y mide cada etapa
+del pipeline: load_daily_reports, cada paso de clean_covid_data y
+load_continent_mapping. Para cada etapa registra el tiempo, las filas de
+entrada/salida, el throughput y el pico de memoria (tracemalloc), y guarda los
+resultados en JSON para comparar entre commits sin conexión.
+
+Uso:
+    python -m benchmarks.run_benchmarks --end 2020-12-31 --counties 3000
+    python -m benchmarks.run_benchmarks --data-dir /tmp/jhu_sintetico --compare reports/benchmarks/anterior.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    REPORTS_DIR,
+    calculate_active_cases,
+    consolidate_duplicate_columns,
+    convert_numeric_columns,
+    drop_irrelevant_columns,
+    homogenize_country_names,
+    load_continent_mapping,
+    load_daily_reports,
+    process_dates,
+    standardize_column_names,
+)
+
+from .synthetic_data import generate_daily_reports
+
+# Directorio por defecto de los resultados
+BENCHMARK_DIR = os.path.join(REPORTS_DIR, 'benchmarks')
+
+# Pasos de clean_covid_data en orden
+CLEANING_STEPS = [
+    ('standardize_column_names', standardize_column_names),
+    ('consolidate_duplicate_columns', consolidate_duplicate_columns),
+    ('drop_irrelevant_columns', drop_irrelevant_columns),
+    ('process_dates', process_dates),
+    ('convert_numeric_columns', convert_numeric_columns),
+    ('calculate_active_cases', calculate_active_cases),
+    ('homogenize_country_names', homogenize_country_names),
+]
+
+
+def _git_commit():
+    """Hash corto del commit actual (o None si no hay repositorio git)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure_stage(name, func, make_input, rows_in, repeat=3):
+    """
+    Mide una etapa: mejor tiempo de `repeat` ejecuciones y pico de memoria.
+
+    La entrada se construye con make_input() antes de cada ejecución (fuera de
+    la medición), porque varios pasos modifican el DataFrame en el lugar. La
+    salida estándar de la etapa se descarta.
+
+    Args:
+        name (str): Nombre de la etapa
+        func (callable): Función que recibe la entrada y devuelve un DataFrame
+        make_input (callable): Función sin argumentos que construye la entrada
+        rows_in (int): Filas de entrada (para el throughput)
+        repeat (int): Número de ejecuciones cronometradas
+
+    Returns:
+        tuple: (resultado de la última ejecución, dict con las métricas)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        data = make_input()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func(data)
+            timings.append(time.perf_counter() - start)
+        del data
+
+    # Ejecución separada con tracemalloc (su sobrecosto no afecta los tiempos)
+    data = make_input()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+
+    seconds = min(timings)
+    metrics = {
+        'stage': name,
+        'seconds': seconds,
+        'rows_in': int(rows_in),
+        'rows_out': int(len(result)) if result is not None else 0,
+        'rows_per_second': rows_in / seconds if seconds > 0 else None,
+        'peak_memory_mb': peak / (1024 * 1024),
+    }
+    return result, metrics
+
+
+def run_benchmarks(data_dir, start_date, end_date, repeat=3, workers=None):
+    """
+    Ejecuta todas las etapas del pipeline sobre los reportes de data_dir.
+
+    Args:
+        data_dir (str): Directorio con reportes diarios (reales o sintéticos)
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        repeat (int): Ejecuciones cronometradas por etapa
+        workers (int, optional): Si se indica, mide también la lectura paralela
+
+    Returns:
+        list: Métricas de cada etapa
+    """
+    stages = []
+    n_files = len(pd.date_range(start=start_date, end=end_date, freq='D'))
+
+    def load(_):
+        return load_daily_reports(start_date, end_date, data_dir=data_dir)
+
+    raw, metrics = measure_stage('load_daily_reports', load, lambda: None, 0, repeat)
+    metrics['rows_in'] = len(raw)
+    metrics['rows_per_second'] = len(raw) / metrics['seconds'] if metrics['seconds'] > 0 else None
+    metrics['files'] = n_files
+    stages.append(metrics)
+
+    if workers and workers > 1:
+        def load_parallel(_):
+            return load_daily_reports(start_date, end_date, data_dir=data_dir, workers=workers)
+
+        _, metrics = measure_stage(f'load_daily_reports[workers={workers}]', load_parallel,
+                                   lambda: None, len(raw), repeat)
+        metrics['files'] = n_files
+        stages.append(metrics)
+
+    # Cada paso de limpieza recibe una copia de la salida del paso anterior
+    df = raw
+    for name, step in CLEANING_STEPS:
+        previous = df
+        df, metrics = measure_stage(name, step, lambda: previous.copy(), len(previous), repeat)
+        stages.append(metrics)
+
+    cleaned = df
+    _, metrics = measure_stage('load_continent_mapping', load_continent_mapping,
+                               lambda: cleaned.copy(), len(cleaned), repeat)
+    stages.append(metrics)
+
+    return stages
+
+
+def compare_results(current, baseline):
+    """
+    Imprime la comparación de tiempos y memoria contra un resultado anterior.
+
+    Args:
+        current (dict): Resultado actual
+        baseline (dict): Resultado anterior (mismo formato)
+    """
+    previous = {stage['stage']: stage for stage in baseline['stages']}
+    print(f"\nComparación contra {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    print(f"{'Etapa':<40} {'Tiempo':>10} {'Anterior':>10} {'Cambio':>8} {'Memoria':>10}")
+    for stage in current['stages']:
+        old = previous.get(stage['stage'])
+        if old is None:
+            continue
+        change = (stage['seconds'] / old['seconds'] - 1) * 100 if old['seconds'] > 0 else 0
+        memory_change = stage['peak_memory_mb'] - old['peak_memory_mb']
+        print(f"{stage['stage']:<40} {stage['seconds']:>9.3f}s {old['seconds']:>9.3f}s "
+              f"{change:>+7.1f}% {memory_change:>+8.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de ingesta y limpieza")
+    parser.add_argument('--data-dir', help="Reportes existentes. Si se omite, se generan datos sintéticos")
+    parser.add_argument('--start', default='2020-01-22', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('--end', default='2020-12-31', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--countries', type=int, default=200, help="Países sintéticos")
+    parser.add_argument('--provinces', type=int, default=2, help="Provincias sintéticas por país")
+    parser.add_argument('--counties', type=int, default=3000, help="Condados sintéticos de US")
+    parser.add_argument('--repeat', type=int, default=3, help="Ejecuciones cronometradas por etapa")
+    parser.add_argument('--workers', type=int, default=None, help="Medir también la lectura paralela")
+    parser.add_argument('--output', help="Archivo JSON de salida")
+    parser.add_argument('--compare', help="JSON de un benchmark anterior para comparar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir
+        dataset = {'source': data_dir}
+        if data_dir is None:
+            data_dir = os.path.join(tmp_dir, 'daily_reports')
+            print(f"Generando datos sintéticos en {data_dir}...")
+            dataset = generate_daily_reports(data_dir, args.start, args.end, args.countries,
+                                             args.provinces, args.counties)
+            dataset.update(source='synthetic', countries=args.countries,
+                           provinces=args.provinces, counties=args.counties)
+
+        stages = run_benchmarks(data_dir, args.start, args.end, repeat=args.repeat, workers=args.workers)
+
+    result = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+            'start_date': args.start,
+            'end_date': args.end,
+            'repeat': args.repeat,
+        },
+        'dataset': dataset,
+        'stages': stages,
+    }
+
+    print(f"\n{'Etapa':<40} {'Tiempo':>10} {'Filas/s':>14} {'Memoria pico':>14}")
+    for stage in stages:
+        rate = f"{stage['rows_per_second']:,.0f}" if stage['rows_per_second'] else '-'
+        print(f"{stage['stage']:<40} {stage['seconds']:>9.3f}s {rate:>14} {stage['peak_memory_mb']:>11.1f} MB")
+
+    output = args.output
+    if output is None:
+        name = f"benchmark_{datetime.now():%Y%m%d_%H%M%S}_{result['meta']['commit'] or 'nocommit'}.json"
+        output = os.path.join(BENCHMARK_DIR, name)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n✓ Resultados guardados en {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare_results(result, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Generador de reportes diarios sintéticos con la forma de los datos de JHU CSSE
+
+Escribe archivos MM-DD-YYYY.csv que reproducen las eras de esquema del
+repositorio original, para poder medir el pipeline sin el clon de 350 MB:
+
+- 01-22-2020 → 02-29-2020: encabezados con barra (Province/State, Last Update)
+- 03-01-2020 → 03-21-2020: igual, con Latitude/Longitude
+- 03-22-2020 → 05-28-2020: encabezados con guion bajo, filas por condado (FIPS/Admin2)
+- 05-29-2020 → 11-08-2020: agrega Incidence_Rate y Case-Fatality_Ratio
+- 11-09-2020 en adelante: Incident_Rate y Case_Fatality_Ratio
+
+Uso desde la línea de comandos:
+    python -m benchmarks.synthetic_data /tmp/jhu_sintetico --start 2020-01-22 --end 2021-12-31
+"""
+
+import argparse
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+# Países sintéticos: incluye variantes de nombre de JHU para ejercitar COUNTRY_MAPPING
+BASE_COUNTRIES = [
+    'US', 'Mainland China', 'Korea, South', 'Taiwan*', 'UK', 'Czechia', 'Burma',
+    'Congo (Kinshasa)', 'Bahamas, The', 'Diamond Princess', 'Chile', 'Brazil',
+    'Italy', 'Spain', 'Germany', 'France', 'India', 'Japan', 'Australia', 'Egypt',
+]
+
+# Fechas de inicio de cada era de esquema
+ERA_STARTS = [
+    ('slash', pd.Timestamp('2020-01-22')),
+    ('slash_coords', pd.Timestamp('2020-03-01')),
+    ('county', pd.Timestamp('2020-03-22')),
+    ('county_incidence', pd.Timestamp('2020-05-29')),
+    ('county_incident', pd.Timestamp('2020-11-09')),
+]
+
+ERA_HEADERS = {
+    'slash': ['Province/State', 'Country/Region', 'Last Update', 'Confirmed', 'Deaths', 'Recovered'],
+    'slash_coords': ['Province/State', 'Country/Region', 'Last Update', 'Confirmed', 'Deaths',
+                     'Recovered', 'Latitude', 'Longitude'],
+    'county': ['FIPS', 'Admin2', 'Province_State', 'Country_Region', 'Last_Update', 'Lat', 'Long_',
+               'Confirmed', 'Deaths', 'Recovered', 'Active', 'Combined_Key'],
+    'county_incidence': ['FIPS', 'Admin2', 'Province_State', 'Country_Region', 'Last_Update', 'Lat',
+                         'Long_', 'Confirmed', 'Deaths', 'Recovered', 'Active', 'Combined_Key',
+                         'Incidence_Rate', 'Case-Fatality_Ratio'],
+    'county_incident': ['FIPS', 'Admin2', 'Province_State', 'Country_Region', 'Last_Update', 'Lat',
+                        'Long_', 'Confirmed', 'Deaths', 'Recovered', 'Active', 'Combined_Key',
+                        'Incident_Rate', 'Case_Fatality_Ratio'],
+}
+
+
+def schema_era(date):
+    """
+    Devuelve la era de esquema de JHU correspondiente a una fecha.
+
+    Args:
+        date (pd.Timestamp): Fecha del reporte
+
+    Returns:
+        str: Clave de ERA_HEADERS
+    """
+    era = ERA_STARTS[0][0]
+    for name, start in ERA_STARTS:
+        if date >= start:
+            era = name
+    return era
+
+
+def _last_update(date, era):
+    """Texto de Last Update en el formato que usaba JHU en cada era."""
+    if era == 'slash':
+        if date < pd.Timestamp('2020-02-01'):
+            return f"{date.month}/{date.day}/{date.year} 17:00"
+        return date.strftime('%Y-%m-%dT19:43:03')
+    if era == 'slash_coords':
+        return date.strftime('%Y-%m-%dT23:53:03')
+    return (date + pd.Timedelta(days=1)).strftime('%Y-%m-%d 04:22:56')
+
+
+def _regions(n_countries, provinces_per_country, counties):
+    """Lista de (provincia, país, admin2) para las eras por condado."""
+    countries = (BASE_COUNTRIES * (n_countries // len(BASE_COUNTRIES) + 1))[:n_countries]
+    countries = [c if i < len(BASE_COUNTRIES) else f"{c} {i}" for i, c in enumerate(countries)]
+
+    regions = []
+    for country in countries:
+        if country == 'US':
+            for i in range(counties):
+                regions.append((f"State {i % 50}", country, f"County {i}"))
+        else:
+            for p in range(provinces_per_country):
+                regions.append((f"Province {p}" if provinces_per_country > 1 else '', country, ''))
+    return countries, regions
+
+
+def generate_daily_reports(output_dir, start_date='2020-01-22', end_date='2021-12-31', n_countries=200,
+                           provinces_per_country=2, counties=3000, seed=0):
+    """
+    Escribe reportes diarios sintéticos en output_dir.
+
+    En las eras con encabezado de barra hay una fila por país; desde 03-22-2020
+    'US' se expande a `counties` filas por condado y el resto de los países a
+    `provinces_per_country` filas, como en los datos reales.
+
+    Args:
+        output_dir (str): Directorio de destino
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        n_countries (int): Número de países
+        provinces_per_country (int): Provincias por país (excepto US) en las eras por condado
+        counties (int): Filas de condado de US en las eras por condado
+        seed (int): Semilla del generador aleatorio
+
+    Returns:
+        dict: Resumen con 'files', 'rows' y 'bytes' escritos
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    countries, regions = _regions(n_countries, provinces_per_country, counties)
+
+    # Casos acumulados por región: crecen cada día con incrementos aleatorios
+    confirmed = np.zeros(len(regions), dtype=np.int64)
+    deaths = np.zeros(len(regions), dtype=np.int64)
+    recovered = np.zeros(len(regions), dtype=np.int64)
+
+    summary = {'files': 0, 'rows': 0, 'bytes': 0}
+    for date in pd.date_range(start=start_date, end=end_date, freq='D'):
+        new_cases = rng.poisson(20, size=len(regions))
+        confirmed += new_cases
+        deaths += rng.binomial(new_cases, 0.02)
+        recovered += rng.binomial(new_cases, 0.6)
+
+        era = schema_era(date)
+        last_update = _last_update(date, era)
+        path = os.path.join(output_dir, date.strftime('%m-%d-%Y') + '.csv')
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(ERA_HEADERS[era])
+
+            if era.startswith('slash'):
+                # Una fila por país (suma de sus regiones)
+                totals = pd.DataFrame({
+                    'country': [r[1] for r in regions],
+                    'confirmed': confirmed, 'deaths': deaths, 'recovered': recovered,
+                }).groupby('country', sort=False).sum()
+                for country, row in totals.iterrows():
+                    values = ['', country, last_update, row['confirmed'],
+                              # Los primeros archivos dejaban vacíos los ceros
+                              row['deaths'] or '', row['recovered'] or '']
+                    if era == 'slash_coords':
+                        values += [round(rng.uniform(-60, 60), 4), round(rng.uniform(-180, 180), 4)]
+                    writer.writerow(values)
+                    summary['rows'] += 1
+            else:
+                for i, (province, country, admin2) in enumerate(regions):
+                    active = confirmed[i] - deaths[i] - recovered[i]
+                    combined = ', '.join(x for x in (admin2, province, country) if x)
+                    values = [10000 + i if admin2 else '', admin2, province, country, last_update,
+                              0.0, 0.0, confirmed[i], deaths[i], recovered[i], active, combined]
+                    if era != 'county':
+                        fatality = deaths[i] / confirmed[i] * 100 if confirmed[i] else ''
+                        values += [round(confirmed[i] / 1000, 3), fatality]
+                    writer.writerow(values)
+                    summary['rows'] += 1
+
+        summary['files'] += 1
+        summary['bytes'] += os.path.getsize(path)
+
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera reportes diarios sintéticos con forma JHU")
+    parser.add_argument('output_dir', help="Directorio de destino")
+    parser.add_argument('--start', default='2020-01-22', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('--end', default='2021-12-31', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--countries', type=int, default=200, help="Número de países")
+    parser.add_argument('--provinces', type=int, default=2, help="Provincias por país")
+    parser.add_argument('--counties', type=int, default=3000, help="Condados de US")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    result = generate_daily_reports(args.output_dir, args.start, args.end, args.countries,
+                                    args.provinces, args.counties, args.seed)
+    print(f"✓ {result['files']} archivos, {result['rows']:,} filas, "
+          f"{result['bytes'] / (1024 * 1024):.1f} MB en {args.output_dir}")
@@ -7,11 +7,7 @@ Desarrollado como parte del Proyecto Semestral - Gestión de Datos 2025-II
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
-import numpy as np
+import os
 import sys
 from pathlib import Path
 
@@ -20,12 +16,14 @@ root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
 
 # Importar funciones centralizadas
-from src.config import (
-    load_daily_reports, 
-    clean_covid_data, 
-    load_continent_mapping,
-    COUNTRY_MAPPING
-)
+from src.config import optimize_dtypes
+from src.cache import compute_source_fingerprint, load_cleaned_dataset
+from src.aggregates import CUBE_METRICS, build_snapshot_table, compute_kpis, daily_totals, snapshot_top
+from src.analytics import GROWTH_WINDOW, global_growth_metrics
+from src.correlation import ROLLING_CORRELATION_WINDOWS, build_correlation_engine, rolling_correlation, window_correlation
+from src.downsampling import DOWNSAMPLING_LABELS, downsample_frame
+from src.filtering import build_filter_index, filter_with_index, normalize_selection
+from src.incidence import build_incidence_cube, incidence_columns
 
 
 # Configuración de la página
@@ -41,29 +39,66 @@ st.set_page_config(
 # FUNCIONES DE CARGA Y PROCESAMIENTO DE DATOS
 # ============================================================================
 
-@st.cache_data(show_spinner=False)
-def load_complete_dataset(start_date='2020-01-22', end_date='2021-12-31'):
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_complete_dataset(start_date='2020-01-22', end_date='2021-12-31', dataset_key=None):
     """
     Carga y procesa el dataset completo de COVID-19.
     
     Args:
         start_date: Fecha de inicio (formato 'YYYY-MM-DD')
         end_date: Fecha de fin (formato 'YYYY-MM-DD')
+        dataset_key: Huella de las fuentes (compute_source_fingerprint); solo
+            forma parte de la clave del caché, para recargar si cambian
     
     Returns:
-        DataFrame procesado y limpio con datos de COVID-19
+        tuple: (DataFrame procesado y limpio con datos de COVID-19, registro de
+            optimize_dtypes con la memoria antes y después)
     """
     with st.spinner('Cargando datos...'):
-        # Cargar datos usando función centralizada
-        df = load_daily_reports(start_date=start_date, end_date=end_date, progress_interval=100)
-        
-        # Limpiar datos
-        df = clean_covid_data(df, verbose=False)
+        # Cargar datos limpios: usa el caché Parquet de data/processed si las
+        # fuentes no cambiaron; si no, ejecuta el pipeline completo
+        # (load_daily_reports → clean_covid_data → load_continent_mapping)
+        df = load_cleaned_dataset(
+            start_date=start_date,
+            end_date=end_date,
+            progress_interval=100,
+            workers=min(8, os.cpu_count() or 1),
+            verbose=False
+        )
         
-        # Cargar mapeo de continentes
-        df = load_continent_mapping(df)
+        # Perfil de tipos compacto: el DataFrame queda residente por sesión
+        memory_report = []
+        df = optimize_dtypes(df, verbose=False, report=memory_report)
         
-        return df
+        return df, memory_report[-1]
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_filter_index(_df, dataset_key):
+    """
+    Construye el cubo país × fecha y su índice de filtrado.
+    
+    El cubo (confirmed, deaths, recovered, active_cases por país y día, más
+    la incidencia diaria new_* calculada por provincia, ver src/incidence.py)
+    se ordena por (continente, país, fecha) con los offsets de cada país. Se
+    calcula una sola vez por proceso y se comparte sin copiar entre sesiones
+    (solo lectura). El dataset lleva prefijo '_' para que Streamlit no tenga
+    que hashearlo en cada interacción; la clave es dataset_key, la huella de
+    las fuentes, por lo que el índice se reconstruye cuando el dataset cambia.
+    """
+    return build_filter_index(build_incidence_cube(_df))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_snapshots(_index, dataset_key):
+    """
+    Tablas de snapshots por fecha (acumulados, letalidad y rankings por país).
+    
+    Se construyen una sola vez por dataset (dataset_key) sobre el cubo del
+    índice; los rankings de cada selección son búsquedas sobre estas tablas
+    (ver build_snapshot_table).
+    """
+    return build_snapshot_table(_index['data'])
 
 
 @st.cache_data
@@ -79,77 +114,169 @@ def get_available_continents(df):
     return ['Todos'] + sorted(continents)
 
 
-def filter_data(df, continent, countries, date_range):
+def filter_data(index, selection):
     """
     Filtra el dataset según los criterios seleccionados.
     
     Args:
-        df: DataFrame completo
-        continent: Continente seleccionado
-        countries: Lista de países seleccionados
-        date_range: Tupla (fecha_inicio, fecha_fin)
+        index: Índice de filtrado (ver get_filter_index)
+        selection: Selección normalizada (continente, países, rango de fechas),
+            ver normalize_selection
     
     Returns:
-        DataFrame filtrado
+        DataFrame filtrado (slice de los datos indexados, sin copiar el dataset)
     """
-    filtered = df.copy()
+    continent, countries, date_range = selection
+    return filter_with_index(index, continent, list(countries), date_range)
+
+
+def calculate_kpis(daily):
+    """
+    Calcula los indicadores principales (KPIs).
     
-    # Filtrar por continente
-    if continent != 'Todos':
-        filtered = filtered[filtered['continent'] == continent]
+    Args:
+        daily: Totales por fecha del período filtrado (ver daily_totals)
     
-    # Filtrar por países
-    if countries:
-        filtered = filtered[filtered['country_region'].isin(countries)]
+    Returns:
+        dict con las métricas calculadas
+    """
+    return compute_kpis(daily)
+
+
+# ============================================================================
+# CACHÉ DE AGREGADOS POR SELECCIÓN
+# ============================================================================
+# Los resultados derivados se guardan por selección normalizada (continente,
+# países, rango de fechas), compartidos entre sesiones. Al superar el límite se
+# descartan las selecciones usadas menos recientemente. Los argumentos con
+# prefijo '_' no se hashean; dataset_key (la huella de las fuentes, ver
+# compute_source_fingerprint) identifica el dataset cargado.
+
+# Número máximo de selecciones guardadas por cada nivel del caché
+SELECTION_CACHE_ENTRIES = 128
+
+
+@st.cache_data(max_entries=SELECTION_CACHE_ENTRIES, show_spinner=False)
+def get_daily_series(_index, dataset_key, selection):
+    """
+    Nivel 1: totales diarios de la selección (vacío si no hay datos).
     
-    # Filtrar por rango de fechas
-    filtered = filtered[
-        (filtered['date'] >= pd.to_datetime(date_range[0])) &
-        (filtered['date'] <= pd.to_datetime(date_range[1]))
-    ]
+    Es la base de los KPIs y de los gráficos de series de tiempo. Incluye los
+    acumulados y la incidencia diaria (new_confirmed, new_deaths, ...).
+    """
+    return daily_totals(filter_data(_index, selection), metrics=CUBE_METRICS + incidence_columns())
+
+
+@st.cache_data(max_entries=SELECTION_CACHE_ENTRIES, show_spinner=False)
+def get_correlation_engine(_index, dataset_key, scope):
+    """
+    Sumas acumuladas de la incidencia diaria de (continente, países) en todo el período.
     
-    return filtered
+    No depende del rango de fechas: cambiar el rango solo lee dos filas de
+    las sumas (ver src/correlation.py).
+    """
+    continent, countries = scope
+    daily = get_daily_series(_index, dataset_key, (continent, countries, None))
+    return build_correlation_engine(daily)
 
 
-def calculate_kpis(df):
+@st.cache_data(max_entries=SELECTION_CACHE_ENTRIES, show_spinner=False)
+def get_rolling_correlation(_index, dataset_key, selection, window):
     """
-    Calcula los indicadores principales (KPIs).
+    Nivel 3: correlación móvil entre nuevos confirmados y nuevos fallecidos.
     
-    Returns:
-        dict con las métricas calculadas
+    Las ventanas se calculan sobre todo el período (así las primeras fechas
+    del rango usan días anteriores) y se recortan al rango seleccionado.
     """
-    # Obtener el último día disponible
-    latest_data = df[df['date'] == df['date'].max()]
-    
-    # Sumar totales
-    total_confirmed = int(latest_data['confirmed'].sum())
-    total_deaths = int(latest_data['deaths'].sum())
-    total_recovered = int(latest_data['recovered'].sum())
-    total_active = int(latest_data['active_cases'].sum())
-    
-    # Calcular tasa de letalidad
-    fatality_rate = (total_deaths / total_confirmed * 100) if total_confirmed > 0 else 0
-    
-    # Calcular cambios (comparar con día anterior)
-    if len(df['date'].unique()) > 1:
-        previous_date = df['date'].unique()[-2]
-        previous_data = df[df['date'] == previous_date]
-        
-        delta_confirmed = total_confirmed - int(previous_data['confirmed'].sum())
-        delta_deaths = total_deaths - int(previous_data['deaths'].sum())
-        delta_active = total_active - int(previous_data['active_cases'].sum())
-    else:
-        delta_confirmed = delta_deaths = delta_active = 0
+    continent, countries, date_range = selection
+    engine = get_correlation_engine(_index, dataset_key, (continent, countries))
+    rolling = rolling_correlation(engine, window, pairs=[('new_confirmed', 'new_deaths')])
+    if date_range is not None:
+        rolling = rolling[rolling['date'].between(pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]))]
+    return downsample_frame(rolling.reset_index(drop=True), ['corr_new_confirmed__new_deaths'])
+
+
+@st.cache_data(max_entries=SELECTION_CACHE_ENTRIES, show_spinner=False)
+def get_daily_analytics(_index, dataset_key, selection):
+    """
+    Nivel 2: KPIs, matriz de correlación y crecimiento diario de la selección.
+    
+    Se calculan a partir de los totales diarios del nivel 1. La correlación
+    es la de la incidencia diaria en el rango de fechas, leída del motor de
+    correlaciones (que no depende del rango, ver get_correlation_engine). El crecimiento
+    incluye casos nuevos, promedios móviles, tasa de crecimiento, tiempo de
+    duplicación y alertas de rebrote (ver src/analytics.py).
+    """
+    daily = get_daily_series(_index, dataset_key, selection)
+    continent, countries, date_range = selection
+    engine = get_correlation_engine(_index, dataset_key, (continent, countries))
+    
+    return {
+        'kpis': calculate_kpis(daily),
+        'correlation': window_correlation(engine, *(date_range or (None, None))),
+        'growth': global_growth_metrics(daily, new_cases_column='new_confirmed'),
+    }
+
+
+@st.cache_data(max_entries=SELECTION_CACHE_ENTRIES, show_spinner=False)
+def get_chart_series(_index, dataset_key, selection):
+    """
+    Nivel 3: series reducidas para los gráficos de tiempo de la selección.
+    
+    Cada gráfico recibe a lo sumo MAX_POINTS puntos (LTTB o agregación semanal
+    según el largo de la serie, ver src/downsampling.py) junto con el método
+    aplicado, para no enviar al navegador un punto por día de cada traza.
+    """
+    evolution = get_daily_series(_index, dataset_key, selection).reset_index()
+    growth = get_daily_analytics(_index, dataset_key, selection)['growth']
+    
+    return {
+        'evolution': downsample_frame(evolution, ['confirmed', 'active_cases', 'deaths']),
+        'new_cases': downsample_frame(growth, ['new_cases', 'new_cases_avg_7']),
+        'growth_rate': downsample_frame(growth, ['growth_rate']),
+    }
+
+
+@st.cache_data(max_entries=SELECTION_CACHE_ENTRIES, show_spinner=False)
+def get_country_tables(_index, dataset_key, selection):
+    """
+    Nivel 2: rankings y crecimiento por país de la selección.
+    
+    Los rankings de casos y letalidad se leen del snapshot del último día de
+    la selección; el crecimiento se calcula sobre las filas país × fecha
+    filtradas.
+    """
+    continent, countries, date_range = selection
+    snapshots = get_snapshots(_index, dataset_key)
+    snapshot_date = date_range[1] if date_range else None
+    snapshot_continent = None if continent == 'Todos' else continent
+    
+    # Top 10 por confirmados y por tasa de letalidad a la fecha final
+    top_countries = snapshot_top(snapshots, 10, date=snapshot_date, continent=snapshot_continent,
+                                 countries=countries)
+    fatality = snapshot_top(snapshots, 10, date=snapshot_date, continent=snapshot_continent,
+                            countries=countries, by='fatality_rate')
+    
+    df_filtered = filter_data(_index, selection)
+    
+    # Crecimiento de cada país en el período: casos nuevos posteriores al primer
+    # día del rango sobre el acumulado de ese día (filas ordenadas por fecha)
+    country_growth = (
+        df_filtered.sort_values(['country_region', 'date'], kind='stable')
+        .groupby('country_region', observed=True)
+        .agg(first=('confirmed', 'first'), new_cases=('new_confirmed', 'sum'),
+             first_new=('new_confirmed', 'first'))
+    )
+    base = country_growth['first'].where(country_growth['first'] > 0)
+    country_growth['growth'] = ((country_growth['new_cases'] - country_growth['first_new']) / base * 100).fillna(0)
     
     return {
-        'total_confirmed': total_confirmed,
-        'total_deaths': total_deaths,
-        'total_recovered': total_recovered,
-        'total_active': total_active,
-        'fatality_rate': fatality_rate,
-        'delta_confirmed': delta_confirmed,
-        'delta_deaths': delta_deaths,
-        'delta_active': delta_active
+        'top_countries': top_countries[['country_region', 'confirmed']],
+        'top5_countries': top_countries.head(5).set_index('country_region')['confirmed'],
+        'fatality': fatality[['country_region', 'confirmed', 'deaths', 'fatality_rate']],
+        'top_growth': country_growth.nlargest(3, 'growth'),
+        'total_countries': df_filtered['country_region'].nunique(),
+        'total_days': df_filtered['date'].nunique(),
     }
 
 
@@ -171,7 +298,11 @@ st.markdown("---")
 
 # Cargar dataset completo (cacheado para mejor rendimiento)
 try:
-    df_complete = load_complete_dataset(start_date='2020-01-22', end_date='2021-12-31')
+    # Huella de los CSV diarios y los mapeos: cambia cuando llegan datos nuevos
+    # y es la clave de todos los cachés derivados del dataset
+    dataset_key = compute_source_fingerprint('2020-01-22', '2021-12-31')
+    df_complete, memory_stats = load_complete_dataset(start_date='2020-01-22', end_date='2021-12-31',
+                                                      dataset_key=dataset_key)
     data_loaded = True
 except Exception as e:
     st.error(f"Error al cargar datos: {e}")
@@ -233,6 +364,7 @@ if data_loaded:
     - Registros: {len(df_complete):,}
     - Países: {len(available_countries)}
     - Continentes: {len(available_continents) - 1}
+    - Memoria: {memory_stats['memory_deep_after_mb']:,.1f} MB (antes {memory_stats['memory_deep_before_mb']:,.1f} MB)
     """)
     
     
@@ -240,15 +372,26 @@ if data_loaded:
     # APLICAR FILTROS
     # ============================================================================
     
-    df_filtered = filter_data(df_complete, continent_filter, country_filter, (start_date, end_date))
+    # Los gráficos trabajan sobre el cubo país × fecha (mucho más pequeño que
+    # las filas por provincia/condado), por lo que el costo de cada interacción
+    # no depende del número de filas del dataset original
+    filter_index = get_filter_index(df_complete, dataset_key)
+    selection = normalize_selection(filter_index, continent_filter, country_filter, (start_date, end_date))
+    
+    # Totales diarios del período filtrado (una sola agregación compartida por
+    # los KPIs y los gráficos de series de tiempo)
+    df_daily = get_daily_series(filter_index, dataset_key, selection)
     
     # Verificar que hay datos después del filtrado
-    if len(df_filtered) == 0:
+    if len(df_daily) == 0:
         st.warning("No hay datos disponibles para los filtros seleccionados. Intenta con otros criterios.")
         st.stop()
     
-    # Calcular KPIs
-    kpis = calculate_kpis(df_filtered)
+    # KPIs, correlaciones, crecimiento y tablas por país (cacheados por selección)
+    daily_analytics = get_daily_analytics(filter_index, dataset_key, selection)
+    country_tables = get_country_tables(filter_index, dataset_key, selection)
+    chart_series = get_chart_series(filter_index, dataset_key, selection)
+    kpis = daily_analytics['kpis']
 
     
     # ============================================================================
@@ -257,6 +400,10 @@ if data_loaded:
     
     st.header("Indicadores Principales")
     
+    # Las tres variaciones son casos nuevos del último día (ver compute_kpis)
+    delta_help = ("Variación: casos nuevos del último día del período, sumando la incidencia "
+                  "de cada provincia (activos nuevos = confirmados - fallecidos - recuperados nuevos)")
+    
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
@@ -264,7 +411,8 @@ if data_loaded:
             label="Casos Confirmados",
             value=f"{kpis['total_confirmed']:,}",
             delta=f"{kpis['delta_confirmed']:+,}" if kpis['delta_confirmed'] != 0 else None,
-            delta_color="inverse"
+            delta_color="inverse",
+            help=delta_help
         )
     
     with col2:
@@ -272,7 +420,8 @@ if data_loaded:
             label="Casos Activos",
             value=f"{kpis['total_active']:,}",
             delta=f"{kpis['delta_active']:+,}" if kpis['delta_active'] != 0 else None,
-            delta_color="inverse"
+            delta_color="inverse",
+            help=delta_help
         )
     
     with col3:
@@ -287,7 +436,8 @@ if data_loaded:
             label="Fallecidos",
             value=f"{kpis['total_deaths']:,}",
             delta=f"{kpis['delta_deaths']:+,}" if kpis['delta_deaths'] != 0 else None,
-            delta_color="inverse"
+            delta_color="inverse",
+            help=delta_help
         )
     
     with col5:
@@ -304,6 +454,11 @@ if data_loaded:
     # VISUALIZACIONES PRINCIPALES
     # ============================================================================
     
+    # plotly se importa recién aquí: el título, los filtros y los KPIs se
+    # muestran antes de pagar su carga (solo en la primera ejecución del proceso)
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
     tab1, tab2, tab3, tab4 = st.tabs([
         "Evolución Temporal",
         "Comparativa de Países",
@@ -314,20 +469,18 @@ if data_loaded:
     with tab1:
         st.subheader("Evolución Temporal de Casos")
         
-        # Agregar datos por fecha
-        evolution_data = df_filtered.groupby('date').agg({
-            'confirmed': 'sum',
-            'deaths': 'sum',
-            'recovered': 'sum',
-            'active_cases': 'sum'
-        }).reset_index()
+        # Datos agregados por fecha
+        evolution_data = df_daily.reset_index()
+        
+        # Puntos reducidos para el gráfico (las estadísticas usan la serie completa)
+        evolution_chart, evolution_method = chart_series['evolution']
         
         # Crear gráfico de líneas múltiples
         fig1 = go.Figure()
         
         fig1.add_trace(go.Scatter(
-            x=evolution_data['date'],
-            y=evolution_data['confirmed'],
+            x=evolution_chart['date'],
+            y=evolution_chart['confirmed'],
             mode='lines',
             name='Confirmados',
             line=dict(color='#1f77b4', width=2),
@@ -335,8 +488,8 @@ if data_loaded:
         ))
         
         fig1.add_trace(go.Scatter(
-            x=evolution_data['date'],
-            y=evolution_data['active_cases'],
+            x=evolution_chart['date'],
+            y=evolution_chart['active_cases'],
             mode='lines',
             name='Activos',
             line=dict(color='#ff7f0e', width=2),
@@ -344,8 +497,8 @@ if data_loaded:
         ))
         
         fig1.add_trace(go.Scatter(
-            x=evolution_data['date'],
-            y=evolution_data['deaths'],
+            x=evolution_chart['date'],
+            y=evolution_chart['deaths'],
             mode='lines',
             name='Fallecidos',
             line=dict(color='#d62728', width=2),
@@ -353,7 +506,7 @@ if data_loaded:
         ))
         
         fig1.update_layout(
-            title='Evolución Global de COVID-19',
+            title='Evolución Global de COVID-19' + DOWNSAMPLING_LABELS[evolution_method],
             xaxis_title='Fecha',
             yaxis_title='Número de Casos',
             hovermode='x unified',
@@ -372,14 +525,14 @@ if data_loaded:
             peak_date = evolution_data.loc[evolution_data['confirmed'].idxmax(), 'date']
             st.info(f"**Pico de casos:** {peak_date.strftime('%Y-%m-%d')}")
         with col3:
-            avg_daily = int(evolution_data['confirmed'].diff().mean())
+            avg_daily = int(evolution_data['new_confirmed'].iloc[1:].mean()) if len(evolution_data) > 1 else 0
             st.info(f"**Promedio diario:** {avg_daily:,} casos")
     
     with tab2:
         st.subheader("Comparativa entre Países")
         
         # Top 10 países por casos confirmados
-        top_countries = df_filtered.groupby('country_region')['confirmed'].max().nlargest(10).reset_index()
+        top_countries = country_tables['top_countries']
         
         # Gráfico de barras horizontales
         fig2 = px.bar(
@@ -407,13 +560,7 @@ if data_loaded:
         # Comparativa de tasas de letalidad
         st.markdown("### Tasas de Letalidad por País")
         
-        latest_by_country = df_filtered[df_filtered['date'] == df_filtered['date'].max()].groupby('country_region').agg({
-            'confirmed': 'sum',
-            'deaths': 'sum'
-        }).reset_index()
-        
-        latest_by_country['fatality_rate'] = (latest_by_country['deaths'] / latest_by_country['confirmed'] * 100).round(2)
-        latest_by_country = latest_by_country[latest_by_country['confirmed'] > 1000].nlargest(10, 'fatality_rate')
+        latest_by_country = country_tables['fatality']
         
         fig2b = px.bar(
             latest_by_country,
@@ -434,26 +581,26 @@ if data_loaded:
     with tab3:
         st.subheader("Mapa de Calor - Correlaciones")
         
-        # Preparar datos para correlación
-        correlation_data = df_filtered.groupby('date').agg({
-            'confirmed': 'sum',
-            'deaths': 'sum',
-            'recovered': 'sum',
-            'active_cases': 'sum'
-        })
-        
-        # Calcular matriz de correlación
-        corr_matrix = correlation_data.corr()
+        # Matriz de correlación de la incidencia diaria del período
+        corr_matrix = daily_analytics['correlation']
+        labels = {
+            'new_confirmed': 'Nuevos confirmados',
+            'new_deaths': 'Nuevos fallecidos',
+            'new_recovered': 'Nuevos recuperados',
+            'new_active': 'Variación de activos',
+        }
         
         # Crear heatmap
         fig3 = px.imshow(
             corr_matrix,
             labels=dict(color="Correlación"),
-            x=['Confirmados', 'Fallecidos', 'Recuperados', 'Activos'],
-            y=['Confirmados', 'Fallecidos', 'Recuperados', 'Activos'],
+            x=[labels[m] for m in corr_matrix.columns],
+            y=[labels[m] for m in corr_matrix.index],
             color_continuous_scale='RdBu_r',
+            zmin=-1,
+            zmax=1,
             aspect='auto',
-            title='Matriz de Correlación entre Variables',
+            title='Matriz de Correlación de la Incidencia Diaria',
             text_auto='.2f'
         )
         
@@ -468,40 +615,80 @@ if data_loaded:
         
         with col1:
             st.success(f"""
-            **Correlación Confirmados-Fallecidos:** {corr_matrix.loc['confirmed', 'deaths']:.3f}
+            **Correlación Nuevos confirmados-Nuevos fallecidos:** {corr_matrix.loc['new_confirmed', 'new_deaths']:.3f}
             
-            Una correlación alta indica que el aumento de casos confirmados 
-            está fuertemente asociado con el aumento de fallecidos.
+            Una correlación alta indica que los días con más casos nuevos
+            son también los días con más fallecidos nuevos.
             """)
         
         with col2:
             st.info(f"""
-            **Correlación Confirmados-Activos:** {corr_matrix.loc['confirmed', 'active_cases']:.3f}
+            **Correlación Nuevos confirmados-Variación de activos:** {corr_matrix.loc['new_confirmed', 'new_active']:.3f}
             
-            Muestra la relación entre casos totales y casos activos actuales.
+            Muestra si los casos nuevos se traducen en más casos activos o
+            se compensan con recuperados y fallecidos.
             """)
+        
+        # Correlación móvil con ventana configurable
+        st.markdown("### Correlación Móvil")
+        
+        window = st.select_slider(
+            "Ventana (días)",
+            options=ROLLING_CORRELATION_WINDOWS,
+            value=ROLLING_CORRELATION_WINDOWS[1]
+        )
+        rolling_chart, rolling_method = get_rolling_correlation(filter_index, dataset_key, selection, window)
+        
+        fig3b = go.Figure()
+        fig3b.add_trace(go.Scatter(
+            x=rolling_chart['date'],
+            y=rolling_chart['corr_new_confirmed__new_deaths'],
+            mode='lines',
+            name='Confirmados-Fallecidos',
+            line=dict(color='#9467bd', width=2),
+            hovertemplate='<b>Fecha:</b> %{x}<br><b>Correlación:</b> %{y:.2f}<extra></extra>'
+        ))
+        fig3b.update_layout(
+            title=f'Correlación Móvil de {window} Días: Nuevos Confirmados vs Nuevos Fallecidos'
+                  + DOWNSAMPLING_LABELS[rolling_method],
+            xaxis_title='Fecha',
+            yaxis_title='Correlación',
+            yaxis=dict(range=[-1, 1]),
+            height=400,
+            template='plotly_white'
+        )
+        
+        st.plotly_chart(fig3b, use_container_width=True)
     
     with tab4:
         st.subheader("Análisis Avanzado - Tendencias y Crecimiento")
         
-        # Calcular tasa de crecimiento diaria
-        daily_data = df_filtered.groupby('date')['confirmed'].sum().reset_index()
-        daily_data['new_cases'] = daily_data['confirmed'].diff().fillna(0)
-        daily_data['growth_rate'] = (daily_data['new_cases'] / daily_data['confirmed'].shift(1) * 100).fillna(0)
+        # Tasa de crecimiento diaria
+        daily_data = daily_analytics['growth']
         
         # Gráfico de nuevos casos diarios
+        new_cases_chart, new_cases_method = chart_series['new_cases']
         fig4a = go.Figure()
         
         fig4a.add_trace(go.Bar(
-            x=daily_data['date'],
-            y=daily_data['new_cases'],
+            x=new_cases_chart['date'],
+            y=new_cases_chart['new_cases'],
             name='Nuevos Casos Diarios',
             marker_color='indianred',
             hovertemplate='<b>Fecha:</b> %{x}<br><b>Nuevos casos:</b> %{y:,}<extra></extra>'
         ))
         
+        fig4a.add_trace(go.Scatter(
+            x=new_cases_chart['date'],
+            y=new_cases_chart['new_cases_avg_7'],
+            mode='lines',
+            name='Promedio 7 días',
+            line=dict(color='black', width=2),
+            hovertemplate='<b>Fecha:</b> %{x}<br><b>Promedio 7 días:</b> %{y:,.0f}<extra></extra>'
+        ))
+        
         fig4a.update_layout(
-            title='Nuevos Casos Diarios',
+            title='Nuevos Casos Diarios' + DOWNSAMPLING_LABELS[new_cases_method],
             xaxis_title='Fecha',
             yaxis_title='Nuevos Casos',
             height=400,
@@ -513,11 +700,12 @@ if data_loaded:
         # Tasa de crecimiento
         st.markdown("### Tasa de Crecimiento")
         
+        growth_chart, growth_method = chart_series['growth_rate']
         fig4b = go.Figure()
         
         fig4b.add_trace(go.Scatter(
-            x=daily_data['date'],
-            y=daily_data['growth_rate'],
+            x=growth_chart['date'],
+            y=growth_chart['growth_rate'],
             mode='lines',
             name='Tasa de Crecimiento',
             line=dict(color='green', width=2),
@@ -526,7 +714,7 @@ if data_loaded:
         ))
         
         fig4b.update_layout(
-            title='Tasa de Crecimiento Diaria (%)',
+            title='Tasa de Crecimiento Diaria (%)' + DOWNSAMPLING_LABELS[growth_method],
             xaxis_title='Fecha',
             yaxis_title='Tasa de Crecimiento (%)',
             height=400,
@@ -538,9 +726,9 @@ if data_loaded:
         # Detección de rebrotes
         st.markdown("### Detección de Rebrotes")
         
-        # Identificar días con crecimiento significativo
-        threshold = daily_data['growth_rate'].quantile(0.9)
-        rebrotes = daily_data[daily_data['growth_rate'] > threshold].tail(10)
+        # Días con crecimiento sobre el percentil 90 (precalculados en src/analytics.py)
+        threshold = daily_data['outbreak_threshold'].iloc[-1]
+        rebrotes = daily_data[daily_data['outbreak']].tail(10)
         
         if len(rebrotes) > 0:
             st.warning(f"Se detectaron **{len(rebrotes)}** días con crecimiento superior al percentil 90 ({threshold:.2f}%)")
@@ -568,7 +756,7 @@ if data_loaded:
     with col1:
         st.subheader("Top 5 Países Afectados")
         
-        top5_countries = df_filtered.groupby('country_region')['confirmed'].max().nlargest(5)
+        top5_countries = country_tables['top5_countries']
         
         for i, (country, cases) in enumerate(top5_countries.items(), 1):
             st.write(f"**{i}.** {country}: **{cases:,}** casos")
@@ -576,9 +764,9 @@ if data_loaded:
     with col2:
         st.subheader("Estadísticas Generales")
         
-        total_countries = df_filtered['country_region'].nunique()
-        total_days = df_filtered['date'].nunique()
-        avg_cases_per_day = int(df_filtered.groupby('date')['confirmed'].sum().mean())
+        total_countries = country_tables['total_countries']
+        total_days = country_tables['total_days']
+        avg_cases_per_day = int(df_daily['confirmed'].mean())
         
         st.write(f"**Países analizados:** {total_countries}")
         st.write(f"**Días analizados:** {total_days}")
@@ -588,15 +776,10 @@ if data_loaded:
     with col3:
         st.subheader("Alertas y Tendencias")
         
-        # Análisis de tendencia reciente
-        recent_days = 7
-        if len(df_filtered['date'].unique()) >= recent_days:
-            recent_dates = sorted(df_filtered['date'].unique())[-recent_days:]
-            recent_data = df_filtered[df_filtered['date'].isin(recent_dates)]
-            
-            recent_growth = recent_data.groupby('date')['confirmed'].sum()
-            growth_pct = ((recent_growth.iloc[-1] - recent_growth.iloc[0]) / recent_growth.iloc[0] * 100)
-            
+        # Análisis de tendencia reciente (variación del acumulado en la ventana de src/analytics.py)
+        recent_days = GROWTH_WINDOW
+        growth_pct = daily_analytics['growth'][f'growth_{recent_days}d'].iloc[-1]
+        if pd.notna(growth_pct):
             if growth_pct > 10:
                 st.error(f"Crecimiento acelerado: +{growth_pct:.1f}% en últimos {recent_days} días")
             elif growth_pct > 5:
@@ -606,9 +789,7 @@ if data_loaded:
         
         # Países con mayor crecimiento reciente
         st.write("**Mayor crecimiento:**")
-        country_growth = df_filtered.groupby('country_region')['confirmed'].agg(['first', 'last'])
-        country_growth['growth'] = ((country_growth['last'] - country_growth['first']) / country_growth['first'] * 100).fillna(0)
-        top_growth = country_growth.nlargest(3, 'growth')
+        top_growth = country_tables['top_growth']
         
         for country in top_growth.index:
             growth = top_growth.loc[country, 'growth']
@@ -3,8 +3,10 @@ set -euo pipefail
 
 # Simple helper to ensure JHU CSSE repo data is present under data/raw/COVID-19
 # Usage:
-#   ./scripts/fetch_jhu_data.sh [clone|zip]
+#   ./scripts/fetch_jhu_data.sh [clone|zip|update]
 # Default: clone (shallow)
+# update: pulls new daily reports into an existing clone and processes only
+#         the new/changed files into data/processed/incremental
 
 REPO_URL="https://github.com/CSSEGISandData/COVID-19.git"
 DEST="data/raw/COVID-19"
@@ -12,6 +14,18 @@ METHOD="${1:-clone}"
 
 echo "Ensure JHU CSSE data is available at: $DEST"
 
+if [ "$METHOD" = "update" ]; then
+  if [ ! -d "$DEST/.git" ]; then
+    echo "No git clone found at $DEST. Run: ./scripts/fetch_jhu_data.sh clone" >&2
+    exit 2
+  fi
+  echo "Pulling latest daily reports into $DEST"
+  git -C "$DEST" pull --ff-only
+  echo "Processing new/changed daily reports (incremental)"
+  python -m src.incremental
+  exit 0
+fi
+
 if [ -d "$DEST/csse_covid_19_data" ]; then
   echo "Data already present at $DEST — nothing to do."
   exit 0
@@ -37,5 +51,5 @@ if [ "$METHOD" = "zip" ]; then
   exit 0
 fi
 
-echo "Unknown method: $METHOD. Use 'clone' or 'zip'." >&2
+echo "Unknown method: $METHOD. Use 'clone', 'zip' or 'update'." >&2
 exit 2
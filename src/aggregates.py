@@ -0,0 +1,274 @@
+"""
+Agregaciones precalculadas sobre el dataset limpio de COVID-19
+
+El dataset limpio tiene una fila por provincia/condado y día (millones de filas
+desde 2020-03-22). La mayoría de los análisis solo necesitan totales por país y
+día, así que aquí se construye una vez un "cubo" país × fecha mucho más pequeño
+sobre el que se filtran y suman los gráficos del dashboard y los notebooks.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Métricas acumuladas que se suman en el cubo país × fecha
+CUBE_METRICS = ['confirmed', 'deaths', 'recovered', 'active_cases']
+
+# Dimensiones del cubo (en orden de agrupación)
+CUBE_KEYS = ['continent', 'country_region', 'date']
+
+# Métricas acumuladas de las tablas de snapshots por fecha
+SNAPSHOT_METRICS = ['confirmed', 'deaths']
+
+# Los países entran al ranking de letalidad con más de estos casos confirmados
+FATALITY_MIN_CONFIRMED = 1000
+
+
+def build_country_cube(df, metrics=None):
+    """
+    Construye el cubo país × fecha sumando las filas de provincias/condados.
+
+    Los países sin continente asignado (por ejemplo cruceros) se conservan
+    con continente nulo.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columnas continent, country_region y date
+        metrics (list, optional): Métricas a sumar. Si es None, usa CUBE_METRICS
+
+    Returns:
+        pd.DataFrame: Una fila por (continent, country_region, date), ordenado por esas columnas
+    """
+    if metrics is None:
+        metrics = CUBE_METRICS
+    metrics = [col for col in metrics if col in df.columns]
+
+    cube = (
+        df.groupby(CUBE_KEYS, observed=True, dropna=False, sort=True)[metrics]
+        .sum()
+        .reset_index()
+    )
+    return cube
+
+
+def daily_totals(df, metrics=None):
+    """
+    Suma las métricas por fecha en una sola pasada agrupada.
+
+    Args:
+        df (pd.DataFrame): DataFrame con columna 'date' (filas por país o por provincia)
+        metrics (list, optional): Métricas a sumar. Si es None, usa CUBE_METRICS
+
+    Returns:
+        pd.DataFrame: Una fila por fecha (índice 'date' ordenado) con las métricas sumadas
+    """
+    if metrics is None:
+        metrics = CUBE_METRICS
+    metrics = [col for col in metrics if col in df.columns]
+    return df.groupby('date', sort=True)[metrics].sum()
+
+
+def compute_kpis(daily):
+    """
+    Calcula los KPIs del último día y sus variaciones respecto al día anterior.
+
+    Solo lee las dos últimas filas de los totales diarios, por lo que el costo es
+    constante para datos ya agregados. Si el índice no está ordenado por fecha,
+    se ordena antes. Las tres variaciones se calculan siempre de la misma forma:
+    si los totales incluyen new_confirmed, new_deaths y new_recovered, son los
+    casos nuevos del último día (activos nuevos = confirmados - muertes -
+    recuperados nuevos); si no, son la diferencia de los acumulados sumados
+    respecto al día anterior.
+
+    Args:
+        daily (pd.DataFrame): Totales por fecha (ver daily_totals)
+
+    Returns:
+        dict: total_confirmed, total_deaths, total_recovered, total_active,
+            fatality_rate, delta_confirmed, delta_deaths, delta_active
+    """
+    if not daily.index.is_monotonic_increasing:
+        daily = daily.sort_index()
+
+    latest = daily.iloc[-1]
+    total_confirmed = int(latest['confirmed'])
+    total_deaths = int(latest['deaths'])
+    total_recovered = int(latest['recovered'])
+    total_active = int(latest['active_cases'])
+
+    # Tasa de letalidad
+    fatality_rate = (total_deaths / total_confirmed * 100) if total_confirmed > 0 else 0
+
+    # Variaciones del último día. Con incidencia por provincia (ver src.incidence)
+    # no dependen de qué provincias reportaron cada día
+    if {'new_confirmed', 'new_deaths', 'new_recovered'} <= set(daily.columns):
+        delta_confirmed = int(latest['new_confirmed'])
+        delta_deaths = int(latest['new_deaths'])
+        delta_active = delta_confirmed - delta_deaths - int(latest['new_recovered'])
+    elif len(daily) > 1:
+        previous = daily.iloc[-2]
+        delta_confirmed = total_confirmed - int(previous['confirmed'])
+        delta_deaths = total_deaths - int(previous['deaths'])
+        delta_active = total_active - int(previous['active_cases'])
+    else:
+        delta_confirmed = delta_deaths = delta_active = 0
+
+    return {
+        'total_confirmed': total_confirmed,
+        'total_deaths': total_deaths,
+        'total_recovered': total_recovered,
+        'total_active': total_active,
+        'fatality_rate': fatality_rate,
+        'delta_confirmed': delta_confirmed,
+        'delta_deaths': delta_deaths,
+        'delta_active': delta_active
+    }
+
+
+def build_snapshot_table(cube, metrics=None, min_confirmed=FATALITY_MIN_CONFIRMED):
+    """
+    Construye una vez la tabla de snapshots por fecha: acumulados, letalidad y rankings.
+
+    Cada fecha del cubo tiene una fila por país que ya había reportado, con el
+    último acumulado conocido (un país sin reporte ese día conserva el valor
+    anterior). Las filas de cada fecha se ordenan por confirmados de mayor a
+    menor, por lo que un top N es un slice.
+
+    Args:
+        cube (pd.DataFrame): Cubo país × fecha (ver build_country_cube)
+        metrics (list, optional): Métricas acumuladas. Si es None, usa SNAPSHOT_METRICS
+        min_confirmed (int): Los países con más confirmados entran al ranking de letalidad
+
+    Returns:
+        dict: Snapshots con las claves:
+            - 'data': DataFrame ordenado por (date, rank) con continent,
+              country_region, date, las métricas, fatality_rate, rank,
+              continent_rank y fatality_rank (NaN si no supera min_confirmed)
+            - 'dates': fechas de los snapshots (ordenadas)
+            - 'offsets': posición de inicio de cada fecha en 'data' (más el total al final)
+    """
+    if metrics is None:
+        metrics = SNAPSHOT_METRICS
+    metrics = [col for col in metrics if col in cube.columns]
+
+    country_codes, countries = pd.factorize(cube['country_region'], sort=True)
+    date_codes, dates = pd.factorize(cube['date'], sort=True)
+    continents = (
+        pd.Series(cube['continent'].to_numpy(), index=country_codes)
+        .groupby(level=0).first()
+        .reindex(range(len(countries)))
+        .to_numpy()
+    )
+    shape = (len(dates), len(countries))
+
+    # Matrices fecha × país con el último valor conocido de cada país
+    reported = np.zeros(shape, dtype=bool)
+    reported[date_codes, country_codes] = True
+    last_row = np.where(reported, np.arange(shape[0])[:, None], -1)
+    np.maximum.accumulate(last_row, axis=0, out=last_row)
+    present = last_row >= 0
+
+    data = pd.DataFrame({
+        'continent': continents[np.nonzero(present)[1]],
+        'country_region': countries[np.nonzero(present)[1]],
+        'date': dates[np.nonzero(present)[0]],
+    })
+    for metric in metrics:
+        values = np.zeros(shape, dtype=cube[metric].dtype)
+        values[date_codes, country_codes] = cube[metric].to_numpy()
+        data[metric] = values[last_row, np.arange(shape[1])][present]
+
+    if 'confirmed' in data.columns and 'deaths' in data.columns:
+        confirmed = data['confirmed'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            data['fatality_rate'] = np.where(confirmed > 0, data['deaths'] / confirmed * 100, 0.0).round(2)
+
+    # Rankings dentro de cada fecha (y de cada continente en esa fecha)
+    data = data.sort_values(['date', 'confirmed', 'country_region'], ascending=[True, False, True],
+                            kind='stable').reset_index(drop=True)
+    data['rank'] = data.groupby('date', sort=False).cumcount() + 1
+    data['continent_rank'] = data.groupby(['date', 'continent'], sort=False, observed=True,
+                                          dropna=False).cumcount() + 1
+    if 'fatality_rate' in data.columns:
+        eligible = data[data['confirmed'] > min_confirmed].sort_values(
+            ['date', 'fatality_rate', 'country_region'], ascending=[True, False, True], kind='stable')
+        data['fatality_rank'] = (eligible.groupby('date', sort=False).cumcount() + 1).reindex(data.index)
+
+    snapshot_dates = data['date'].to_numpy()
+    unique_dates = dates.to_numpy()
+    offsets = np.searchsorted(snapshot_dates, unique_dates, side='left')
+    return {
+        'data': data,
+        'dates': unique_dates,
+        'offsets': np.append(offsets, len(data)),
+    }
+
+
+def snapshot_at(snapshots, date=None):
+    """
+    Filas del snapshot vigente en una fecha (el último con fecha <= date).
+
+    Args:
+        snapshots (dict): Resultado de build_snapshot_table
+        date (str, optional): Fecha 'YYYY-MM-DD'. Si es None, el último snapshot
+
+    Returns:
+        pd.DataFrame: Una fila por país, ordenada por rank (slice sin copia)
+    """
+    dates = snapshots['dates']
+    if len(dates) == 0:
+        return snapshots['data'].iloc[0:0]
+    if date is None:
+        position = len(dates) - 1
+    else:
+        position = np.searchsorted(dates, np.datetime64(pd.Timestamp(date)), side='right') - 1
+        if position < 0:
+            return snapshots['data'].iloc[0:0]
+    start, stop = snapshots['offsets'][position], snapshots['offsets'][position + 1]
+    return snapshots['data'].iloc[start:stop]
+
+
+def snapshot_top(snapshots, n=10, date=None, continent=None, countries=None, by='confirmed'):
+    """
+    Top N de países a una fecha, opcionalmente dentro de un continente o lista de países.
+
+    Args:
+        snapshots (dict): Resultado de build_snapshot_table
+        n (int): Cantidad de países
+        date (str, optional): Fecha 'YYYY-MM-DD'. Si es None, el último snapshot
+        continent (str, optional): Continente. Si es None, todos
+        countries (list, optional): Países a considerar. Si está vacío, todos
+        by (str): 'confirmed' (orden de rank), 'fatality_rate' (solo países que
+            superan el mínimo de confirmados, orden de fatality_rank) u otra métrica
+
+    Returns:
+        pd.DataFrame: Hasta n filas del snapshot, ordenadas de mayor a menor
+    """
+    rows = snapshot_at(snapshots, date)
+    if continent is not None:
+        rows = rows[rows['continent'] == continent]
+    if countries:
+        rows = rows[rows['country_region'].isin(countries)]
+
+    if by == 'confirmed':
+        return rows.head(n)
+    if by == 'fatality_rate':
+        return rows[rows['fatality_rank'].notna()].sort_values('fatality_rank', kind='stable').head(n)
+    return rows.nlargest(n, by)
+
+
+def json_number(value, digits=None):
+    """
+    Convierte un escalar de NumPy/pandas a un número de JSON.
+
+    Args:
+        value: Escalar numérico
+        digits (int, optional): Decimales a conservar en los valores no enteros
+
+    Returns:
+        int, float o None: Entero si el valor no tiene parte decimal; None para NaN e infinitos
+    """
+    value = float(value)
+    if np.isnan(value) or np.isinf(value):
+        return None
+    if value.is_integer():
+        return int(value)
+    return value if digits is None else round(value, digits)
@@ -0,0 +1,174 @@
+"""
+Métricas de crecimiento y ventanas móviles sobre series acumuladas
+
+Calcula, en una sola pasada vectorizada sobre el cubo país × fecha (o sobre
+los totales diarios globales), los casos nuevos diarios, sus promedios
+móviles, la tasa de crecimiento, el tiempo de duplicación y las alertas de
+rebrote. Las series se procesan todas a la vez: los límites entre países se
+resuelven con posiciones dentro de cada grupo y sumas acumuladas, sin
+groupby().rolling() ni bucles por país.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Ventanas (en días) de los promedios móviles de casos nuevos
+ROLLING_WINDOWS = [7, 14]
+
+# Ventana (en días) del crecimiento acumulado y del tiempo de duplicación
+GROWTH_WINDOW = 7
+
+# Percentil de la tasa de crecimiento sobre el que un día se marca como rebrote
+OUTBREAK_QUANTILE = 0.9
+
+
+def _group_positions(df, group_column):
+    """
+    Inicio del grupo y posición dentro del grupo de cada fila.
+
+    Args:
+        df (pd.DataFrame): Datos ordenados por (grupo, fecha)
+        group_column (str, optional): Columna de agrupación. Si es None, un solo grupo
+
+    Returns:
+        tuple: (códigos de grupo, inicio del grupo de cada fila, posición dentro del grupo)
+    """
+    n_rows = len(df)
+    if group_column is None:
+        codes = np.zeros(n_rows, dtype=np.intp)
+    else:
+        codes = pd.factorize(df[group_column], use_na_sentinel=False)[0]
+
+    is_start = np.ones(n_rows, dtype=bool)
+    is_start[1:] = codes[1:] != codes[:-1]
+    group_start = np.maximum.accumulate(np.where(is_start, np.arange(n_rows), 0))
+    return codes, group_start, np.arange(n_rows) - group_start
+
+
+def _lagged(values, position, lag):
+    """
+    Valor de `lag` filas antes dentro del mismo grupo (NaN si no existe).
+
+    Args:
+        values (np.ndarray): Valores ordenados por (grupo, fecha)
+        position (np.ndarray): Posición de cada fila dentro de su grupo
+        lag (int): Desplazamiento en filas
+
+    Returns:
+        np.ndarray: Valores desplazados (float)
+    """
+    result = np.full(len(values), np.nan)
+    valid = position >= lag
+    result[valid] = values[np.flatnonzero(valid) - lag]
+    return result
+
+
+def add_growth_metrics(df, metric='confirmed', group_column='country_region', windows=None,
+                       growth_window=GROWTH_WINDOW, outbreak_quantile=OUTBREAK_QUANTILE,
+                       new_cases_column=None):
+    """
+    Agrega métricas de crecimiento a una serie acumulada por grupo y fecha.
+
+    Columnas agregadas:
+        - new_cases: diferencia diaria del acumulado (0 en el primer día de cada
+          grupo), o new_cases_column si se indica
+        - new_cases_avg_<w>: promedio móvil de new_cases en w días (con los días
+          disponibles al inicio de cada grupo)
+        - growth_rate: new_cases / acumulado del día anterior × 100
+        - growth_<g>d: variación porcentual del acumulado respecto a g días antes
+        - doubling_time: días para duplicar el acumulado al ritmo de los últimos
+          g días (NaN si no crece)
+        - outbreak_threshold: percentil outbreak_quantile de growth_rate del grupo
+        - outbreak: True si growth_rate supera el umbral del grupo
+
+    Args:
+        df (pd.DataFrame): Datos con columnas 'date', metric y (opcional) group_column
+        metric (str): Columna acumulada a analizar
+        group_column (str, optional): Columna de agrupación (por ejemplo país). Si es
+            None o no existe en df, toda la tabla es una sola serie
+        windows (list, optional): Ventanas de los promedios móviles. Si es None, usa ROLLING_WINDOWS
+        growth_window (int): Ventana del crecimiento acumulado y del tiempo de duplicación
+        outbreak_quantile (float): Percentil para marcar rebrotes
+        new_cases_column (str, optional): Columna con la incidencia diaria ya
+            calculada (ver src.incidence). Si es None, se diferencia el acumulado
+
+    Returns:
+        pd.DataFrame: Copia ordenada por (grupo, fecha) con las columnas agregadas
+    """
+    if windows is None:
+        windows = ROLLING_WINDOWS
+    if group_column is not None and group_column not in df.columns:
+        group_column = None
+
+    sort_columns = ['date'] if group_column is None else [group_column, 'date']
+    result = df.sort_values(sort_columns, kind='stable').reset_index(drop=True)
+    codes, group_start, position = _group_positions(result, group_column)
+
+    cumulative = result[metric].to_numpy(dtype=float)
+    previous = _lagged(cumulative, position, 1)
+
+    # Casos nuevos diarios
+    if new_cases_column is not None:
+        new_cases = result[new_cases_column].to_numpy(dtype=float)
+    else:
+        new_cases = np.where(position > 0, cumulative - previous, 0.0)
+    result['new_cases'] = new_cases
+
+    # Promedios móviles con sumas acumuladas (ventana acotada al inicio del grupo)
+    running = np.concatenate(([0.0], np.cumsum(new_cases)))
+    rows = np.arange(len(result))
+    for window in windows:
+        count = np.minimum(position + 1, window)
+        result[f'new_cases_avg_{window}'] = (running[rows + 1] - running[rows + 1 - count]) / count
+
+    # Tasa de crecimiento diaria
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth_rate = np.where(previous > 0, new_cases / previous * 100, 0.0)
+    result['growth_rate'] = growth_rate
+
+    # Crecimiento en la ventana y tiempo de duplicación
+    base = _lagged(cumulative, position, growth_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = cumulative / base
+        result[f'growth_{growth_window}d'] = np.where(base > 0, (ratio - 1) * 100, np.nan)
+        result['doubling_time'] = np.where((base > 0) & (ratio > 1),
+                                           growth_window * np.log(2) / np.log(ratio), np.nan)
+
+    # Rebrotes: días con crecimiento sobre el percentil del propio grupo
+    thresholds = pd.Series(growth_rate).groupby(codes).quantile(outbreak_quantile).to_numpy()
+    result['outbreak_threshold'] = thresholds[codes]
+    result['outbreak'] = growth_rate > result['outbreak_threshold'].to_numpy()
+
+    return result
+
+
+def country_growth_metrics(cube, metric='confirmed', **kwargs):
+    """
+    Métricas de crecimiento de cada país sobre el cubo país × fecha.
+
+    Args:
+        cube (pd.DataFrame): Cubo de build_country_cube (o filas país × fecha filtradas)
+        metric (str): Columna acumulada a analizar
+        **kwargs: Parámetros adicionales de add_growth_metrics
+
+    Returns:
+        pd.DataFrame: Cubo ordenado por (país, fecha) con las métricas agregadas
+    """
+    return add_growth_metrics(cube, metric=metric, group_column='country_region', **kwargs)
+
+
+def global_growth_metrics(daily, metric='confirmed', **kwargs):
+    """
+    Métricas de crecimiento de la serie global (una fila por fecha).
+
+    Args:
+        daily (pd.DataFrame): Totales por fecha, con 'date' como índice o columna (ver daily_totals)
+        metric (str): Columna acumulada a analizar
+        **kwargs: Parámetros adicionales de add_growth_metrics
+
+    Returns:
+        pd.DataFrame: Una fila por fecha con 'date' como columna y las métricas agregadas
+    """
+    if 'date' not in daily.columns:
+        daily = daily.reset_index()
+    return add_growth_metrics(daily, metric=metric, group_column=None, **kwargs)
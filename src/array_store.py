@@ -0,0 +1,266 @@
+"""
+Matrices densas país × día en archivos .npy con memoria mapeada
+
+Para análisis que solo necesitan series por país, el cubo en pandas agrega
+costo de índices, tipos y copias. Aquí cada métrica se materializa una vez como
+un arreglo float64 de forma [n_países, n_días] y se guarda en
+DATA_PROCESSED/arrays junto con el índice de países y el eje de fechas:
+
+    arrays/meta.json          métricas, forma, relleno y rango de fechas
+    arrays/countries.json     países (fila de cada uno) y su continente
+    arrays/dates.npy          eje de fechas (datetime64[D])
+    arrays/<métrica>.npy      una matriz por métrica
+
+load_country_arrays abre las matrices con np.load(mmap_mode='r'): varios
+procesos comparten las mismas páginas del sistema operativo, sin copiar ni
+deserializar, y el arranque no depende del tamaño de los datos.
+
+Uso desde la línea de comandos:
+    python -m src.array_store 2020-01-22 2021-12-31 [--metrics confirmed deaths new_confirmed]
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import CUBE_METRICS, build_country_cube
+from .cache import load_cleaned_dataset
+from .config import DATA_PROCESSED
+from .incidence import build_incidence_cube
+
+# Directorio por defecto de las matrices
+ARRAY_STORE_DIR = os.path.join(DATA_PROCESSED, 'arrays')
+
+# Métricas exportadas por defecto
+ARRAY_METRICS = CUBE_METRICS
+
+# Versión del formato en disco (se valida al abrir)
+ARRAY_STORE_VERSION = 1
+
+
+def _save_atomic(path, write):
+    """Escribe un archivo en una ruta temporal y lo reemplaza de una vez."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _dense(codes, days, values, shape, fill):
+    """
+    Ubica los valores en una matriz [países, días] y rellena los días sin dato.
+
+    Args:
+        codes (np.ndarray): Fila (país) de cada valor
+        days (np.ndarray): Columna (día) de cada valor
+        values (np.ndarray): Valores
+        shape (tuple): Forma de la matriz
+        fill (str, optional): 'ffill' arrastra el último valor del país (0 antes
+            del primer reporte), 'zero' usa 0 y None deja NaN
+
+    Returns:
+        np.ndarray: Matriz float64
+    """
+    matrix = np.full(shape, np.nan)
+    matrix[codes, days] = values
+    if fill == 'ffill':
+        columns = np.where(np.isnan(matrix), 0, np.arange(shape[1]))
+        np.maximum.accumulate(columns, axis=1, out=columns)
+        matrix = np.take_along_axis(matrix, columns, axis=1)
+    if fill is not None:
+        matrix[np.isnan(matrix)] = 0.0
+    return matrix
+
+
+def export_country_arrays(df, store_dir=None, metrics=None, fill='ffill', verbose=True):
+    """
+    Exporta las métricas por país y día como matrices densas .npy.
+
+    Las métricas acumuladas se rellenan según fill; las de incidencia
+    ('new_*', ver src/incidence.py) siempre usan 0 en los días sin dato.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio (o cubo país × fecha) con columnas
+            continent, country_region y date
+        store_dir (str, optional): Directorio de salida. Si es None, usa ARRAY_STORE_DIR
+        metrics (list, optional): Métricas a exportar. Si es None, usa ARRAY_METRICS
+        fill (str, optional): Relleno de días sin dato: 'ffill', 'zero' o None (NaN)
+        verbose (bool): Si True, imprime el resultado
+
+    Returns:
+        dict: Metadatos escritos en meta.json
+    """
+    if store_dir is None:
+        store_dir = ARRAY_STORE_DIR
+    if metrics is None:
+        metrics = ARRAY_METRICS
+    if fill not in ('ffill', 'zero', None):
+        raise ValueError(f"fill debe ser 'ffill', 'zero' o None, no {fill!r}")
+
+    incidence = [m for m in metrics if m.startswith('new_')]
+    if incidence:
+        # El cubo de incidencia incluye también los acumulados de CUBE_METRICS
+        cube = build_incidence_cube(df, metrics=[m[len('new_'):] for m in incidence])
+    else:
+        cube = build_country_cube(df, metrics)
+    metrics = [m for m in metrics if m in cube.columns]
+
+    codes, countries = pd.factorize(cube['country_region'], sort=True)
+    continents = (
+        cube[['country_region', 'continent']].astype(object)
+        .drop_duplicates('country_region').set_index('country_region')['continent']
+    )
+    start, end = cube['date'].min(), cube['date'].max()
+    dates = np.arange(start.to_datetime64().astype('datetime64[D]'),
+                      end.to_datetime64().astype('datetime64[D]') + 1)
+    days = (cube['date'].to_numpy().astype('datetime64[D]') - dates[0]).astype(np.int64)
+    shape = (len(countries), len(dates))
+
+    os.makedirs(store_dir, exist_ok=True)
+    for metric in metrics:
+        metric_fill = 'zero' if metric in incidence else fill
+        matrix = _dense(codes, days, cube[metric].to_numpy(dtype=float), shape, metric_fill)
+        _save_atomic(os.path.join(store_dir, f'{metric}.npy'), lambda f: np.save(f, matrix))
+    _save_atomic(os.path.join(store_dir, 'dates.npy'), lambda f: np.save(f, dates))
+
+    country_list = [str(country) for country in countries]
+    index = {
+        'countries': country_list,
+        'continents': [None if pd.isna(continents[c]) else str(continents[c]) for c in countries],
+    }
+    _save_atomic(os.path.join(store_dir, 'countries.json'),
+                 lambda f: f.write(json.dumps(index, ensure_ascii=False).encode('utf-8')))
+
+    # meta.json se escribe al final: su presencia indica un almacén completo
+    meta = {
+        'version': ARRAY_STORE_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'metrics': metrics,
+        'shape': list(shape),
+        'start_date': str(dates[0]),
+        'end_date': str(dates[-1]),
+        'fill': fill,
+    }
+    _save_atomic(os.path.join(store_dir, 'meta.json'),
+                 lambda f: f.write(json.dumps(meta, indent=2).encode('utf-8')))
+
+    if verbose:
+        size_mb = len(metrics) * shape[0] * shape[1] * 8 / (1024 * 1024)
+        print(f"✓ Matrices exportadas: {len(metrics)} métricas de {shape[0]} países × "
+              f"{shape[1]} días ({size_mb:.1f} MB) en {store_dir}")
+    return meta
+
+
+def load_country_arrays(store_dir=None, metrics=None, mmap_mode='r'):
+    """
+    Abre las matrices país × día exportadas con export_country_arrays.
+
+    Con mmap_mode='r' las matrices no se leen a memoria: se mapean en modo de
+    solo lectura y el sistema operativo carga las páginas al accederlas.
+
+    Args:
+        store_dir (str, optional): Directorio de las matrices. Si es None, usa ARRAY_STORE_DIR
+        metrics (list, optional): Métricas a abrir. Si es None, todas las exportadas
+        mmap_mode (str, optional): Modo de np.load; None lee las matrices a memoria
+
+    Returns:
+        dict: Con las claves:
+            - 'arrays': {métrica: matriz [n_países, n_días]}
+            - 'countries': lista de países (fila de cada matriz)
+            - 'continents': continente de cada país (o None)
+            - 'country_index': {país: fila}
+            - 'dates': eje de fechas (datetime64[D])
+            - 'meta': metadatos de meta.json
+    """
+    if store_dir is None:
+        store_dir = ARRAY_STORE_DIR
+
+    meta_path = os.path.join(store_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        raise FileNotFoundError(f"No hay matrices exportadas en {store_dir}")
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != ARRAY_STORE_VERSION:
+        raise ValueError(f"Versión de matrices {meta.get('version')} no soportada "
+                         f"(se esperaba {ARRAY_STORE_VERSION}); vuelve a exportarlas")
+
+    if metrics is None:
+        metrics = meta['metrics']
+    missing = [m for m in metrics if m not in meta['metrics']]
+    if missing:
+        raise KeyError(f"Métricas no exportadas: {missing}")
+
+    with open(os.path.join(store_dir, 'countries.json'), encoding='utf-8') as f:
+        index = json.load(f)
+
+    arrays = {
+        metric: np.load(os.path.join(store_dir, f'{metric}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+        for metric in metrics
+    }
+    return {
+        'arrays': arrays,
+        'countries': index['countries'],
+        'continents': index['continents'],
+        'country_index': {country: row for row, country in enumerate(index['countries'])},
+        'dates': np.load(os.path.join(store_dir, 'dates.npy'), allow_pickle=False),
+        'meta': meta,
+    }
+
+
+def country_series(store, country, metric='confirmed', start_date=None, end_date=None):
+    """
+    Serie de un país como vista de la matriz (sin copia).
+
+    Args:
+        store (dict): Resultado de load_country_arrays
+        country (str): País
+        metric (str): Métrica
+        start_date (str, optional): Fecha inicial 'YYYY-MM-DD' (incluida)
+        end_date (str, optional): Fecha final 'YYYY-MM-DD' (incluida)
+
+    Returns:
+        tuple: (fechas, valores) como arreglos NumPy
+    """
+    row = store['country_index'][country]
+    dates = store['dates']
+    start = 0 if start_date is None else np.searchsorted(dates, np.datetime64(start_date, 'D'))
+    stop = len(dates) if end_date is None else np.searchsorted(dates, np.datetime64(end_date, 'D'), side='right')
+    return dates[start:stop], store['arrays'][metric][row, start:stop]
+
+
+def build_country_arrays(start_date, end_date, store_dir=None, metrics=None, workers=None):
+    """
+    Exporta las matrices a partir del dataset limpio (usa el caché en disco si es válido).
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        store_dir (str, optional): Directorio de salida. Si es None, usa ARRAY_STORE_DIR
+        metrics (list, optional): Métricas a exportar. Si es None, usa ARRAY_METRICS
+        workers (int, optional): Workers para la lectura paralela de los CSV
+
+    Returns:
+        dict: Metadatos escritos, o None si no hay datos
+    """
+    df = load_cleaned_dataset(start_date, end_date, workers=workers)
+    if df.empty:
+        return None
+    return export_country_arrays(df, store_dir, metrics=metrics)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Exporta matrices país × día en archivos .npy")
+    parser.add_argument('start_date', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('end_date', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--metrics', nargs='+', default=None,
+                        help=f"Métricas a exportar (por defecto: {' '.join(ARRAY_METRICS)})")
+    parser.add_argument('--output', default=None, help="Directorio de salida")
+    parser.add_argument('--workers', type=int, default=None, help="Workers de lectura")
+    args = parser.parse_args()
+
+    build_country_arrays(args.start_date, args.end_date, store_dir=args.output,
+                         metrics=args.metrics, workers=args.workers)
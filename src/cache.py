@@ -0,0 +1,223 @@
+"""
+Caché en disco del dataset limpio de COVID-19
+
+Guarda el resultado final de load_daily_reports → clean_covid_data →
+load_continent_mapping en formato Parquet dentro de DATA_PROCESSED, para que
+el dashboard y los notebooks no tengan que volver a leer los CSV crudos en
+cada ejecución.
+
+La clave del caché (huella de las fuentes) se construye a partir de:
+- Lista de archivos diarios del rango, con su tamaño y fecha de modificación
+- Diccionario COUNTRY_MAPPING
+- Contenido del archivo country_to_continent.csv
+Cualquier cambio en estas fuentes invalida el caché automáticamente.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+
+import pandas as pd
+
+from .config import (
+    COUNTRY_MAPPING,
+    CONTINENT_MAPPING_FILE,
+    DATA_PROCESSED,
+    DATA_RAW_COVID,
+    DATE_FORMAT,
+    _notify,
+    clean_covid_data,
+    load_continent_mapping,
+    load_daily_reports,
+)
+
+logger = logging.getLogger('covid.cache')
+
+# Directorio donde se guardan los archivos de caché
+CACHE_DIR = os.path.join(DATA_PROCESSED, 'cache')
+
+# Versión del pipeline de limpieza. Incrementar cuando cambie la lógica de
+# limpieza para invalidar cachés generados con la versión anterior.
+CACHE_VERSION = 3
+
+
+def _parquet_available():
+    """Indica si hay un motor de Parquet instalado (pyarrow o fastparquet)."""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def compute_config_fingerprint(mapping_file=None, country_mapping=None):
+    """
+    Calcula la huella de la configuración de limpieza (mapeos de países y continentes).
+
+    Args:
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+        country_mapping (dict, optional): Mapeo de países. Si es None, usa COUNTRY_MAPPING
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    if mapping_file is None:
+        mapping_file = CONTINENT_MAPPING_FILE
+    if country_mapping is None:
+        country_mapping = COUNTRY_MAPPING
+
+    hasher = hashlib.sha256()
+    hasher.update(f"v{CACHE_VERSION}".encode())
+
+    # Mapeo de nombres de países
+    hasher.update(json.dumps(country_mapping, sort_keys=True).encode())
+
+    # Contenido del archivo de continentes
+    try:
+        with open(mapping_file, 'rb') as f:
+            hasher.update(f.read())
+    except OSError:
+        hasher.update(b'no-continent-mapping')
+
+    return hasher.hexdigest()
+
+
+def compute_source_fingerprint(start_date, end_date, data_dir=None, mapping_file=None,
+                               country_mapping=None):
+    """
+    Calcula la huella (hash) de las fuentes que determinan el dataset limpio.
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        data_dir (str, optional): Directorio de reportes diarios. Si es None, usa DATA_RAW_COVID
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+        country_mapping (dict, optional): Mapeo de países. Si es None, usa COUNTRY_MAPPING
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    if data_dir is None:
+        data_dir = DATA_RAW_COVID
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{start_date}|{end_date}".encode())
+
+    # Archivos diarios: nombre, tamaño y fecha de modificación
+    for date in pd.date_range(start=start_date, end=end_date, freq='D'):
+        filename = date.strftime(DATE_FORMAT) + '.csv'
+        try:
+            stat = os.stat(os.path.join(data_dir, filename))
+            hasher.update(f"{filename}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+        except FileNotFoundError:
+            hasher.update(f"{filename}|missing\n".encode())
+
+    # Mapeo de países y archivo de continentes
+    hasher.update(compute_config_fingerprint(mapping_file, country_mapping).encode())
+
+    return hasher.hexdigest()
+
+
+def _cache_path(start_date, end_date, fingerprint, cache_dir):
+    """Ruta del archivo de caché para un rango y una huella."""
+    return os.path.join(cache_dir, f"covid_clean_{start_date}_{end_date}_{fingerprint[:16]}.parquet")
+
+
+def load_cleaned_dataset(start_date, end_date, data_dir=None, mapping_file=None,
+                         use_cache=True, cache_dir=None, workers=None, progress_interval=50,
+                         report=None, verbose=True):
+    """
+    Carga el dataset limpio con continentes, usando el caché en disco si es válido.
+
+    Si el caché no existe o las fuentes cambiaron, ejecuta el pipeline completo
+    (load_daily_reports → clean_covid_data → load_continent_mapping) y guarda el
+    resultado en formato Parquet.
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        data_dir (str, optional): Directorio de reportes diarios. Si es None, usa DATA_RAW_COVID
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+        use_cache (bool): Si False, ignora el caché y no lo actualiza
+        cache_dir (str, optional): Directorio del caché. Si es None, usa CACHE_DIR
+        workers (int, optional): Workers para la lectura paralela de load_daily_reports
+        progress_interval (int): Cada cuántos archivos mostrar progreso
+        report (list, optional): Lista donde se agregan las métricas de cada etapa
+            del pipeline (solo si se ejecuta; una lectura del caché no agrega registros)
+        verbose (bool): Si True, muestra el progreso y los mensajes del caché en
+            consola; si False, los mensajes van al logger ('covid.cache' y
+            'covid.pipeline') y no se imprime nada
+
+    Returns:
+        pd.DataFrame: DataFrame limpio con columna 'continent'
+    """
+    if cache_dir is None:
+        cache_dir = CACHE_DIR
+
+    if use_cache and not _parquet_available():
+        _notify("Caché deshabilitado: instala pyarrow para usar Parquet", logging.WARNING, verbose, logger)
+        use_cache = False
+
+    if use_cache:
+        fingerprint = compute_source_fingerprint(start_date, end_date, data_dir, mapping_file)
+        cache_file = _cache_path(start_date, end_date, fingerprint, cache_dir)
+
+        if os.path.exists(cache_file):
+            try:
+                df = pd.read_parquet(cache_file)
+                _notify(f"Dataset cargado desde caché: {os.path.basename(cache_file)} ({len(df):,} registros)",
+                        logging.INFO, verbose, logger)
+                return df
+            except Exception as e:
+                _notify(f"Caché ilegible, se regenera: {e}", logging.WARNING, verbose, logger)
+
+    # Pipeline completo desde los CSV crudos
+    df = load_daily_reports(start_date, end_date, data_dir=data_dir,
+                            progress_interval=progress_interval, workers=workers, verbose=verbose,
+                            report=report)
+    if df.empty:
+        return df
+    df = clean_covid_data(df, verbose=False, report=report)
+    df = load_continent_mapping(df, mapping_file=mapping_file, verbose=verbose, report=report)
+
+    if use_cache:
+        save_cleaned_dataset(df, cache_file, verbose=verbose)
+
+        # Eliminar cachés obsoletos del mismo rango
+        pattern = os.path.join(cache_dir, f"covid_clean_{start_date}_{end_date}_*.parquet")
+        for stale in glob.glob(pattern):
+            if stale != cache_file:
+                os.remove(stale)
+
+    return df
+
+
+def save_cleaned_dataset(df, path, verbose=True):
+    """
+    Guarda un DataFrame en Parquet de forma atómica (archivo temporal + rename).
+
+    Args:
+        df (pd.DataFrame): DataFrame a guardar
+        path (str): Ruta de destino
+        verbose (bool): Si True, informa el resultado en consola; si False, en el
+            logger 'covid.cache' (los errores se informan siempre)
+
+    Returns:
+        bool: True si el archivo quedó escrito; False si falló (el destino no se modifica)
+    """
+    tmp_path = path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        _notify(f"No se pudo guardar {os.path.basename(path)}: {e}", logging.WARNING, verbose, logger)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    _notify(f"Caché guardado: {os.path.basename(path)}", logging.INFO, verbose, logger)
+    return True
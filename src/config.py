@@ -5,9 +5,41 @@ Este archivo contiene configuraciones compartidas entre todas las etapas:
 - Mapeo de nombres de países
 - Rutas de datos
 - Configuraciones generales
+
+Las constantes se pueden importar sin cargar pandas ni numpy: ambos se importan
+recién cuando una función de procesamiento los usa por primera vez. Esto
+beneficia a scripts y notebooks que solo necesitan rutas o mapeos; el
+dashboard igual carga pandas (a través de streamlit y src.cache).
 """
 
+import csv
+import importlib
+import logging
 import os
+import time
+
+
+class _LazyModule:
+    """
+    Módulo que se importa en el primer acceso a uno de sus atributos.
+    
+    Al importarse reemplaza su propio nombre en el espacio global de este
+    archivo, por lo que los accesos siguientes van directo al módulo real.
+    """
+    
+    def __init__(self, module_name, alias):
+        self._module_name = module_name
+        self._alias = alias
+    
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._module_name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+# pandas y numpy se cargan al primer uso (ver _LazyModule)
+pd = _LazyModule('pandas', 'pd')
+np = _LazyModule('numpy', 'np')
 
 # ============================================================================
 # MAPEO DE NOMBRES DE PAÍSES
@@ -74,18 +106,356 @@ COLUMNS_TO_DROP = ['fips', 'admin2', 'lat', 'long_', 'latitude', 'longitude', 'c
 # Columnas numéricas para convertir
 NUMERIC_COLUMNS = ['confirmed', 'deaths', 'recovered']
 
+# Columnas geográficas que se convierten a category en el perfil de memoria compacto
+CATEGORICAL_COLUMNS = ['country_region', 'province_state', 'continent']
+
+# Columnas de conteo que se reducen al entero más pequeño que las contiene
+COUNT_COLUMNS = ['confirmed', 'deaths', 'recovered', 'active_cases']
+
 # Formato de fecha para archivos CSV de JHU
 DATE_FORMAT = '%m-%d-%Y'  # MM-DD-YYYY
 
+# Formatos de la columna Last_Update según la época del reporte.
+# Formato: (patrón que identifica el texto, formato de strptime)
+LAST_UPDATE_FORMATS = [
+    (r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', '%Y-%m-%d %H:%M:%S'),   # 2020-06-01 02:33:44
+    (r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}', '%Y-%m-%dT%H:%M:%S'),   # 2020-03-22T23:45:00
+    (r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}', '%Y-%m-%d %H:%M'),              # 2020-03-22 23:45
+    (r'\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}', '%m/%d/%Y %H:%M'),        # 1/22/2020 17:00
+    (r'\d{1,2}/\d{1,2}/\d{2} \d{1,2}:\d{2}', '%m/%d/%y %H:%M'),        # 3/8/20 5:31
+]
+
+# ============================================================================
+# REGISTRO DE ESQUEMAS DE LOS REPORTES DIARIOS
+# ============================================================================
+# Columnas canónicas que se conservan de cada archivo diario (en este orden)
+# y su tipo de dato al leer. El resto (FIPS, Admin2, Lat, Long_, Combined_Key...)
+# se descarta durante la lectura.
+SCHEMA_COLUMNS = {
+    'Province_State': 'str',
+    'Country_Region': 'str',
+    'Last_Update': 'str',
+    'Confirmed': 'float64',
+    'Deaths': 'float64',
+    'Recovered': 'float64',
+    'Active': 'float64',
+    'Incident_Rate': 'float64',
+    'Case_Fatality_Ratio': 'float64',
+}
+
+# Eras de esquema de JHU, detectadas por las columnas del encabezado.
+# Formato: 'era': {'header': columnas requeridas, 'rename': {original: canónica}}
+SCHEMA_ERAS = {
+    # 01-22-2020 → 02-29-2020 (y 03-01-2020 → 03-21-2020 con Latitude/Longitude)
+    'slash_headers': {
+        'header': {'Province/State', 'Country/Region', 'Last Update'},
+        'rename': {
+            'Province/State': 'Province_State',
+            'Country/Region': 'Country_Region',
+            'Last Update': 'Last_Update',
+        },
+    },
+    # 03-22-2020 en adelante: filas por condado (FIPS/Admin2) y guiones bajos
+    'underscore_headers': {
+        'header': {'Province_State', 'Country_Region', 'Last_Update'},
+        'rename': {
+            'Incidence_Rate': 'Incident_Rate',
+            'Case-Fatality_Ratio': 'Case_Fatality_Ratio',
+        },
+    },
+}
+
 # ============================================================================
-# FUNCIONES DE PROCESAMIENTO DE DATOS
+# INSTRUMENTACIÓN DEL PIPELINE
 # ============================================================================
+# Cada etapa (load_daily_reports, los pasos de clean_covid_data y
+# load_continent_mapping) produce un registro con 'stage', 'seconds',
+# 'rows_in', 'rows_out', 'memory_mb' y 'memory_delta_mb'. Los registros se
+# agregan a la lista `report` que recibe cada función, se emiten por el logger
+# 'covid.pipeline' (nivel DEBUG) y se pasan a los hooks registrados.
+logger = logging.getLogger('covid.pipeline')
 
-import pandas as pd
-import numpy as np
+# Funciones que reciben cada registro de etapa (ver add_stage_hook)
+_STAGE_HOOKS = []
 
 
-def load_daily_reports(start_date, end_date, data_dir=None, progress_interval=50):
+def add_stage_hook(hook):
+    """
+    Registra una función que recibe el dict de métricas de cada etapa.
+    
+    Args:
+        hook (callable): Función hook(record) llamada al terminar cada etapa
+    """
+    if hook not in _STAGE_HOOKS:
+        _STAGE_HOOKS.append(hook)
+
+
+def remove_stage_hook(hook):
+    """
+    Elimina un hook registrado con add_stage_hook (si existe).
+    
+    Args:
+        hook (callable): Función registrada previamente
+    """
+    if hook in _STAGE_HOOKS:
+        _STAGE_HOOKS.remove(hook)
+
+
+# Símbolo de cada nivel en los mensajes de consola
+_LEVEL_SYMBOLS = {logging.INFO: '✓', logging.WARNING: '⚠', logging.ERROR: '✗'}
+
+
+def _notify(message, level=logging.INFO, verbose=True, log=None):
+    """
+    Informa un evento por un solo canal: la consola si verbose, el logger si no.
+    
+    Args:
+        message (str): Mensaje (sin símbolo)
+        level (int): Nivel de logging (INFO, WARNING o ERROR)
+        verbose (bool): Si True, imprime el mensaje con el símbolo de su nivel
+        log (logging.Logger, optional): Logger de destino. Si es None, usa 'covid.pipeline'
+    """
+    if verbose:
+        print(f"{_LEVEL_SYMBOLS.get(level, '-')} {message}")
+    else:
+        (log or logger).log(level, message)
+
+
+def _frame_memory_mb(df):
+    """Memoria de los buffers del DataFrame en MB (sin recorrer strings de tipo object)."""
+    if df is None:
+        return 0.0
+    return df.memory_usage(index=True, deep=False).sum() / (1024 * 1024)
+
+
+def record_stage(stage, seconds, rows_in, df_out, memory_before_mb=0.0, report=None, **extra):
+    """
+    Registra las métricas de una etapa del pipeline.
+    
+    Args:
+        stage (str): Nombre de la etapa
+        seconds (float): Tiempo de pared de la etapa
+        rows_in (int): Filas de entrada
+        df_out (pd.DataFrame): Resultado de la etapa
+        memory_before_mb (float): Memoria de la entrada en MB
+        report (list, optional): Lista donde se agrega el registro
+        **extra: Campos adicionales del registro (por ejemplo 'files')
+    
+    Returns:
+        dict: Registro de la etapa
+    """
+    memory_after_mb = _frame_memory_mb(df_out)
+    record = {
+        'stage': stage,
+        'seconds': seconds,
+        'rows_in': int(rows_in),
+        'rows_out': int(len(df_out)) if df_out is not None else 0,
+        'memory_mb': memory_after_mb,
+        'memory_delta_mb': memory_after_mb - memory_before_mb,
+    }
+    record.update(extra)
+    
+    if report is not None:
+        report.append(record)
+    logger.debug("%s: %.3fs, %d → %d filas, %+.1f MB", stage, seconds,
+                 record['rows_in'], record['rows_out'], record['memory_delta_mb'])
+    for hook in list(_STAGE_HOOKS):
+        hook(record)
+    return record
+
+
+def run_stage(stage, func, df, report=None, **kwargs):
+    """
+    Ejecuta una etapa DataFrame → DataFrame y registra sus métricas.
+    
+    Si no hay lista de reporte, hooks ni logger activo en DEBUG, llama a la
+    función directamente sin medir nada.
+    
+    Args:
+        stage (str): Nombre de la etapa
+        func (callable): Función que recibe df (y kwargs) y devuelve un DataFrame
+        df (pd.DataFrame): Entrada de la etapa
+        report (list, optional): Lista donde se agrega el registro
+        **kwargs: Argumentos adicionales para func
+    
+    Returns:
+        pd.DataFrame: Resultado de func
+    """
+    if report is None and not _STAGE_HOOKS and not logger.isEnabledFor(logging.DEBUG):
+        return func(df, **kwargs)
+    
+    rows_in = len(df)
+    memory_before_mb = _frame_memory_mb(df)
+    start = time.perf_counter()
+    result = func(df, **kwargs)
+    record_stage(stage, time.perf_counter() - start, rows_in, result, memory_before_mb, report)
+    return result
+
+
+def format_report(report):
+    """
+    Formatea un reporte de etapas como tabla de texto.
+    
+    Args:
+        report (list): Registros producidos por record_stage
+    
+    Returns:
+        str: Tabla con tiempo, filas y memoria de cada etapa
+    """
+    total = sum(record['seconds'] for record in report)
+    lines = [f"{'Etapa':<32} {'Tiempo':>9} {'%':>6} {'Filas entrada':>14} {'Filas salida':>14} {'Δ Memoria':>11}"]
+    for record in report:
+        share = record['seconds'] / total * 100 if total > 0 else 0
+        lines.append(f"{record['stage']:<32} {record['seconds']:>8.3f}s {share:>5.1f}% "
+                     f"{record['rows_in']:>14,} {record['rows_out']:>14,} "
+                     f"{record['memory_delta_mb']:>+8.1f} MB")
+    lines.append(f"{'Total':<32} {total:>8.3f}s")
+    return '\n'.join(lines)
+
+# ============================================================================
+# LECTURA Y LIMPIEZA DE REPORTES DIARIOS
+# ============================================================================
+
+
+def detect_schema_era(columns):
+    """
+    Detecta la era de esquema de un reporte diario a partir de su encabezado.
+    
+    Args:
+        columns (list): Nombres de columnas del archivo (sin espacios al inicio/fin)
+    
+    Returns:
+        str or None: Nombre de la era en SCHEMA_ERAS, o None si no se reconoce
+    """
+    header = set(columns)
+    for era, spec in SCHEMA_ERAS.items():
+        if spec['header'] <= header:
+            return era
+    return None
+
+
+def _read_normalized_report(filepath):
+    """
+    Lee un reporte diario seleccionando, renombrando y tipando solo las columnas canónicas.
+    
+    Args:
+        filepath (str): Ruta al archivo CSV diario
+    
+    Returns:
+        pd.DataFrame or None: DataFrame con columnas de SCHEMA_COLUMNS, o None si
+            la era del encabezado no se reconoce
+    """
+    # Leer solo el encabezado (el módulo csv es mucho más liviano que pd.read_csv)
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        raw_columns = next(csv.reader(f), [])
+    era = detect_schema_era([col.strip() for col in raw_columns])
+    if era is None:
+        return None
+    
+    # Nombre canónico de cada columna del archivo (las demás se descartan)
+    rename = SCHEMA_ERAS[era]['rename']
+    names = []
+    for i, raw in enumerate(raw_columns):
+        name = rename.get(raw.strip(), raw.strip())
+        names.append(name if name in SCHEMA_COLUMNS and name not in names else f'_unused_{i}')
+    usecols = [name for name in names if name in SCHEMA_COLUMNS]
+    
+    # Renombrar, seleccionar y tipar durante la lectura
+    df = pd.read_csv(
+        filepath,
+        header=0,
+        names=names,
+        usecols=usecols,
+        dtype={name: SCHEMA_COLUMNS[name] for name in usecols}
+    )
+    ordered = [col for col in SCHEMA_COLUMNS if col in usecols]
+    if list(df.columns) != ordered:
+        df = df[ordered]
+    return df
+
+
+def _read_daily_report(filepath, date, normalize_schema=True):
+    """
+    Lee un archivo CSV diario y normaliza sus columnas principales.
+    
+    Args:
+        filepath (str): Ruta al archivo CSV diario
+        date (pd.Timestamp): Fecha del reporte
+        normalize_schema (bool): Si True, aplica el registro de esquemas (SCHEMA_ERAS)
+            para leer solo las columnas canónicas ya renombradas y tipadas
+    
+    Returns:
+        tuple: (DataFrame, None) si la lectura fue exitosa, (None, excepción) en caso contrario
+    """
+    try:
+        df = _read_normalized_report(filepath) if normalize_schema else None
+        if df is not None:
+            df['Date'] = date
+            return df, None
+        
+        # Encabezado no reconocido: lectura completa y normalización básica
+        df = pd.read_csv(filepath)
+        df.columns = df.columns.str.strip()
+        
+        # Normalizar nombres de columnas para compatibilidad
+        if 'Province/State' in df.columns:
+            df.rename(columns={'Province/State': 'Province_State'}, inplace=True)
+        if 'Country/Region' in df.columns:
+            df.rename(columns={'Country/Region': 'Country_Region'}, inplace=True)
+        if 'Province_State' not in df.columns:
+            df['Province_State'] = np.nan
+        if 'Country_Region' not in df.columns and 'Country' in df.columns:
+            df.rename(columns={'Country': 'Country_Region'}, inplace=True)
+        
+        df['Date'] = date
+        return df, None
+    
+    except Exception as e:
+        return None, e
+
+
+def _iter_daily_reports(files, workers=None, executor='thread', normalize_schema=True):
+    """
+    Lee archivos diarios de forma secuencial o concurrente, preservando el orden.
+    
+    Args:
+        files (list): Lista de tuplas (ruta, fecha) a leer
+        workers (int, optional): Número de workers. Si es None o 1, lee secuencialmente
+        executor (str): 'thread' o 'process'
+        normalize_schema (bool): Si True, normaliza el esquema de cada archivo al leerlo
+    
+    Yields:
+        tuple: (DataFrame, error) en el mismo orden que `files`
+    """
+    if not workers or workers <= 1 or len(files) <= 1:
+        for filepath, date in files:
+            yield _read_daily_report(filepath, date, normalize_schema)
+        return
+    
+    import concurrent.futures
+    
+    if executor == 'thread':
+        pool_class = concurrent.futures.ThreadPoolExecutor
+        chunksize = 1
+    elif executor == 'process':
+        pool_class = concurrent.futures.ProcessPoolExecutor
+        # Agrupar archivos por tarea para reducir el costo de comunicación entre procesos
+        chunksize = max(1, len(files) // (workers * 4))
+    else:
+        raise ValueError(f"executor debe ser 'thread' o 'process', no {executor!r}")
+    
+    paths = [filepath for filepath, _ in files]
+    dates = [date for _, date in files]
+    
+    # Executor.map entrega los resultados en el orden de entrada
+    with pool_class(max_workers=workers) as pool:
+        yield from pool.map(_read_daily_report, paths, dates, [normalize_schema] * len(paths),
+                            chunksize=chunksize)
+
+
+def load_daily_reports(start_date, end_date, data_dir=None, progress_interval=50,
+                       workers=None, executor='thread', normalize_schema=True,
+                       verbose=True, report=None):
     """
     Carga archivos CSV diarios del repositorio JHU COVID-19 para un rango de fechas.
     
@@ -94,6 +464,17 @@ def load_daily_reports(start_date, end_date, data_dir=None, progress_interval=50
         end_date (str): Fecha final en formato 'YYYY-MM-DD'
         data_dir (str, optional): Ruta al directorio de datos. Si es None, usa DATA_RAW_COVID
         progress_interval (int): Cada cuántos archivos mostrar progreso
+        workers (int, optional): Número de workers para leer archivos en paralelo.
+            Si es None o 1, los archivos se leen secuencialmente
+        executor (str): Tipo de pool para el modo paralelo: 'thread' o 'process'
+        normalize_schema (bool): Si True, cada archivo se lee según su era de esquema
+            (SCHEMA_ERAS) conservando solo SCHEMA_COLUMNS, por lo que el DataFrame
+            concatenado ya es angosto y no tiene columnas duplicadas. Si False, se
+            leen todas las columnas de cada archivo
+        verbose (bool): Si True, muestra el progreso y los archivos faltantes o con
+            error; si False, estos se registran como advertencias en el logger
+            'covid.pipeline' (cada evento sale por un solo canal)
+        report (list, optional): Lista donde se agrega el registro de la etapa
     
     Returns:
         pd.DataFrame: DataFrame consolidado con todos los datos del período
@@ -106,119 +487,169 @@ def load_daily_reports(start_date, end_date, data_dir=None, progress_interval=50
     
     # Lista temporal para acumular los DataFrames
     dfs = []
+    start = time.perf_counter()
+    
+    if verbose:
+        print("Cargando datos desde archivos locales...")
+        print(f"{'='*60}")
+        print(f"Período: {start_date} → {end_date}")
+        print(f"Total de archivos a cargar: {len(dates)}")
+        if workers and workers > 1:
+            print(f"Lectura paralela: {workers} workers ({executor})")
+        print(f"{'='*60}\n")
+    
+    # Identificar archivos existentes antes de leer
+    filenames = [date.strftime(DATE_FORMAT) + '.csv' for date in dates]
+    filepaths = [os.path.join(data_dir, filename) for filename in filenames]
+    exists = [os.path.exists(filepath) for filepath in filepaths]
     
-    print("Cargando datos desde archivos locales...")
-    print(f"{'='*60}")
-    print(f"Período: {start_date} → {end_date}")
-    print(f"Total de archivos a cargar: {len(dates)}")
-    print(f"{'='*60}\n")
+    results = _iter_daily_reports(
+        [(filepath, date) for filepath, date, ok in zip(filepaths, dates, exists) if ok],
+        workers=workers,
+        executor=executor,
+        normalize_schema=normalize_schema
+    )
     
-    # Leer cada archivo CSV diario
-    for i, date in enumerate(dates, 1):
-        filename = date.strftime(DATE_FORMAT) + '.csv'
-        filepath = os.path.join(data_dir, filename)
+    # Recorrer los archivos en orden de fecha
+    for i, (filename, ok) in enumerate(zip(filenames, exists), 1):
+        if not ok:
+            _notify(f"Archivo no encontrado: {filename}", logging.WARNING, verbose)
+            continue
         
-        if not os.path.exists(filepath):
-            print(f"⚠ Archivo no encontrado: {filename}")
+        df, error = next(results)
+        if error is not None:
+            _notify(f"Error en {filename}: {error}", logging.ERROR, verbose)
             continue
         
-        try:
-            df = pd.read_csv(filepath)
-            df.columns = df.columns.str.strip()
-            
-            # Normalizar nombres de columnas para compatibilidad
-            if 'Province/State' in df.columns:
-                df.rename(columns={'Province/State': 'Province_State'}, inplace=True)
-            if 'Country/Region' in df.columns:
-                df.rename(columns={'Country/Region': 'Country_Region'}, inplace=True)
-            if 'Province_State' not in df.columns:
-                df['Province_State'] = np.nan
-            if 'Country_Region' not in df.columns and 'Country' in df.columns:
-                df.rename(columns={'Country': 'Country_Region'}, inplace=True)
-            
-            df['Date'] = date
-            dfs.append(df)
-            
-            # Mostrar progreso
-            if i % progress_interval == 0:
-                print(f"✓ Cargados {i}/{len(dates)} archivos ({i/len(dates)*100:.1f}%)")
-                
-        except Exception as e:
-            print(f"✗ Error en {filename}: {e}")
+        dfs.append(df)
+        
+        # Mostrar progreso
+        if verbose and i % progress_interval == 0:
+            print(f"✓ Cargados {i}/{len(dates)} archivos ({i/len(dates)*100:.1f}%)")
     
     # Concatenar todos los DataFrames
     if dfs:
         df_consolidated = pd.concat(dfs, ignore_index=True)
-        print(f"\n{'='*60}")
-        print(f"✓ Cargados {len(dfs)} archivos diarios")
-        print(f"✓ Total de registros: {len(df_consolidated):,}")
-        print(f"✓ Período: {df_consolidated['Date'].min().date()} → {df_consolidated['Date'].max().date()}")
-        print(f"{'='*60}")
-        return df_consolidated
+        if verbose:
+            print(f"\n{'='*60}")
+            print(f"✓ Cargados {len(dfs)} archivos diarios")
+            print(f"✓ Total de registros: {len(df_consolidated):,}")
+            print(f"✓ Período: {df_consolidated['Date'].min().date()} → {df_consolidated['Date'].max().date()}")
+            print(f"{'='*60}")
     else:
-        print("\n⚠ No se cargó ningún archivo.")
-        print("Ejecuta: ./scripts/fetch_jhu_data.sh clone")
-        return pd.DataFrame()
+        df_consolidated = pd.DataFrame()
+        if verbose:
+            print("\n⚠ No se cargó ningún archivo.")
+            print("Ejecuta: ./scripts/fetch_jhu_data.sh clone")
+    
+    record_stage('load_daily_reports', time.perf_counter() - start, 0, df_consolidated,
+                 report=report, files=len(dfs))
+    return df_consolidated
 
 
-def standardize_column_names(df):
+def standardize_column_names(df, verbose=True):
     """
     Estandariza nombres de columnas a formato snake_case.
     
     Args:
         df (pd.DataFrame): DataFrame a procesar
+        verbose (bool): Si True, muestra un mensaje al terminar
     
     Returns:
         pd.DataFrame: DataFrame con columnas estandarizadas
     """
     df.columns = df.columns.str.lower().str.replace(' ', '_').str.replace('/', '_').str.replace('-', '_')
-    print("✓ Nombres de columnas estandarizados")
+    if verbose:
+        print("✓ Nombres de columnas estandarizados")
     return df
 
 
-def consolidate_duplicate_columns(df):
+def _coalesce_columns(columns):
+    """
+    Primer valor no nulo por fila entre varias columnas del mismo tipo.
+    
+    Con las máscaras de no nulos se elige, para cada fila, la primera columna
+    con valor y se toman todos los valores de una vez del arreglo concatenado
+    de las columnas.
+    
+    Args:
+        columns (list): Series con el mismo índice y dtype
+    
+    Returns:
+        pd.Series: Columna consolidada con el dtype original
+    """
+    first = columns[0]
+    n_rows = len(first)
+    
+    # Columna de origen de cada fila (0 si ninguna tiene valor: se conserva el nulo)
+    filled = first.notna().to_numpy().copy()
+    source = np.zeros(n_rows, dtype=np.intp)
+    for k, col in enumerate(columns[1:], 1):
+        available = col.notna().to_numpy() & ~filled
+        source[available] = k
+        filled |= available
+    
+    positions = source * n_rows + np.arange(n_rows)
+    values = pd.concat(columns, ignore_index=True).array.take(positions)
+    return pd.Series(values, index=first.index, dtype=first.dtype, name=first.name)
+
+
+def consolidate_duplicate_columns(df, verbose=True):
     """
     Consolida columnas duplicadas tomando el primer valor no nulo.
     
+    Todos los grupos de columnas duplicadas se resuelven en una sola pasada
+    sobre arreglos NumPy y el DataFrame se reconstruye una única vez. Las
+    columnas consolidadas quedan al final, en el orden en que aparece su
+    primer duplicado.
+    
     Args:
         df (pd.DataFrame): DataFrame con posibles columnas duplicadas
+        verbose (bool): Si True, muestra las columnas consolidadas
     
     Returns:
         pd.DataFrame: DataFrame con columnas consolidadas
     """
     duplicated_cols = df.columns[df.columns.duplicated()].unique()
     
-    if len(duplicated_cols) > 0:
+    if len(duplicated_cols) == 0:
+        if verbose:
+            print("✓ No hay columnas duplicadas")
+        return df
+    
+    if verbose:
         print(f"⚠ Encontradas columnas duplicadas: {duplicated_cols.tolist()}")
+    
+    is_duplicated = df.columns.isin(duplicated_cols)
+    consolidated = []
+    for col_name in duplicated_cols:
+        # Todas las columnas con este nombre, en orden
+        matching = [df.iloc[:, i] for i in np.flatnonzero(df.columns == col_name)]
         
-        for col_name in duplicated_cols:
-            # Obtener todas las columnas con este nombre
-            matching_cols = [i for i, c in enumerate(df.columns) if c == col_name]
-            
-            # Consolidar: tomar el primer valor no nulo de cada fila
-            consolidated = df.iloc[:, matching_cols[0]]
-            for col_idx in matching_cols[1:]:
-                consolidated = consolidated.fillna(df.iloc[:, col_idx])
-            
-            # Eliminar todas las columnas duplicadas
-            df = df.drop(df.columns[matching_cols], axis=1)
-            
-            # Agregar la columna consolidada
-            df[col_name] = consolidated
+        if all(col.dtype == matching[0].dtype for col in matching):
+            column = _coalesce_columns(matching)
+        else:
+            # Tipos distintos: fillna encadenado conserva la promoción de tipos de pandas
+            column = matching[0]
+            for other in matching[1:]:
+                column = column.fillna(other)
+        consolidated.append(column.rename(col_name))
+        if verbose:
             print(f"  ✓ '{col_name}' consolidada")
-    else:
-        print("✓ No hay columnas duplicadas")
     
-    return df
+    # Reconstruir el DataFrame una sola vez (columnas únicas sin copiar + consolidadas)
+    unique = [df.iloc[:, i] for i in np.flatnonzero(~is_duplicated)]
+    return pd.concat(unique + consolidated, axis=1)
 
 
-def drop_irrelevant_columns(df, columns_to_drop=None):
+def drop_irrelevant_columns(df, columns_to_drop=None, verbose=True):
     """
     Elimina columnas irrelevantes del DataFrame.
     
     Args:
         df (pd.DataFrame): DataFrame a procesar
         columns_to_drop (list, optional): Lista de columnas a eliminar. Si es None, usa COLUMNS_TO_DROP
+        verbose (bool): Si True, muestra un mensaje al terminar
     
     Returns:
         pd.DataFrame: DataFrame sin columnas irrelevantes
@@ -227,33 +658,92 @@ def drop_irrelevant_columns(df, columns_to_drop=None):
         columns_to_drop = COLUMNS_TO_DROP
     
     df = df.drop(columns=[col for col in columns_to_drop if col in df.columns])
-    print("✓ Columnas irrelevantes eliminadas")
+    if verbose:
+        print("✓ Columnas irrelevantes eliminadas")
     return df
 
 
-def process_dates(df):
+# Memo de textos de Last_Update ya convertidos (texto → datetime64), compartido
+# entre llamadas: miles de filas de un mismo archivo repiten el mismo valor
+_LAST_UPDATE_CACHE = {}
+
+# Tamaño máximo del memo antes de vaciarlo
+LAST_UPDATE_CACHE_SIZE = 200_000
+
+
+def parse_last_update(values):
+    """
+    Convierte textos de Last_Update a fechas con el formato explícito de cada uno.
+    
+    Solo se convierten los textos distintos que no están en el memo: cada uno se
+    asigna al primer formato de LAST_UPDATE_FORMATS cuyo patrón coincide y se
+    convierte por grupos con pd.to_datetime(format=...). Los textos que no
+    coinciden con ningún formato se convierten con format='mixed'. Los valores
+    inválidos quedan como NaT.
+    
+    Args:
+        values (pd.Series): Textos de fecha y hora (pueden incluir nulos)
+    
+    Returns:
+        pd.Series: Fechas (datetime64) con el mismo índice
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Index(uniques).astype(str)
+    
+    # El resultado se arma con un dict local: el memo es compartido entre hilos
+    # (sesiones del dashboard) y otro hilo puede vaciarlo en cualquier momento
+    found = {text: _LAST_UPDATE_CACHE.get(text) for text in uniques}
+    pending = [text for text, value in found.items() if value is None]
+    if pending:
+        pending = pd.Series(pending, dtype=object)
+        unmatched = pd.Series(True, index=pending.index)
+        for pattern, fmt in LAST_UPDATE_FORMATS:
+            matches = unmatched & pending.str.fullmatch(pattern)
+            if matches.any():
+                parsed = pd.to_datetime(pending[matches], format=fmt, errors='coerce')
+                found.update(zip(pending[matches], parsed.to_numpy()))
+                unmatched &= ~matches
+        if unmatched.any():
+            parsed = pd.to_datetime(pending[unmatched], format='mixed', errors='coerce')
+            found.update(zip(pending[unmatched], parsed.to_numpy()))
+        
+        if len(_LAST_UPDATE_CACHE) + len(pending) > LAST_UPDATE_CACHE_SIZE:
+            _LAST_UPDATE_CACHE.clear()
+        _LAST_UPDATE_CACHE.update((text, found[text]) for text in pending)
+    
+    parsed = np.array([found[text] for text in uniques], dtype='datetime64[us]')
+    
+    # Los nulos (código -1) quedan como NaT
+    result = np.append(parsed, np.datetime64('NaT', 'us'))[codes]
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def process_dates(df, verbose=True):
     """
     Procesa la columna de fechas last_update.
     
     Args:
         df (pd.DataFrame): DataFrame a procesar
+        verbose (bool): Si True, muestra un mensaje al terminar
     
     Returns:
         pd.DataFrame: DataFrame con fechas procesadas
     """
     if 'last_update' in df.columns:
-        df['last_update'] = pd.to_datetime(df['last_update'], errors='coerce')
-        print("✓ Fechas procesadas")
+        df['last_update'] = parse_last_update(df['last_update'])
+        if verbose:
+            print("✓ Fechas procesadas")
     return df
 
 
-def convert_numeric_columns(df, numeric_columns=None):
+def convert_numeric_columns(df, numeric_columns=None, verbose=True):
     """
     Convierte columnas a tipo numérico.
     
     Args:
         df (pd.DataFrame): DataFrame a procesar
         numeric_columns (list, optional): Lista de columnas numéricas. Si es None, usa NUMERIC_COLUMNS
+        verbose (bool): Si True, muestra un mensaje al terminar
     
     Returns:
         pd.DataFrame: DataFrame con columnas convertidas
@@ -265,48 +755,171 @@ def convert_numeric_columns(df, numeric_columns=None):
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
     
-    print("✓ Columnas numéricas convertidas")
+    if verbose:
+        print("✓ Columnas numéricas convertidas")
     return df
 
 
-def calculate_active_cases(df):
+def calculate_active_cases(df, verbose=True):
     """
     Calcula casos activos (confirmados - fallecidos - recuperados).
     
     Args:
         df (pd.DataFrame): DataFrame con columnas confirmed, deaths, recovered
+        verbose (bool): Si True, muestra un mensaje al terminar
     
     Returns:
         pd.DataFrame: DataFrame con columna active_cases
     """
     df['active_cases'] = df['confirmed'] - df['deaths'] - df['recovered']
-    print("✓ Casos activos calculados")
+    if verbose:
+        print("✓ Casos activos calculados")
     return df
 
 
-def homogenize_country_names(df, country_mapping=None, country_column='country_region'):
+# Tablas de resolución de países ya compiladas.
+# Formato: {(ruta del archivo de continentes, mapeo de países): tabla}
+_COUNTRY_TABLES = {}
+
+
+def get_country_table(country_mapping=None, mapping_file=None):
+    """
+    Tabla precompilada de resolución país original → (nombre canónico, continente).
+    
+    Se construye una vez por proceso y se reutiliza entre homogenize_country_names
+    y load_continent_mapping. Se vuelve a leer country_to_continent.csv solo si
+    cambian su fecha de modificación o su tamaño.
+    
+    Args:
+        country_mapping (dict, optional): Mapeo de países. Si es None, usa COUNTRY_MAPPING
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+    
+    Returns:
+        dict: Tabla con las claves:
+            - 'canonical': {nombre original: nombre canónico}
+            - 'continents': {nombre canónico: continente} (vacío si el archivo no se pudo leer)
+            - 'countries': número de filas del archivo de continentes
+            - 'continent_names': continentes en orden de aparición
+            - 'resolved': {nombre original: (nombre canónico, continente)}, se llena al resolver
+            - 'error': excepción al leer el archivo de continentes, o None
+    """
+    if country_mapping is None:
+        country_mapping = COUNTRY_MAPPING
+    if mapping_file is None:
+        mapping_file = CONTINENT_MAPPING_FILE
+    
+    try:
+        stat = os.stat(mapping_file)
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    
+    key = (os.path.abspath(mapping_file), tuple(sorted(country_mapping.items())))
+    table = _COUNTRY_TABLES.get(key)
+    if table is not None and table['signature'] == signature:
+        return table
+    
+    table = {
+        'signature': signature,
+        'canonical': dict(country_mapping),
+        'continents': {},
+        'countries': 0,
+        'continent_names': [],
+        'resolved': {},
+        'error': None,
+    }
+    try:
+        df_continents = pd.read_csv(mapping_file)
+        table['continents'] = dict(zip(df_continents['country'], df_continents['continent']))
+        table['countries'] = len(df_continents)
+        table['continent_names'] = list(df_continents['continent'].unique())
+    except Exception as e:
+        table['error'] = e
+    
+    _COUNTRY_TABLES[key] = table
+    return table
+
+
+def resolve_country(table, country):
+    """
+    Resuelve un nombre de país original a (nombre canónico, continente).
+    
+    Args:
+        table (dict): Tabla creada con get_country_table
+        country (str): Nombre tal como aparece en los datos
+    
+    Returns:
+        tuple: (nombre canónico, continente o None)
+    """
+    resolved = table['resolved'].get(country)
+    if resolved is None:
+        canonical = table['canonical'].get(country, country)
+        resolved = (canonical, table['continents'].get(canonical))
+        table['resolved'][country] = resolved
+    return resolved
+
+
+def _map_distinct(values, func):
+    """
+    Aplica func a cada valor distinto de una columna y expande el resultado por códigos.
+    
+    El costo de func es proporcional al número de valores distintos; las filas
+    solo se recorren para factorizar (o se usan los códigos si la columna ya es
+    categórica).
+    
+    Args:
+        values (pd.Series): Columna a transformar
+        func (callable): Función valor → nuevo valor (None para nulo)
+    
+    Returns:
+        pd.Series: Valores transformados, con el mismo índice y tipo que la columna
+    """
+    is_categorical = isinstance(values.dtype, pd.CategoricalDtype)
+    if is_categorical:
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    
+    # Varios valores originales pueden resolverse al mismo resultado
+    mapped_codes, categories = pd.factorize(pd.Index([func(value) for value in uniques], dtype=object))
+    codes = np.append(mapped_codes, -1)[codes]
+    
+    if is_categorical:
+        result = pd.Categorical.from_codes(codes, categories=categories)
+    else:
+        categories = pd.array(np.asarray(categories, dtype=object), dtype=values.dtype)
+        result = categories.take(codes, allow_fill=True)
+    return pd.Series(result, index=values.index, name=values.name, dtype=result.dtype)
+
+
+def homogenize_country_names(df, country_mapping=None, country_column='country_region', verbose=True):
     """
     Homogeniza nombres de países usando un mapeo predefinido.
     
+    Cada nombre distinto se resuelve una sola vez con la tabla de get_country_table.
+    La columna conserva su tipo (texto o categórica).
+    
     Args:
         df (pd.DataFrame): DataFrame a procesar
         country_mapping (dict, optional): Diccionario de mapeo. Si es None, usa COUNTRY_MAPPING
         country_column (str): Nombre de la columna de países
+        verbose (bool): Si True, muestra un mensaje al terminar
     
     Returns:
         pd.DataFrame: DataFrame con nombres de países homogeneizados
     """
-    if country_mapping is None:
-        country_mapping = COUNTRY_MAPPING
-    
     if country_column in df.columns:
-        df[country_column] = df[country_column].replace(country_mapping)
-        print("✓ Nombres de países homogeneizados")
+        table = get_country_table(country_mapping)
+        df[country_column] = _map_distinct(df[country_column],
+                                           lambda country: resolve_country(table, country)[0])
+        if verbose:
+            print("✓ Nombres de países homogeneizados")
     
     return df
 
 
-def clean_covid_data(df, verbose=True):
+def clean_covid_data(df, verbose=True, report=None):
     """
     Pipeline completo de limpieza de datos COVID-19.
     Aplica todas las operaciones de limpieza en secuencia.
@@ -314,6 +927,8 @@ def clean_covid_data(df, verbose=True):
     Args:
         df (pd.DataFrame): DataFrame crudo a limpiar
         verbose (bool): Si True, muestra mensajes de progreso
+        report (list, optional): Lista donde se agrega un registro por paso
+            (tiempo, filas de entrada/salida y variación de memoria)
     
     Returns:
         pd.DataFrame: DataFrame limpio y procesado
@@ -322,25 +937,25 @@ def clean_covid_data(df, verbose=True):
         print("Iniciando limpieza de datos...\n")
     
     # 1. Estandarizar nombres de columnas
-    df = standardize_column_names(df)
+    df = run_stage('standardize_column_names', standardize_column_names, df, report, verbose=verbose)
     
     # 2. Consolidar columnas duplicadas
-    df = consolidate_duplicate_columns(df)
+    df = run_stage('consolidate_duplicate_columns', consolidate_duplicate_columns, df, report, verbose=verbose)
     
     # 3. Eliminar columnas irrelevantes
-    df = drop_irrelevant_columns(df)
+    df = run_stage('drop_irrelevant_columns', drop_irrelevant_columns, df, report, verbose=verbose)
     
     # 4. Procesar fechas
-    df = process_dates(df)
+    df = run_stage('process_dates', process_dates, df, report, verbose=verbose)
     
     # 5. Convertir columnas numéricas
-    df = convert_numeric_columns(df)
+    df = run_stage('convert_numeric_columns', convert_numeric_columns, df, report, verbose=verbose)
     
     # 6. Calcular casos activos
-    df = calculate_active_cases(df)
+    df = run_stage('calculate_active_cases', calculate_active_cases, df, report, verbose=verbose)
     
     # 7. Homogeneizar nombres de países
-    df = homogenize_country_names(df)
+    df = run_stage('homogenize_country_names', homogenize_country_names, df, report, verbose=verbose)
     
     if verbose:
         print(f"\n{'='*60}")
@@ -351,7 +966,8 @@ def clean_covid_data(df, verbose=True):
     return df
 
 
-def load_continent_mapping(df, mapping_file=None, country_column='country_region'):
+def load_continent_mapping(df, mapping_file=None, country_column='country_region', verbose=True,
+                           report=None):
     """
     Carga el mapeo de países a continentes y agrega columna de continente.
     
@@ -359,6 +975,9 @@ def load_continent_mapping(df, mapping_file=None, country_column='country_region
         df (pd.DataFrame): DataFrame con columna de países
         mapping_file (str, optional): Ruta al archivo de mapeo. Si es None, usa CONTINENT_MAPPING_FILE
         country_column (str): Nombre de la columna de países
+        verbose (bool): Si True, muestra el resumen del mapeo y los errores; si
+            False, los errores se registran en el logger 'covid.pipeline'
+        report (list, optional): Lista donde se agrega el registro de la etapa
     
     Returns:
         pd.DataFrame: DataFrame con columna 'continent' agregada
@@ -366,30 +985,137 @@ def load_continent_mapping(df, mapping_file=None, country_column='country_region
     if mapping_file is None:
         mapping_file = CONTINENT_MAPPING_FILE
     
+    rows_in = len(df)
+    memory_before_mb = _frame_memory_mb(df)
+    start = time.perf_counter()
+    
     try:
-        df_continents = pd.read_csv(mapping_file)
-        print(f"✓ Mapeo de continentes cargado: {len(df_continents)} países")
-        print(f"\nContinentes disponibles: {df_continents['continent'].unique()}")
-        
-        # Crear diccionario de mapeo
-        country_to_continent = dict(zip(df_continents['country'], df_continents['continent']))
+        table = get_country_table(mapping_file=mapping_file)
+        if table['error'] is not None:
+            raise table['error']
+        if verbose:
+            print(f"✓ Mapeo de continentes cargado: {table['countries']} países")
+            print(f"\nContinentes disponibles: {np.array(table['continent_names'], dtype=object)}")
         
-        # Agregar columna de continente
-        df['continent'] = df[country_column].map(country_to_continent)
+        # Agregar columna de continente: un lookup por país distinto (los
+        # nombres ya están homogeneizados, se buscan tal cual)
+        df['continent'] = _map_distinct(df[country_column], table['continents'].get).rename('continent')
         
-        # Verificar países sin mapeo
-        unmapped = df[df['continent'].isna()][country_column].unique()
-        if len(unmapped) > 0:
-            print(f"\n⚠ Países sin mapeo de continente ({len(unmapped)}):")
-            print(unmapped[:10])  # Mostrar solo los primeros 10
-        else:
-            print("\n✓ Todos los países tienen continente asignado")
-        
-        print(f"\n✓ Distribución por continente:")
-        print(df['continent'].value_counts())
+        if verbose:
+            # Verificar países sin mapeo
+            unmapped = df[df['continent'].isna()][country_column].unique()
+            if len(unmapped) > 0:
+                print(f"\n⚠ Países sin mapeo de continente ({len(unmapped)}):")
+                print(unmapped[:10])  # Mostrar solo los primeros 10
+            else:
+                print("\n✓ Todos los países tienen continente asignado")
+            
+            print(f"\n✓ Distribución por continente:")
+            print(df['continent'].value_counts())
         
     except Exception as e:
-        print(f"✗ Error al cargar mapeo de continentes: {e}")
+        _notify(f"Error al cargar mapeo de continentes: {e}", logging.ERROR, verbose)
         df['continent'] = None
     
+    record_stage('load_continent_mapping', time.perf_counter() - start, rows_in, df,
+                 memory_before_mb, report)
+    return df
+
+
+def memory_usage_mb(df):
+    """
+    Calcula la memoria ocupada por un DataFrame (incluyendo strings).
+    
+    Args:
+        df (pd.DataFrame): DataFrame a medir
+    
+    Returns:
+        float: Memoria en MB
+    """
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def _downcast_float(series):
+    """
+    Reduce una columna float64 a float32 si sus valores se conservan.
+    
+    Los valores fuera del rango de float32 o con diferencias mayores a la
+    tolerancia de np.allclose mantienen la columna en float64; las columnas de
+    valores enteros (por ejemplo conteos con nulos) deben conservarse exactos.
+    
+    Args:
+        series (pd.Series): Columna float64
+    
+    Returns:
+        pd.Series: La columna en float32, o la original si no se conserva
+    """
+    downcast = pd.to_numeric(series, downcast='float')
+    if downcast.dtype == series.dtype:
+        return series
+    
+    original = series.to_numpy(dtype=np.float64)
+    restored = downcast.to_numpy(dtype=np.float64)
+    finite = np.isfinite(original)
+    if np.array_equal(original[finite], np.round(original[finite])):
+        keep = np.array_equal(original, restored, equal_nan=True)
+    else:
+        keep = np.allclose(original, restored, equal_nan=True)
+    return downcast if keep else series
+
+
+def optimize_dtypes(df, categorical_columns=None, count_columns=None, verbose=True, report=None):
+    """
+    Aplica un perfil de tipos compacto al DataFrame limpio para reducir memoria.
+    
+    - Columnas geográficas → category (un código entero por fila en vez de un string)
+    - Conteos → el entero con signo más pequeño que contiene sus valores
+    - Decimales → float32, solo si los valores de la columna se conservan (ver
+      _downcast_float); si no, la columna queda en float64
+    
+    Las fechas no cambian: date y last_update ya son datetime64 tras la limpieza.
+    Las sumas y agregaciones de pandas sobre enteros reducidos devuelven int64,
+    por lo que los totales no se desbordan.
+    
+    Args:
+        df (pd.DataFrame): DataFrame limpio (idealmente con columna 'continent')
+        categorical_columns (list, optional): Columnas a convertir a category. Si es None, usa CATEGORICAL_COLUMNS
+        count_columns (list, optional): Columnas de conteo a reducir. Si es None, usa COUNT_COLUMNS
+        verbose (bool): Si True, muestra la memoria antes y después
+        report (list, optional): Lista donde se agrega el registro de la etapa, con
+            la memoria total (incluyendo strings) en 'memory_deep_before_mb' y
+            'memory_deep_after_mb'
+    
+    Returns:
+        pd.DataFrame: DataFrame con tipos compactos
+    """
+    if categorical_columns is None:
+        categorical_columns = CATEGORICAL_COLUMNS
+    if count_columns is None:
+        count_columns = COUNT_COLUMNS
+    
+    rows_in = len(df)
+    memory_before_mb = _frame_memory_mb(df)
+    memory_before = memory_usage_mb(df)
+    start = time.perf_counter()
+    df = df.copy()
+    
+    for col in categorical_columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    for col in count_columns:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    for col in df.select_dtypes(include='float64').columns:
+        df[col] = _downcast_float(df[col])
+    
+    seconds = time.perf_counter() - start
+    memory_after = memory_usage_mb(df)
+    if verbose:
+        reduction = (1 - memory_after / memory_before) * 100 if memory_before > 0 else 0
+        print(f"✓ Memoria: {memory_before:,.1f} MB → {memory_after:,.1f} MB (-{reduction:.1f}%)")
+    
+    record_stage('optimize_dtypes', seconds, rows_in, df, memory_before_mb, report,
+                 memory_deep_before_mb=memory_before, memory_deep_after_mb=memory_after)
     return df
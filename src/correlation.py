@@ -0,0 +1,209 @@
+"""
+Correlaciones de incidencia diaria con sumas acumuladas
+
+Correlacionar series acumuladas da valores cercanos a 1 para casi cualquier
+par (todas crecen con el tiempo). Aquí se correlaciona la incidencia diaria
+(casos, muertes y recuperados nuevos, ver src/incidence.py), por país o para
+la serie global, sobre cualquier rango de fechas o ventana móvil.
+
+Para cada serie se guardan una vez las sumas acumuladas de x y de los
+productos x·xᵀ (que contienen x², y² y xy para cada par de métricas). La
+matriz de correlación de cualquier ventana sale de la diferencia de dos filas
+de esas sumas, en O(1) por ventana, sin volver a recorrer los datos. Los
+valores se centran por serie antes de acumular para no perder precisión con
+sumas de cuadrados grandes (la correlación no cambia al restar una constante).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .analytics import _group_positions
+
+# Métricas correlacionadas por defecto (incidencia diaria)
+CORRELATION_METRICS = ['new_confirmed', 'new_deaths', 'new_recovered', 'new_active']
+
+# Ventanas (en días) de las correlaciones móviles ofrecidas en el dashboard
+ROLLING_CORRELATION_WINDOWS = [14, 30, 60, 90]
+
+
+def _add_new_active(df):
+    """Agrega new_active = new_confirmed - new_deaths - new_recovered si falta."""
+    if 'new_active' in df.columns or not {'new_confirmed', 'new_deaths', 'new_recovered'} <= set(df.columns):
+        return df
+    df = df.copy()
+    df['new_active'] = df['new_confirmed'] - df['new_deaths'] - df['new_recovered']
+    return df
+
+
+def build_correlation_engine(df, metrics=None, group_column=None):
+    """
+    Precalcula las sumas acumuladas de x y x·xᵀ de cada serie.
+
+    Args:
+        df (pd.DataFrame): Incidencia con columna 'date' (como columna o índice)
+            y las métricas; una fila por (grupo, fecha)
+        metrics (list, optional): Métricas a correlacionar. Si es None, usa
+            CORRELATION_METRICS (new_active se deriva si falta)
+        group_column (str, optional): Columna de agrupación (por ejemplo
+            'country_region'). Si es None, toda la tabla es una sola serie
+
+    Returns:
+        dict: Motor con las claves 'metrics', 'dates', 'groups' ({grupo: (inicio, fin)}),
+            'group_column', 'group_start', 'prefix' (n+1, k) y 'prefix_products' (n+1, k, k)
+    """
+    if 'date' not in df.columns:
+        df = df.reset_index()
+    df = _add_new_active(df)
+    if metrics is None:
+        metrics = CORRELATION_METRICS
+    metrics = [col for col in metrics if col in df.columns]
+    if group_column is not None and group_column not in df.columns:
+        group_column = None
+
+    sort_columns = ['date'] if group_column is None else [group_column, 'date']
+    data = df.sort_values(sort_columns, kind='stable').reset_index(drop=True)
+    codes, group_start, _ = _group_positions(data, group_column)
+
+    values = data[metrics].to_numpy(dtype=float)
+    values = np.nan_to_num(values)
+
+    # Centrado por serie (no cambia la correlación y evita cancelaciones)
+    n_groups = codes.max() + 1 if len(codes) else 0
+    counts = np.bincount(codes, minlength=n_groups)
+    for column in range(values.shape[1]):
+        means = np.bincount(codes, weights=values[:, column], minlength=n_groups) / np.maximum(counts, 1)
+        values[:, column] -= means[codes]
+
+    products = values[:, :, None] * values[:, None, :]
+    prefix = np.concatenate((np.zeros((1, len(metrics))), np.cumsum(values, axis=0)))
+    prefix_products = np.concatenate((np.zeros((1, len(metrics), len(metrics))), np.cumsum(products, axis=0)))
+
+    groups = {}
+    if group_column is None:
+        groups[None] = (0, len(data))
+    else:
+        names = data[group_column].to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(data)]
+        for start, stop in zip(starts, stops):
+            groups[names[start]] = (int(start), int(stop))
+
+    return {
+        'metrics': metrics,
+        'dates': data['date'].to_numpy(),
+        'groups': groups,
+        'group_column': group_column,
+        'group_start': group_start,
+        'prefix': prefix,
+        'prefix_products': prefix_products,
+    }
+
+
+def _correlation_from_sums(count, sums, products):
+    """
+    Matrices de correlación a partir de las sumas de ventanas.
+
+    Args:
+        count (np.ndarray): Días de cada ventana (m,)
+        sums (np.ndarray): Suma de x de cada ventana (m, k)
+        products (np.ndarray): Suma de x·xᵀ de cada ventana (m, k, k)
+
+    Returns:
+        np.ndarray: Correlaciones (m, k, k); NaN si alguna serie es constante
+    """
+    count = np.asarray(count, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / count[:, None]
+        cov = products / count[:, None, None] - mean[:, :, None] * mean[:, None, :]
+        std = np.sqrt(np.clip(np.diagonal(cov, axis1=1, axis2=2), 0, None))
+        corr = cov / (std[:, :, None] * std[:, None, :])
+    corr[~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def window_correlation(engine, start_date=None, end_date=None, group=None):
+    """
+    Matriz de correlación de un rango de fechas, en O(1) tras ubicar el rango.
+
+    Args:
+        engine (dict): Resultado de build_correlation_engine
+        start_date (str, optional): Fecha inicial 'YYYY-MM-DD' (incluida)
+        end_date (str, optional): Fecha final 'YYYY-MM-DD' (incluida)
+        group (str, optional): Grupo (por ejemplo país); None para el motor sin grupos
+
+    Returns:
+        pd.DataFrame: Matriz k × k con las métricas como índice y columnas
+    """
+    metrics = engine['metrics']
+    start, stop = engine['groups'].get(group, (0, 0))
+    dates = engine['dates'][start:stop]
+    if start_date is not None:
+        start += int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), side='left'))
+    if end_date is not None:
+        stop = engine['groups'].get(group, (0, 0))[0] + int(
+            np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side='right'))
+
+    if stop - start < 2:
+        return pd.DataFrame(np.nan, index=metrics, columns=metrics)
+
+    sums = engine['prefix'][stop] - engine['prefix'][start]
+    products = engine['prefix_products'][stop] - engine['prefix_products'][start]
+    corr = _correlation_from_sums(np.array([stop - start]), sums[None], products[None])[0]
+    return pd.DataFrame(corr, index=metrics, columns=metrics)
+
+
+def rolling_correlation(engine, window, min_periods=None, pairs=None):
+    """
+    Correlaciones móviles de cada par de métricas, para todas las series a la vez.
+
+    Cada ventana termina en su fila y no cruza el inicio de su serie.
+
+    Args:
+        engine (dict): Resultado de build_correlation_engine
+        window (int): Días de la ventana
+        min_periods (int, optional): Días mínimos para calcular (NaN antes). Si es None, window
+        pairs (list, optional): Pares (métrica_a, métrica_b). Si es None, todos los pares
+
+    Returns:
+        pd.DataFrame: Una fila por (grupo, fecha) con 'date', la columna de grupo
+            (si existe) y 'corr_<a>__<b>' para cada par
+    """
+    if min_periods is None:
+        min_periods = window
+    metrics = engine['metrics']
+    if pairs is None:
+        pairs = [(a, b) for i, a in enumerate(metrics) for b in metrics[i + 1:]]
+
+    n_rows = len(engine['dates'])
+    rows = np.arange(n_rows)
+    start = np.maximum(engine['group_start'], rows + 1 - window)
+    count = rows + 1 - start
+
+    sums = engine['prefix'][rows + 1] - engine['prefix'][start]
+    products = engine['prefix_products'][rows + 1] - engine['prefix_products'][start]
+    corr = _correlation_from_sums(count, sums, products)
+    corr[count < min_periods] = np.nan
+
+    result = pd.DataFrame({'date': engine['dates']})
+    if engine['group_column'] is not None:
+        names = np.empty(n_rows, dtype=object)
+        for name, (group_start, group_stop) in engine['groups'].items():
+            names[group_start:group_stop] = name
+        result.insert(0, engine['group_column'], names)
+    for a, b in pairs:
+        result[f'corr_{a}__{b}'] = corr[:, metrics.index(a), metrics.index(b)]
+    return result
+
+
+def country_correlation_engine(cube, metrics=None):
+    """
+    Motor de correlaciones por país sobre el cubo país × fecha con incidencia.
+
+    Args:
+        cube (pd.DataFrame): Cubo de build_incidence_cube (o filas filtradas)
+        metrics (list, optional): Métricas a correlacionar. Si es None, usa CORRELATION_METRICS
+
+    Returns:
+        dict: Motor de build_correlation_engine agrupado por 'country_region'
+    """
+    return build_correlation_engine(cube, metrics=metrics, group_column='country_region')
@@ -0,0 +1,122 @@
+"""
+Reducción de puntos de series de tiempo antes de construir gráficos
+
+Un gráfico de Plotly envía al navegador cada punto de cada traza. Con rangos de
+varios años y varias trazas el JSON crece y el navegador tarda en dibujarlo,
+sin que se vea más detalle que el que cabe en el ancho de la pantalla. Aquí se
+elige el método según el rango visible:
+
+    - hasta MAX_POINTS puntos: la serie se envía completa
+    - hasta WEEKLY_FACTOR × MAX_POINTS puntos: LTTB (Largest-Triangle-Three-
+      Buckets), que conserva los picos y la forma de cada serie con MAX_POINTS
+      puntos
+    - series más largas: agregación semanal (último valor para acumulados,
+      máximo para métricas diarias, para no aplanar los picos)
+"""
+
+import numpy as np
+
+# Puntos máximos por gráfico (suficiente para el ancho de un gráfico en pantalla)
+MAX_POINTS = 500
+
+# Múltiplo de max_points a partir del cual se agrega por semana en lugar de usar LTTB
+WEEKLY_FACTOR = 2
+
+# Columnas de nivel (acumulados y casos activos): en la agregación semanal se
+# toma el último valor de la semana; el resto de las columnas toma el máximo
+LEVEL_COLUMNS = ['confirmed', 'deaths', 'recovered', 'active_cases']
+
+# Sufijo de los títulos según el método aplicado
+DOWNSAMPLING_LABELS = {
+    'raw': '',
+    'lttb': ' (muestreo LTTB)',
+    'weekly': ' (semanal)',
+}
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Posiciones elegidas por LTTB (Largest-Triangle-Three-Buckets).
+
+    El primer y el último punto se conservan; el resto se divide en n_out - 2
+    grupos y de cada uno se elige el punto que forma el triángulo de mayor área
+    con el punto elegido en el grupo anterior y el promedio del grupo siguiente.
+
+    Args:
+        x (np.ndarray): Eje x numérico, creciente
+        y (np.ndarray): Valores
+        n_out (int): Puntos a conservar
+
+    Returns:
+        np.ndarray: Posiciones crecientes de los puntos conservados
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    every = (n - 2) / (n_out - 2)
+    bounds = (np.floor(np.arange(n_out - 1) * every) + 1).astype(np.intp)
+    bounds = np.append(bounds, n)
+
+    # Sumas acumuladas para el promedio de cada grupo
+    sum_x = np.concatenate(([0.0], np.cumsum(x)))
+    sum_y = np.concatenate(([0.0], np.cumsum(y)))
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        next_lo, next_hi = bounds[i + 1], bounds[i + 2]
+        avg_x = (sum_x[next_hi] - sum_x[next_lo]) / (next_hi - next_lo)
+        avg_y = (sum_y[next_hi] - sum_y[next_lo]) / (next_hi - next_lo)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_frame(df, columns, x='date', max_points=MAX_POINTS, weekly_factor=WEEKLY_FACTOR,
+                     aggregations=None):
+    """
+    Reduce los puntos de varias series que comparten el eje de fechas.
+
+    Con LTTB cada columna recibe una parte de max_points y se conserva la unión
+    de los puntos elegidos, de modo que todas las trazas comparten las mismas
+    fechas y los picos de cada una siguen visibles.
+
+    Args:
+        df (pd.DataFrame): Datos ordenados por x, una fila por fecha
+        columns (list): Columnas que se van a graficar
+        x (str): Columna de fechas
+        max_points (int): Puntos máximos por gráfico
+        weekly_factor (int): Se agrega por semana cuando la serie tiene más de
+            weekly_factor × max_points filas
+        aggregations (dict, optional): {columna: función} para la agregación
+            semanal; por defecto 'last' para LEVEL_COLUMNS y 'max' para el resto
+
+    Returns:
+        tuple: (DataFrame con x y columns, método aplicado: 'raw', 'lttb' o 'weekly')
+    """
+    frame = df[[x] + list(columns)]
+    if len(frame) == 0:
+        return frame.reset_index(drop=True), 'raw'
+
+    if len(frame) > weekly_factor * max_points:
+        if aggregations is None:
+            aggregations = {}
+        how = {col: aggregations.get(col, 'last' if col in LEVEL_COLUMNS else 'max') for col in columns}
+        weekly = frame.set_index(x).resample('W').agg(how)
+        return weekly.dropna(how='all').reset_index(), 'weekly'
+
+    if len(frame) <= max_points:
+        return frame.reset_index(drop=True), 'raw'
+
+    budget = max(3, max_points // len(columns))
+    positions = frame[x].to_numpy().astype('datetime64[s]').astype(np.int64)
+    selected = np.unique(np.concatenate([
+        lttb_indices(positions, frame[col].to_numpy(dtype=float), budget) for col in columns
+    ]))
+    return frame.iloc[selected].reset_index(drop=True), 'lttb'
@@ -0,0 +1,170 @@
+"""
+Filtrado indexado por continente, país y rango de fechas
+
+En lugar de copiar el DataFrame completo y aplicar máscaras booleanas en cada
+interacción, los datos se ordenan una vez por (continent, country_region, date)
+y se guardan las posiciones de inicio y fin de cada país. Un filtro se resuelve
+con búsqueda binaria sobre las fechas de cada país seleccionado, y el resultado
+es un slice posicional (sin copia) cuando la selección es contigua.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def build_filter_index(df, continent_column='continent', country_column='country_region',
+                       date_column='date'):
+    """
+    Ordena los datos por (continente, país, fecha) y precalcula los offsets de cada país.
+
+    Args:
+        df (pd.DataFrame): DataFrame con columnas de continente, país y fecha
+        continent_column (str): Nombre de la columna de continentes
+        country_column (str): Nombre de la columna de países
+        date_column (str): Nombre de la columna de fechas
+
+    Returns:
+        dict: Índice con las claves:
+            - 'data': DataFrame ordenado (con índice 0..n-1)
+            - 'dates': array de fechas ordenado dentro de cada país
+            - 'countries': {país: (inicio, fin)} posiciones en 'data'
+            - 'continents': {continente: [países]} en orden
+            - 'date_column': nombre de la columna de fechas
+            - 'date_bounds': (fecha mínima, fecha máxima) de los datos, o None si está vacío
+    """
+    data = df.sort_values(
+        [continent_column, country_column, date_column],
+        kind='stable',
+        na_position='last'
+    ).reset_index(drop=True)
+
+    countries = data[country_column].to_numpy()
+    continents = data[continent_column].to_numpy()
+
+    # Posiciones donde cambia el país (los datos están agrupados por país)
+    country_codes = pd.factorize(countries, use_na_sentinel=False)[0]
+    boundaries = np.flatnonzero(np.diff(country_codes)) + 1
+    starts = np.concatenate(([0], boundaries)) if len(data) else np.array([], dtype=int)
+    stops = np.concatenate((boundaries, [len(data)])) if len(data) else np.array([], dtype=int)
+
+    country_offsets = {}
+    continent_countries = {}
+    for start, stop in zip(starts, stops):
+        country = countries[start]
+        country_offsets[country] = (int(start), int(stop))
+        continent_countries.setdefault(continents[start], []).append(country)
+
+    dates = data[date_column].to_numpy()
+    return {
+        'data': data,
+        'dates': dates,
+        'countries': country_offsets,
+        'continents': continent_countries,
+        'date_column': date_column,
+        'date_bounds': (pd.Timestamp(dates.min()), pd.Timestamp(dates.max())) if len(dates) else None,
+    }
+
+
+def normalize_selection(index, continent='Todos', countries=None, date_range=None):
+    """
+    Forma canónica de una selección de filtros, usable como clave de caché.
+    
+    Dos selecciones con la misma forma canónica producen el mismo resultado en
+    filter_with_index: los países se ordenan y se descartan los que no están en
+    el continente; si la lista resultante equivale a todos los países del
+    continente, se reemplaza por una tupla vacía; y el rango de fechas se acota
+    a las fechas disponibles.
+    
+    Args:
+        index (dict): Índice creado con build_filter_index
+        continent (str): Continente seleccionado o 'Todos'
+        countries (list, optional): Países seleccionados
+        date_range (tuple, optional): (fecha_inicio, fecha_fin), ambas incluidas
+    
+    Returns:
+        tuple: (continente, tupla de países, (inicio 'YYYY-MM-DD', fin 'YYYY-MM-DD') o None)
+    """
+    if continent != 'Todos':
+        candidates = index['continents'].get(continent, [])
+    else:
+        candidates = list(index['countries'])
+    
+    selected = ()
+    if countries:
+        selected = tuple(sorted(set(countries) & set(candidates)))
+        if not selected:
+            # Ningún país válido: se conserva la lista para que el resultado siga vacío
+            selected = tuple(sorted(set(countries)))
+        elif len(selected) == len(candidates):
+            selected = ()
+    
+    bounds = None
+    if date_range is not None:
+        start, end = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
+        if index['date_bounds'] is not None:
+            start = max(start, index['date_bounds'][0].normalize())
+            end = min(end, index['date_bounds'][1])
+        bounds = (start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+        if index['date_bounds'] is not None and bounds == (
+            index['date_bounds'][0].strftime('%Y-%m-%d'), index['date_bounds'][1].strftime('%Y-%m-%d')
+        ):
+            bounds = None
+    
+    return (continent, selected, bounds)
+
+
+def filter_with_index(index, continent='Todos', countries=None, date_range=None):
+    """
+    Filtra los datos indexados por continente, países y rango de fechas.
+
+    Equivale a aplicar las máscaras continent == continente, country.isin(países)
+    y start <= date <= end, pero su costo depende solo del tamaño de la selección.
+
+    Args:
+        index (dict): Índice creado con build_filter_index
+        continent (str): Continente seleccionado o 'Todos'
+        countries (list, optional): Países seleccionados. Si está vacío, usa todos los del continente
+        date_range (tuple, optional): (fecha_inicio, fecha_fin), ambas incluidas
+
+    Returns:
+        pd.DataFrame: Selección ordenada por (continente, país, fecha)
+    """
+    data = index['data']
+    dates = index['dates']
+
+    # Países candidatos según el continente
+    if continent != 'Todos':
+        candidates = index['continents'].get(continent, [])
+    else:
+        candidates = list(index['countries'])
+
+    if countries:
+        selected = set(countries)
+        candidates = [country for country in candidates if country in selected]
+
+    if date_range is not None:
+        start_date = np.datetime64(pd.to_datetime(date_range[0]), 'ns')
+        end_date = np.datetime64(pd.to_datetime(date_range[1]), 'ns')
+
+    # Rango de posiciones de cada país, acotado por fecha con búsqueda binaria
+    ranges = []
+    for country in candidates:
+        start, stop = index['countries'][country]
+        if date_range is not None:
+            country_dates = dates[start:stop]
+            lo = start + np.searchsorted(country_dates, start_date, side='left')
+            hi = start + np.searchsorted(country_dates, end_date, side='right')
+            start, stop = lo, hi
+        if stop > start:
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+
+    if not ranges:
+        return data.iloc[0:0]
+    if len(ranges) == 1:
+        return data.iloc[ranges[0][0]:ranges[0][1]]
+
+    positions = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+    return data.take(positions)
@@ -0,0 +1,268 @@
+"""
+Conversión de series acumuladas a incidencia diaria
+
+JHU publica acumulados por provincia (y condado) que a veces retroceden por
+correcciones, tienen días sin reporte o aparecen y desaparecen dentro de un
+rango. Tomar diff() de los totales sumados por país mezcla todos esos efectos:
+una provincia que deja de reportar un día se ve como miles de casos negativos.
+
+Aquí cada serie (país, provincia) se diferencia por separado, ordenada por
+fecha, con políticas configurables para correcciones negativas y días
+faltantes. Todas las series se procesan a la vez con operaciones vectorizadas
+sobre arreglos ordenados, y el resultado se puede agregar al cubo país × fecha
+para que los KPIs, gráficos y métricas de crecimiento usen la misma incidencia.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import CUBE_KEYS, build_country_cube
+
+# Métricas acumuladas que se convierten a incidencia diaria
+INCIDENCE_METRICS = ['confirmed', 'deaths', 'recovered']
+
+# Columnas que identifican una serie (las filas de condados se suman a su provincia)
+SERIES_KEYS = ['continent', 'country_region', 'province_state']
+
+# Políticas para correcciones negativas (el acumulado baja):
+# - 'backfill': se corrige el pasado; el acumulado se reemplaza por su mínimo
+#   hacia adelante, la incidencia nunca es negativa y su suma se conserva
+# - 'hold': se ignora la baja hasta que el acumulado supere el máximo anterior
+# - 'clip': la incidencia negativa se reemplaza por 0
+# - 'keep': se conserva la incidencia negativa tal cual
+REVISION_POLICIES = ['backfill', 'hold', 'clip', 'keep']
+
+# Políticas para días sin reporte dentro de una serie:
+# - 'assign': todo el aumento se asigna al día en que la serie vuelve a reportar
+# - 'spread': el aumento se reparte en partes iguales entre los días faltantes
+GAP_POLICIES = ['assign', 'spread']
+
+# Días entre el último reporte de una serie que desaparece y la aparición de
+# series nuevas del mismo país para considerarlas un reemplazo (por ejemplo,
+# la fila nacional reemplazada por filas de provincias)
+HANDOVER_DAYS = 7
+
+
+def incidence_columns(metrics=None):
+    """
+    Nombres de las columnas de incidencia ('new_<métrica>').
+
+    Args:
+        metrics (list, optional): Métricas acumuladas. Si es None, usa INCIDENCE_METRICS
+
+    Returns:
+        list: Nombres de columnas
+    """
+    if metrics is None:
+        metrics = INCIDENCE_METRICS
+    return [f'new_{metric}' for metric in metrics]
+
+
+def _revise(values, codes, policy):
+    """
+    Aplica la política de correcciones al acumulado de cada serie.
+
+    Args:
+        values (np.ndarray): Acumulados ordenados por (serie, fecha)
+        codes (np.ndarray): Código de serie de cada fila
+        policy (str): Una de REVISION_POLICIES
+
+    Returns:
+        np.ndarray: Acumulados corregidos
+    """
+    series = pd.Series(values)
+    if policy == 'backfill':
+        # Mínimo desde cada día hasta el final de su serie
+        return series[::-1].groupby(codes[::-1]).cummin()[::-1].to_numpy()
+    if policy == 'hold':
+        return series.groupby(codes).cummax().to_numpy()
+    return values
+
+
+def _reconcile_new_series(series, keys, is_first, days, cumulative, new, handover_days):
+    """
+    Descuenta de las series que aparecen tarde el acumulado de las que reemplazan.
+
+    Cuando un país pasa de una fila nacional a filas por provincia (o cambia la
+    división de sus provincias), las series nuevas traen el acumulado que ya
+    se contó en la serie anterior. El primer día de cada serie que aparece
+    después del primer día de su país se reduce (en proporción a su valor) por
+    el último acumulado de las series del mismo país que dejaron de reportar
+    en los handover_days días previos. Así la incidencia del país ese día es
+    su variación real y no su total. Modifica `new` en el lugar.
+
+    Args:
+        series (pd.DataFrame): Series agregadas, ordenadas por (claves, fecha)
+        keys (list): Columnas que identifican una serie
+        is_first (np.ndarray): True en la primera fila de cada serie
+        days (np.ndarray): Día (entero) de cada fila
+        cumulative (dict): {métrica: acumulados corregidos}
+        new (dict): {métrica: incidencia}
+        handover_days (int): Ventana de reemplazo en días
+    """
+    country_keys = [col for col in keys if col != 'province_state']
+    if len(country_keys) == len(keys) or len(series) == 0:
+        return
+
+    first_rows = np.flatnonzero(is_first)
+    last_rows = np.r_[first_rows[1:] - 1, len(series) - 1]
+    country = series.groupby(country_keys, observed=True, dropna=False, sort=False).ngroup().to_numpy()[first_rows]
+    start, end = days[first_rows], days[last_rows]
+    country_start = pd.Series(start).groupby(country).transform('min').to_numpy()
+    country_end = pd.Series(end).groupby(country).transform('max').to_numpy()
+
+    late = np.flatnonzero(start > country_start)
+    ended = np.flatnonzero(end < country_end)
+    if len(late) == 0 or len(ended) == 0:
+        return
+
+    used = np.zeros(len(first_rows), dtype=bool)
+    for code in np.unique(country[late]):
+        starting = late[country[late] == code]
+        donors_all = ended[country[ended] == code]
+        for day in np.unique(start[starting]):
+            newcomers = first_rows[starting[start[starting] == day]]
+            donors = donors_all[(end[donors_all] < day) & (end[donors_all] >= day - handover_days)
+                                & ~used[donors_all]]
+            if len(donors) == 0:
+                continue
+            used[donors] = True
+            for metric, values in new.items():
+                total = values[newcomers].sum()
+                if total <= 0:
+                    continue
+                taken = min(cumulative[metric][last_rows[donors]].sum(), total)
+                values[newcomers] = values[newcomers] * (total - taken) / total
+
+
+def compute_incidence(df, metrics=None, policy='backfill', gaps='assign', count_new_series=True,
+                      handover_days=HANDOVER_DAYS):
+    """
+    Calcula la incidencia diaria de cada serie (país, provincia).
+
+    Las filas de una misma serie y fecha (condados) se suman antes de
+    diferenciar. El primer día de cada serie cuenta su acumulado completo como
+    incidencia si count_new_series es True, o 0 si es False. Con
+    count_new_series, las series que aparecen después del primer día de su
+    país descuentan el acumulado de las series que reemplazan (por ejemplo,
+    provincias que reemplazan la fila nacional), de modo que la incidencia
+    del país ese día es su variación y no su total.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columnas date, country_region y las métricas
+        metrics (list, optional): Métricas acumuladas. Si es None, usa INCIDENCE_METRICS
+        policy (str): Política para correcciones negativas (ver REVISION_POLICIES)
+        gaps (str): Política para días sin reporte (ver GAP_POLICIES)
+        count_new_series (bool): Si True, el primer acumulado de cada serie es incidencia
+        handover_days (int): Días entre el fin de una serie y la aparición de su
+            reemplazo (ver HANDOVER_DAYS)
+
+    Returns:
+        pd.DataFrame: Una fila por (serie, fecha), ordenada, con el acumulado
+            corregido de cada métrica y su columna 'new_<métrica>'. Con
+            gaps='spread' incluye filas para los días faltantes
+    """
+    if metrics is None:
+        metrics = INCIDENCE_METRICS
+    if policy not in REVISION_POLICIES:
+        raise ValueError(f"policy debe ser una de {REVISION_POLICIES}, no {policy!r}")
+    if gaps not in GAP_POLICIES:
+        raise ValueError(f"gaps debe ser una de {GAP_POLICIES}, no {gaps!r}")
+
+    keys = [col for col in SERIES_KEYS if col in df.columns]
+    metrics = [col for col in metrics if col in df.columns]
+    series = (
+        df.groupby(keys + ['date'], observed=True, dropna=False, sort=True)[metrics]
+        .sum()
+        .reset_index()
+    )
+
+    n_rows = len(series)
+    codes = series.groupby(keys, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    is_first = np.ones(n_rows, dtype=bool)
+    is_first[1:] = codes[1:] != codes[:-1]
+
+    days = series['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    gap = np.ones(n_rows, dtype=np.int64)
+    gap[1:] = days[1:] - days[:-1]
+    gap[is_first] = 1
+
+    cumulative = {}
+    new = {}
+    for metric in metrics:
+        values = _revise(series[metric].to_numpy(dtype=float), codes, policy)
+        previous = np.empty(n_rows)
+        previous[1:] = values[:-1]
+        previous[is_first] = 0.0 if count_new_series else values[is_first]
+        delta = values - previous
+        if policy == 'clip':
+            delta = np.maximum(delta, 0.0)
+        cumulative[metric] = values
+        new[metric] = delta
+
+    if count_new_series:
+        _reconcile_new_series(series, keys, is_first, days, cumulative, new, handover_days)
+
+    if gaps == 'spread' and (gap > 1).any():
+        # Cada fila se repite tantas veces como días cubre desde la anterior
+        rows = np.repeat(np.arange(n_rows), gap)
+        offset = np.arange(len(rows)) - np.repeat(np.cumsum(gap) - gap, gap)
+        steps = gap[rows]
+        expanded = series.iloc[rows, :len(keys)].reset_index(drop=True)
+        expanded['date'] = pd.to_datetime(days[rows] - (steps - 1 - offset), unit='D')
+        for metric in metrics:
+            share = new[metric][rows] / steps
+            expanded[metric] = cumulative[metric][rows] - new[metric][rows] + share * (offset + 1)
+            expanded[f'new_{metric}'] = share
+        return expanded
+
+    result = series[keys + ['date']].copy()
+    for metric in metrics:
+        result[metric] = cumulative[metric]
+        result[f'new_{metric}'] = new[metric]
+    return result
+
+
+def build_incidence_cube(df, metrics=None, policy='backfill', gaps='assign'):
+    """
+    Cubo país × fecha con los acumulados y la incidencia diaria de cada país.
+
+    Los acumulados son los de build_country_cube (suma de provincias tal como
+    se reportaron); la incidencia 'new_<métrica>' es la suma de la incidencia
+    de cada provincia (ver compute_incidence), por lo que no cambia cuando una
+    provincia deja de reportar o aparece dentro del rango.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columnas continent, country_region y date
+        metrics (list, optional): Métricas acumuladas. Si es None, usa INCIDENCE_METRICS
+        policy (str): Política para correcciones negativas (ver REVISION_POLICIES)
+        gaps (str): Política para días sin reporte (ver GAP_POLICIES)
+
+    Returns:
+        pd.DataFrame: Cubo ordenado por (continent, country_region, date) con las
+            columnas de build_country_cube más 'new_<métrica>'
+    """
+    if metrics is None:
+        metrics = INCIDENCE_METRICS
+    metrics = [col for col in metrics if col in df.columns]
+    new_columns = incidence_columns(metrics)
+
+    cube = build_country_cube(df)
+    incidence = compute_incidence(df, metrics, policy=policy, gaps=gaps)
+    keys = [col for col in CUBE_KEYS if col in incidence.columns]
+    daily_new = (
+        incidence.groupby(keys, observed=True, dropna=False, sort=True)[new_columns]
+        .sum()
+        .reset_index()
+    )
+
+    cube = cube.merge(daily_new, on=keys, how='outer' if gaps == 'spread' else 'left', sort=False)
+    cube = cube.sort_values(keys, kind='stable', na_position='last').reset_index(drop=True)
+    cube[new_columns] = cube[new_columns].fillna(0)
+
+    # Días que solo existen por el reparto de huecos: el acumulado del país se arrastra
+    cumulative = [col for col in cube.columns if col not in keys and col not in new_columns]
+    if cube[cumulative].isna().any().any():
+        group_columns = [col for col in keys if col != 'date']
+        cube[cumulative] = cube.groupby(group_columns, observed=True, dropna=False)[cumulative].ffill().fillna(0)
+    return cube
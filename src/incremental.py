@@ -0,0 +1,228 @@
+"""
+Ingesta incremental de reportes diarios de JHU COVID-19
+
+Mantiene en DATA_PROCESSED un dataset limpio almacenado como un archivo Parquet
+por día, junto a un manifiesto (manifest.json) con el tamaño y la fecha de
+modificación de cada CSV ya procesado. Después de actualizar el clon de JHU
+(./scripts/fetch_jhu_data.sh update o git pull) solo se leen y limpian los
+archivos nuevos o modificados, por lo que el costo de la actualización diaria
+depende del delta y no del historial completo.
+
+Uso desde la línea de comandos:
+    python -m src.incremental
+"""
+
+import json
+import logging
+import os
+import re
+
+import pandas as pd
+
+from .cache import compute_config_fingerprint, save_cleaned_dataset
+from .config import (
+    DATA_PROCESSED,
+    DATA_RAW_COVID,
+    DATE_FORMAT,
+    _iter_daily_reports,
+    _notify,
+    clean_covid_data,
+    load_continent_mapping,
+)
+
+logger = logging.getLogger('covid.incremental')
+
+# Directorio del dataset incremental (un Parquet por día + manifiesto)
+INCREMENTAL_DIR = os.path.join(DATA_PROCESSED, 'incremental')
+
+# Nombre del manifiesto de archivos procesados
+MANIFEST_FILENAME = 'manifest.json'
+
+# Patrón de nombre de los reportes diarios (MM-DD-YYYY.csv)
+DAILY_REPORT_PATTERN = re.compile(r'^\d{2}-\d{2}-\d{4}\.csv$')
+
+
+def _read_manifest(store_dir):
+    """Lee el manifiesto del dataset incremental (vacío si no existe)."""
+    path = os.path.join(store_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {'config': None, 'files': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest, store_dir):
+    """Escribe el manifiesto de forma atómica."""
+    path = os.path.join(store_dir, MANIFEST_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _part_path(store_dir, filename):
+    """Ruta del Parquet diario correspondiente a un CSV (MM-DD-YYYY.csv)."""
+    return os.path.join(store_dir, filename.replace('.csv', '.parquet'))
+
+
+def scan_daily_reports(data_dir=None):
+    """
+    Lista los reportes diarios disponibles con su tamaño y fecha de modificación.
+
+    Args:
+        data_dir (str, optional): Directorio de reportes diarios. Si es None, usa DATA_RAW_COVID
+
+    Returns:
+        dict: {nombre_archivo: {'size': int, 'mtime_ns': int}}
+    """
+    if data_dir is None:
+        data_dir = DATA_RAW_COVID
+
+    files = {}
+    if not os.path.isdir(data_dir):
+        return files
+
+    for entry in os.scandir(data_dir):
+        if entry.is_file() and DAILY_REPORT_PATTERN.match(entry.name):
+            stat = entry.stat()
+            files[entry.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return files
+
+
+def update_incremental_dataset(data_dir=None, store_dir=None, mapping_file=None, workers=None,
+                               verbose=True):
+    """
+    Procesa solo los reportes diarios nuevos o modificados y los agrega al dataset.
+
+    Si cambió la configuración de limpieza (COUNTRY_MAPPING o el archivo de
+    continentes), todos los archivos se vuelven a procesar.
+
+    Args:
+        data_dir (str, optional): Directorio de reportes diarios. Si es None, usa DATA_RAW_COVID
+        store_dir (str, optional): Directorio del dataset incremental. Si es None, usa INCREMENTAL_DIR
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+        workers (int, optional): Workers para la lectura paralela de los CSV
+        verbose (bool): Si True, muestra el progreso en consola; si False, lo
+            registra en el logger 'covid.incremental'
+
+    Returns:
+        dict: Resumen con listas 'new', 'changed', 'removed', 'failed' y 'rows_added'
+    """
+    if data_dir is None:
+        data_dir = DATA_RAW_COVID
+    if store_dir is None:
+        store_dir = INCREMENTAL_DIR
+    os.makedirs(store_dir, exist_ok=True)
+
+    manifest = _read_manifest(store_dir)
+    config_fingerprint = compute_config_fingerprint(mapping_file)
+    if manifest['config'] != config_fingerprint:
+        if manifest['files']:
+            _notify("La configuración de limpieza cambió: se reprocesan todos los archivos",
+                    logging.WARNING, verbose, logger)
+        manifest = {'config': config_fingerprint, 'files': {}}
+
+    available = scan_daily_reports(data_dir)
+    processed = manifest['files']
+
+    new_files = sorted(f for f in available if f not in processed)
+    changed_files = sorted(
+        f for f in available
+        if f in processed and (
+            processed[f]['size'] != available[f]['size'] or
+            processed[f]['mtime_ns'] != available[f]['mtime_ns']
+        )
+    )
+    removed_files = sorted(f for f in processed if f not in available)
+
+    summary = {'new': new_files, 'changed': changed_files, 'removed': removed_files,
+               'failed': [], 'rows_added': 0}
+
+    # Eliminar días cuyo CSV ya no existe en la fuente
+    for filename in removed_files:
+        part = _part_path(store_dir, filename)
+        if os.path.exists(part):
+            os.remove(part)
+        del processed[filename]
+
+    pending = new_files + changed_files
+    _notify(f"Archivos nuevos: {len(new_files)} | modificados: {len(changed_files)} | "
+            f"eliminados: {len(removed_files)}", logging.INFO, verbose, logger)
+
+    if pending:
+        # Leer solo el delta, en orden de fecha
+        pending.sort(key=lambda f: pd.to_datetime(f[:-4], format=DATE_FORMAT))
+        files = [(os.path.join(data_dir, f), pd.to_datetime(f[:-4], format=DATE_FORMAT)) for f in pending]
+
+        dfs = []
+        loaded = []
+        for filename, (df, error) in zip(pending, _iter_daily_reports(files, workers=workers)):
+            if error is not None:
+                _notify(f"Error en {filename}: {error}", logging.ERROR, verbose, logger)
+                summary['failed'].append(filename)
+                continue
+            dfs.append(df)
+            loaded.append(filename)
+
+        if dfs:
+            # Limpiar el delta completo de una vez y guardar un Parquet por día
+            df_delta = clean_covid_data(pd.concat(dfs, ignore_index=True), verbose=False)
+            df_delta = load_continent_mapping(df_delta, mapping_file=mapping_file, verbose=verbose)
+            days = dict(tuple(df_delta.groupby('date', sort=False)))
+
+            for filename in loaded:
+                date = pd.to_datetime(filename[:-4], format=DATE_FORMAT)
+                day = days.get(date)
+                if day is None:
+                    day = df_delta.iloc[0:0]
+                # Solo se registra en el manifiesto lo que quedó escrito; un día que
+                # no se pudo guardar se reintenta en la próxima actualización
+                if not save_cleaned_dataset(day.reset_index(drop=True), _part_path(store_dir, filename),
+                                            verbose=False):
+                    summary['failed'].append(filename)
+                    continue
+                processed[filename] = dict(available[filename], rows=len(day))
+                summary['rows_added'] += len(day)
+
+    _write_manifest(manifest, store_dir)
+    _notify(f"Dataset incremental actualizado: {len(processed)} días, "
+            f"{summary['rows_added']:,} registros procesados", logging.INFO, verbose, logger)
+    return summary
+
+
+def load_incremental_dataset(store_dir=None, start_date=None, end_date=None):
+    """
+    Carga el dataset incremental (opcionalmente solo un rango de fechas).
+
+    Args:
+        store_dir (str, optional): Directorio del dataset incremental. Si es None, usa INCREMENTAL_DIR
+        start_date (str, optional): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str, optional): Fecha final en formato 'YYYY-MM-DD'
+
+    Returns:
+        pd.DataFrame: DataFrame limpio ordenado por fecha
+    """
+    if store_dir is None:
+        store_dir = INCREMENTAL_DIR
+
+    manifest = _read_manifest(store_dir)
+    start = pd.to_datetime(start_date) if start_date else None
+    end = pd.to_datetime(end_date) if end_date else None
+
+    # Seleccionar los días del rango a partir del manifiesto (sin abrir otros archivos)
+    selected = []
+    for filename in manifest['files']:
+        date = pd.to_datetime(filename[:-4], format=DATE_FORMAT)
+        if (start is None or date >= start) and (end is None or date <= end):
+            selected.append((date, filename))
+    selected.sort()
+
+    dfs = [pd.read_parquet(_part_path(store_dir, filename)) for _, filename in selected]
+    dfs = [df for df in dfs if len(df) > 0]
+    if not dfs:
+        return pd.DataFrame()
+    return pd.concat(dfs, ignore_index=True)
+
+
+if __name__ == '__main__':
+    update_incremental_dataset(workers=min(8, os.cpu_count() or 1))
@@ -0,0 +1,399 @@
+"""
+Servicio local de consultas HTTP/JSON sobre el dataset limpio
+
+Carga una sola vez el dataset limpio, construye el cubo país × fecha con
+incidencia diaria y su índice de filtrado, y los mantiene en memoria para
+responder consultas de series de tiempo, rankings y KPIs con baja latencia.
+Usa solo la biblioteca estándar (http.server), por lo que varias herramientas
+o instancias del dashboard pueden compartir una copia caliente de los datos
+sin pagar cada una el costo de carga.
+
+Endpoints (GET, todos aceptan continent, country, start y end; country se
+repite para pedir varios países, country=Chile&country=Peru, porque hay
+nombres que contienen comas):
+    /health        estado del servicio y tamaño de los datos
+    /meta          continentes, países, rango de fechas y métricas
+    /timeseries    totales diarios (metrics=confirmed,deaths; by=country para separar por país)
+    /top           ranking de países por el último valor del rango (metric, n)
+    /kpis          KPIs del último día de la selección (ver compute_kpis)
+
+Ejemplo:
+    python -m src.query_service 2020-01-22 2021-12-31 --port 8765
+    curl 'http://127.0.0.1:8765/kpis?continent=Europe&start=2021-01-01&end=2021-06-30'
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import urlopen
+
+from .aggregates import CUBE_METRICS, compute_kpis, daily_totals, json_number
+from .cache import load_cleaned_dataset
+from .filtering import build_filter_index, filter_with_index, normalize_selection
+from .incidence import build_incidence_cube, incidence_columns
+
+logger = logging.getLogger('covid.query_service')
+
+# Dirección y puerto por defecto (solo conexiones locales)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Número máximo de selecciones con totales diarios guardados en memoria
+QUERY_CACHE_ENTRIES = 256
+
+# Límite de países en /top
+MAX_TOP_N = 250
+
+
+class QueryError(ValueError):
+    """Parámetros de consulta inválidos (se responden con HTTP 400)."""
+
+
+# ============================================================================
+# ESTADO Y CONSULTAS
+# ============================================================================
+
+def build_query_state(df, cache_entries=QUERY_CACHE_ENTRIES):
+    """
+    Prepara los datos residentes del servicio a partir del dataset limpio.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columnas continent, country_region y date
+        cache_entries (int): Selecciones con totales diarios guardados en memoria
+
+    Returns:
+        dict: Estado con el índice de filtrado ('index'), las métricas
+            disponibles y el caché de totales diarios por selección
+    """
+    index = build_filter_index(build_incidence_cube(df))
+    metrics = [col for col in CUBE_METRICS + incidence_columns() if col in index['data'].columns]
+    return {
+        'index': index,
+        'metrics': metrics,
+        'cache': OrderedDict(),
+        'cache_entries': cache_entries,
+        'lock': threading.Lock(),
+        'loaded_at': time.time(),
+    }
+
+
+def _selection(state, params):
+    """
+    Selección normalizada a partir de los parámetros de la consulta.
+
+    Args:
+        state (dict): Estado de build_query_state
+        params (dict): Parámetros de parse_qs (listas de valores)
+
+    Returns:
+        tuple: Selección de normalize_selection
+    """
+    index = state['index']
+    continent = params.get('continent', ['Todos'])[-1]
+    if continent != 'Todos' and continent not in index['continents']:
+        raise QueryError(f"Continente desconocido: {continent}")
+
+    # Un país por parámetro: los nombres pueden contener comas ('Bonaire, Sint Eustatius and Saba')
+    countries = [c for c in params.get('country', []) if c]
+    unknown = [c for c in countries if c not in index['countries']]
+    if unknown:
+        raise QueryError(f"Países desconocidos: {'; '.join(unknown)}")
+
+    date_range = None
+    start = params.get('start', [None])[-1]
+    end = params.get('end', [None])[-1]
+    if start or end:
+        date_range = (start or index['date_bounds'][0], end or index['date_bounds'][1])
+    try:
+        return normalize_selection(index, continent, countries, date_range)
+    except (ValueError, TypeError) as e:
+        raise QueryError(f"Fecha inválida: {e}") from e
+
+
+def _metrics(state, params, default):
+    """Métricas pedidas (separadas por comas), validadas contra las disponibles."""
+    metrics = [m for value in params.get('metrics', params.get('metric', [])) for m in value.split(',') if m]
+    metrics = metrics or default
+    unknown = [m for m in metrics if m not in state['metrics']]
+    if unknown:
+        raise QueryError(f"Métricas desconocidas: {', '.join(unknown)}")
+    return metrics
+
+
+def selection_daily(state, selection):
+    """
+    Totales diarios de una selección, con caché LRU compartido entre hilos.
+
+    Args:
+        state (dict): Estado de build_query_state
+        selection (tuple): Selección normalizada
+
+    Returns:
+        pd.DataFrame: Totales por fecha (ver daily_totals)
+    """
+    cache = state['cache']
+    with state['lock']:
+        if selection in cache:
+            cache.move_to_end(selection)
+            return cache[selection]
+
+    continent, countries, date_range = selection
+    daily = daily_totals(filter_with_index(state['index'], continent, list(countries), date_range),
+                         metrics=state['metrics'])
+
+    with state['lock']:
+        cache[selection] = daily
+        while len(cache) > state['cache_entries']:
+            cache.popitem(last=False)
+    return daily
+
+
+def _selection_json(selection):
+    continent, countries, date_range = selection
+    return {
+        'continent': continent,
+        'countries': list(countries),
+        'start': date_range[0] if date_range else None,
+        'end': date_range[1] if date_range else None,
+    }
+
+
+def query_meta(state, params):
+    """Continentes, países por continente, rango de fechas y métricas disponibles."""
+    index = state['index']
+    bounds = index['date_bounds']
+    return {
+        'continents': {str(k): list(map(str, v)) for k, v in index['continents'].items() if isinstance(k, str)},
+        'countries': sorted(map(str, index['countries'])),
+        'start': bounds[0].strftime('%Y-%m-%d') if bounds else None,
+        'end': bounds[1].strftime('%Y-%m-%d') if bounds else None,
+        'metrics': state['metrics'],
+    }
+
+
+def query_health(state, params):
+    """Estado del servicio."""
+    return {
+        'status': 'ok',
+        'rows': len(state['index']['data']),
+        'countries': len(state['index']['countries']),
+        'cached_selections': len(state['cache']),
+        'uptime_seconds': round(time.time() - state['loaded_at'], 1),
+    }
+
+
+def query_timeseries(state, params):
+    """
+    Serie diaria de la selección (total, o por país con by=country).
+
+    Returns:
+        dict: 'selection', 'dates' y {métrica: valores} (o 'series' por país)
+    """
+    selection = _selection(state, params)
+    metrics = _metrics(state, params, ['confirmed', 'deaths'])
+    by = params.get('by', [None])[-1]
+
+    if by == 'country':
+        continent, countries, date_range = selection
+        rows = filter_with_index(state['index'], continent, list(countries), date_range)
+        series = {}
+        for country, group in rows.groupby('country_region', observed=True, sort=True):
+            series[str(country)] = {
+                'dates': group['date'].dt.strftime('%Y-%m-%d').tolist(),
+                **{m: [json_number(v) for v in group[m].to_numpy()] for m in metrics},
+            }
+        return {'selection': _selection_json(selection), 'series': series}
+    if by is not None:
+        raise QueryError(f"Valor de 'by' no soportado: {by}")
+
+    daily = selection_daily(state, selection)
+    return {
+        'selection': _selection_json(selection),
+        'dates': daily.index.strftime('%Y-%m-%d').tolist(),
+        **{m: [json_number(v) for v in daily[m].to_numpy()] for m in metrics},
+    }
+
+
+def query_top(state, params):
+    """
+    Países con mayor valor de una métrica en el último día disponible de cada uno.
+
+    Returns:
+        dict: 'selection', 'metric' y 'countries' ([{country, continent, value}])
+    """
+    selection = _selection(state, params)
+    metric = _metrics(state, params, ['confirmed'])[0]
+    try:
+        n = int(params.get('n', [10])[-1])
+    except ValueError as e:
+        raise QueryError(f"n debe ser un entero: {e}") from e
+    n = max(1, min(n, MAX_TOP_N))
+
+    continent, countries, date_range = selection
+    rows = filter_with_index(state['index'], continent, list(countries), date_range)
+    if metric.startswith('new_'):
+        # Incidencia: total del rango
+        values = rows.groupby(['country_region', 'continent'], observed=True, dropna=False)[metric].sum()
+    else:
+        # Acumulados: último día de cada país (filas ordenadas por fecha dentro del país)
+        values = rows.groupby(['country_region', 'continent'], observed=True, dropna=False)[metric].last()
+    top = values.nlargest(n)
+    return {
+        'selection': _selection_json(selection),
+        'metric': metric,
+        'countries': [
+            {'country': str(country), 'continent': None if not isinstance(cont, str) else cont,
+             'value': json_number(value)}
+            for (country, cont), value in top.items()
+        ],
+    }
+
+
+def query_kpis(state, params):
+    """KPIs del último día de la selección (vacío si no hay datos)."""
+    selection = _selection(state, params)
+    daily = selection_daily(state, selection)
+    kpis = {k: json_number(v) for k, v in compute_kpis(daily).items()} if len(daily) else {}
+    return {
+        'selection': _selection_json(selection),
+        'date': daily.index[-1].strftime('%Y-%m-%d') if len(daily) else None,
+        'kpis': kpis,
+    }
+
+
+# Rutas del servicio
+ROUTES = {
+    '/health': query_health,
+    '/meta': query_meta,
+    '/timeseries': query_timeseries,
+    '/top': query_top,
+    '/kpis': query_kpis,
+}
+
+
+# ============================================================================
+# SERVIDOR HTTP
+# ============================================================================
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Resuelve cada GET con la función de ROUTES y responde JSON."""
+
+    server_version = 'CovidQuery/1.0'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip('/') or '/')
+        if route is None:
+            self._send(404, {'error': f"Ruta desconocida: {url.path}", 'routes': sorted(ROUTES)})
+            return
+
+        start = time.perf_counter()
+        try:
+            body = route(self.server.state, parse_qs(url.query))
+            status = 200
+        except QueryError as e:
+            body, status = {'error': str(e)}, 400
+        except Exception as e:  # noqa: BLE001 - el servicio sigue atendiendo otras consultas
+            logger.exception("Error en %s", self.path)
+            body, status = {'error': f"{type(e).__name__}: {e}"}, 500
+        logger.debug("%s %s %.1fms", status, self.path, (time.perf_counter() - start) * 1000)
+        self._send(status, body)
+
+    def _send(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def make_server(state, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Crea el servidor HTTP (un hilo por conexión) sobre un estado ya cargado.
+
+    Args:
+        state (dict): Estado de build_query_state
+        host (str): Dirección de escucha
+        port (int): Puerto (0 elige uno libre)
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever()
+    """
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def serve(start_date, end_date, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None):
+    """
+    Carga el dataset limpio (usa el caché en disco si es válido) y atiende consultas.
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        host (str): Dirección de escucha
+        port (int): Puerto
+        workers (int, optional): Workers para la lectura paralela de los CSV
+    """
+    start = time.perf_counter()
+    df = load_cleaned_dataset(start_date, end_date, workers=workers)
+    if df.empty:
+        print("✗ No hay datos para el rango indicado")
+        return
+    state = build_query_state(df)
+    del df
+    print(f"✓ Datos residentes: {len(state['index']['data']):,} filas país × fecha "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    server = make_server(state, host, port)
+    print(f"✓ Servicio de consultas en http://{host}:{server.server_port} "
+          f"({', '.join(sorted(ROUTES))})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def query(base_url, endpoint, timeout=30, **params):
+    """
+    Cliente mínimo: consulta un endpoint del servicio y devuelve el JSON.
+
+    Args:
+        base_url (str): URL del servicio, por ejemplo 'http://127.0.0.1:8765'
+        endpoint (str): Ruta, por ejemplo 'kpis'
+        timeout (float): Tiempo máximo de espera en segundos
+        **params: Parámetros de la consulta (las listas se envían repetidas)
+
+    Returns:
+        dict: Respuesta decodificada
+    """
+    query_string = urlencode({k: v for k, v in params.items() if v is not None}, doseq=True)
+    url = f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+    if query_string:
+        url = f"{url}?{query_string}"
+    with urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servicio local de consultas HTTP/JSON")
+    parser.add_argument('start_date', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('end_date', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Dirección de escucha")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Puerto")
+    parser.add_argument('--workers', type=int, default=None, help="Workers de lectura")
+    args = parser.parse_args()
+
+    serve(args.start_date, args.end_date, host=args.host, port=args.port, workers=args.workers)
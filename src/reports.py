@@ -0,0 +1,322 @@
+"""
+Generación por lotes de reportes por país y continente
+
+Escribe en REPORTS_DIR/batch, para cada país y cada continente, la serie
+diaria en CSV, un resumen en JSON y (si matplotlib está instalado) un gráfico
+estático en PNG, más tablas resumen de todos los países y continentes:
+
+    batch/countries/<país>.csv|json|png
+    batch/continents/<continente>.csv|json|png
+    batch/summary_countries.csv, batch/summary_continents.csv, batch/index.json
+
+El dataset limpio se carga una sola vez y se exporta como matrices país × día
+con memoria mapeada (ver src/array_store.py). Los procesos del pool abren esas
+matrices al iniciar, en solo lectura y sin copiarlas, y cada tarea recibe solo
+el nombre de la entidad y sus filas, por lo que no se serializan DataFrames
+entre procesos y el tiempo total escala con los núcleos disponibles.
+
+Uso desde la línea de comandos:
+    python -m src.reports 2020-01-22 2021-12-31 --workers 8
+    python -m src.reports 2020-01-22 2021-12-31 --no-charts --output /tmp/reportes
+"""
+
+import argparse
+import concurrent.futures
+import importlib.util
+import json
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import CUBE_METRICS, json_number
+from .analytics import GROWTH_WINDOW, add_growth_metrics
+from .array_store import export_country_arrays, load_country_arrays
+from .cache import load_cleaned_dataset
+from .config import REPORTS_DIR
+
+# Directorio por defecto de los reportes por lotes
+BATCH_REPORTS_DIR = os.path.join(REPORTS_DIR, 'batch')
+
+# Métricas de las series exportadas (acumulados e incidencia diaria)
+REPORT_METRICS = CUBE_METRICS + ['new_confirmed', 'new_deaths']
+
+# Columnas de crecimiento que se agregan a cada serie (ver src/analytics.py)
+GROWTH_COLUMNS = ['new_cases_avg_7', 'new_cases_avg_14', 'growth_rate', f'growth_{GROWTH_WINDOW}d',
+                  'doubling_time']
+
+# Columnas de las tablas resumen (una fila por entidad, ver _entity_summary)
+SUMMARY_COLUMNS = ['entity', 'type', 'continent', 'first_date', 'last_date', 'days', 'confirmed', 'deaths',
+                   'recovered', 'active_cases', 'fatality_rate', 'new_cases_avg_7', f'growth_{GROWTH_WINDOW}d',
+                   'doubling_time', 'peak_new_cases', 'peak_date']
+
+# Matrices abiertas por cada proceso del pool (ver _init_worker)
+_WORKER_STORE = None
+
+
+def _slug(name):
+    """Nombre de archivo ASCII para una entidad ('Côte d'Ivoire' -> 'cote_d_ivoire')."""
+    ascii_name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', ascii_name.lower()).strip('_') or 'sin_nombre'
+
+
+def _init_worker(array_dir):
+    """Abre las matrices compartidas una vez por proceso."""
+    global _WORKER_STORE
+    _WORKER_STORE = load_country_arrays(array_dir)
+
+
+def _entity_frame(store, rows):
+    """
+    Serie diaria de una entidad (suma de las filas de sus países).
+
+    Los días anteriores al primer caso confirmado se descartan.
+
+    Args:
+        store (dict): Resultado de load_country_arrays
+        rows (list): Filas de los países de la entidad
+
+    Returns:
+        pd.DataFrame: Una fila por fecha con las métricas y las columnas de crecimiento
+    """
+    frame = pd.DataFrame({'date': store['dates'].astype('datetime64[ns]')})
+    for metric, matrix in store['arrays'].items():
+        frame[metric] = matrix[rows].sum(axis=0) if len(rows) > 1 else matrix[rows[0]]
+
+    started = np.flatnonzero(frame['confirmed'].to_numpy() > 0)
+    frame = frame.iloc[started[0]:] if len(started) else frame.iloc[0:0]
+    if frame.empty:
+        return frame
+
+    growth = add_growth_metrics(frame, metric='confirmed', group_column=None, new_cases_column='new_confirmed')
+    growth = growth[['date'] + list(store['arrays']) + GROWTH_COLUMNS]
+
+    # Conteos como enteros (las matrices rellenadas no tienen NaN) y tasas redondeadas
+    counts = list(store['arrays'])
+    growth[counts] = growth[counts].round().astype(np.int64)
+    growth[GROWTH_COLUMNS] = growth[GROWTH_COLUMNS].round(4)
+    return growth
+
+
+def _entity_summary(entity, kind, continent, frame):
+    """Resumen del último día y del pico de casos nuevos de una entidad."""
+    summary = {'entity': entity, 'type': kind, 'continent': continent}
+    if frame.empty:
+        return summary
+
+    latest = frame.iloc[-1]
+    peak = frame['new_confirmed'].idxmax()
+    confirmed = latest['confirmed']
+    summary.update({
+        'first_date': frame['date'].iloc[0].strftime('%Y-%m-%d'),
+        'last_date': latest['date'].strftime('%Y-%m-%d'),
+        'days': len(frame),
+        'confirmed': json_number(confirmed),
+        'deaths': json_number(latest['deaths']),
+        'recovered': json_number(latest['recovered']),
+        'active_cases': json_number(latest['active_cases']),
+        'fatality_rate': json_number(latest['deaths'] / confirmed * 100 if confirmed > 0 else 0, 4),
+        'new_cases_avg_7': json_number(latest['new_cases_avg_7'], 4),
+        f'growth_{GROWTH_WINDOW}d': json_number(latest[f'growth_{GROWTH_WINDOW}d'], 4),
+        'doubling_time': json_number(latest['doubling_time'], 4),
+        'peak_new_cases': json_number(frame.loc[peak, 'new_confirmed']),
+        'peak_date': frame.loc[peak, 'date'].strftime('%Y-%m-%d'),
+    })
+    return summary
+
+
+def _plot_entity(entity, frame, path):
+    """
+    Gráfico estático de una entidad: acumulados y casos nuevos diarios.
+
+    Args:
+        entity (str): Nombre de la entidad (título)
+        frame (pd.DataFrame): Serie de _entity_frame
+        path (str): Ruta del PNG
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, (ax_total, ax_new) = plt.subplots(2, 1, figsize=(10, 7), sharex=True)
+    ax_total.plot(frame['date'], frame['confirmed'], color='#1f77b4', label='Confirmados')
+    ax_total.plot(frame['date'], frame['active_cases'], color='#ff7f0e', label='Activos')
+    ax_total.plot(frame['date'], frame['deaths'], color='#d62728', label='Fallecidos')
+    ax_total.set_title(f'{entity} - Evolución de casos')
+    ax_total.set_ylabel('Número de casos')
+    ax_total.legend(loc='upper left')
+    ax_total.grid(alpha=0.3)
+
+    ax_new.bar(frame['date'], frame['new_confirmed'], color='indianred', width=1.0, label='Nuevos casos')
+    ax_new.plot(frame['date'], frame['new_cases_avg_7'], color='black', label='Promedio 7 días')
+    ax_new.set_title('Nuevos casos diarios')
+    ax_new.set_ylabel('Nuevos casos')
+    ax_new.legend(loc='upper left')
+    ax_new.grid(alpha=0.3)
+
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+
+
+def _write_entity(task):
+    """
+    Escribe los archivos de una entidad (se ejecuta en un proceso del pool).
+
+    Args:
+        task (tuple): (nombre, tipo, continente, filas, directorio, slug, charts)
+
+    Returns:
+        dict: Resumen de la entidad
+    """
+    entity, kind, continent, rows, out_dir, slug, charts = task
+    frame = _entity_frame(_WORKER_STORE, rows)
+    summary = _entity_summary(entity, kind, continent, frame)
+
+    base = os.path.join(out_dir, slug)
+    frame.to_csv(f'{base}.csv', index=False, date_format='%Y-%m-%d')
+    with open(f'{base}.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    if charts and not frame.empty:
+        _plot_entity(entity, frame, f'{base}.png')
+    return summary
+
+
+def _build_tasks(store, output_dir, charts):
+    """Tareas de todos los países y continentes (nombres de archivo únicos por tipo)."""
+    tasks = []
+    by_continent = {}
+    for row, (country, continent) in enumerate(zip(store['countries'], store['continents'])):
+        if continent is not None:
+            by_continent.setdefault(continent, []).append(row)
+
+    entities = [(country, 'country', continent, [row])
+                for row, (country, continent) in enumerate(zip(store['countries'], store['continents']))]
+    entities += [(continent, 'continent', continent, rows) for continent, rows in sorted(by_continent.items())]
+
+    used = set()
+    for entity, kind, continent, rows in entities:
+        out_dir = os.path.join(output_dir, 'countries' if kind == 'country' else 'continents')
+        slug = _slug(entity)
+        while (kind, slug) in used:
+            slug = f'{slug}_'
+        used.add((kind, slug))
+        tasks.append((entity, kind, continent, rows, out_dir, slug, charts))
+    return tasks
+
+
+def generate_reports(df, output_dir=None, workers=None, charts=True, array_dir=None, verbose=True):
+    """
+    Genera los reportes de todos los países y continentes con un pool de procesos.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columnas continent, country_region y date
+        output_dir (str, optional): Directorio de salida. Si es None, usa BATCH_REPORTS_DIR
+        workers (int, optional): Procesos del pool. Si es None, os.cpu_count(); con 1
+            se generan en el proceso actual
+        charts (bool): Si True, genera los gráficos PNG (requiere matplotlib)
+        array_dir (str, optional): Directorio donde exportar las matrices compartidas.
+            Si es None, se usa un directorio temporal que se elimina al terminar
+        verbose (bool): Si True, imprime el progreso
+
+    Returns:
+        pd.DataFrame: Resumen de cada entidad (una fila por país o continente, con
+            SUMMARY_COLUMNS); vacío si df no tiene filas
+    """
+    if output_dir is None:
+        output_dir = BATCH_REPORTS_DIR
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if df.empty:
+        if verbose:
+            print("⚠ No hay datos: no se generan reportes")
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    if charts and importlib.util.find_spec('matplotlib') is None:
+        if verbose:
+            print("⚠ matplotlib no está instalado: se omiten los gráficos PNG")
+        charts = False
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        array_dir = array_dir or os.path.join(tmp_dir, 'arrays')
+        export_country_arrays(df, array_dir, metrics=REPORT_METRICS, fill='ffill', verbose=False)
+        store = load_country_arrays(array_dir)
+        tasks = _build_tasks(store, output_dir, charts)
+        for sub_dir in ('countries', 'continents'):
+            os.makedirs(os.path.join(output_dir, sub_dir), exist_ok=True)
+
+        if workers <= 1:
+            _init_worker(array_dir)
+            summaries = [_write_entity(task) for task in tasks]
+        else:
+            # Varias entidades por tarea para reducir la comunicación entre procesos
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                        initargs=(array_dir,)) as pool:
+                summaries = list(pool.map(_write_entity, tasks, chunksize=chunksize))
+
+    summary = pd.DataFrame(summaries, columns=SUMMARY_COLUMNS)
+    for kind, name in (('country', 'summary_countries.csv'), ('continent', 'summary_continents.csv')):
+        part = summary[summary['type'] == kind].sort_values('confirmed', ascending=False, na_position='last')
+        part.to_csv(os.path.join(output_dir, name), index=False)
+
+    elapsed = time.perf_counter() - start
+    with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'start_date': str(store['dates'][0]) if len(store['dates']) else None,
+            'end_date': str(store['dates'][-1]) if len(store['dates']) else None,
+            'countries': int((summary['type'] == 'country').sum()),
+            'continents': int((summary['type'] == 'continent').sum()),
+            'charts': charts,
+            'workers': workers,
+            'seconds': round(elapsed, 2),
+            'files': {task[0]: os.path.relpath(os.path.join(task[4], task[5]), output_dir) for task in tasks},
+        }, f, ensure_ascii=False, indent=2)
+
+    if verbose:
+        print(f"✓ Reportes generados: {len(tasks)} entidades en {output_dir} "
+              f"({elapsed:.1f}s, {workers} procesos)")
+    return summary
+
+
+def build_reports(start_date, end_date, output_dir=None, workers=None, charts=True, read_workers=None):
+    """
+    Genera los reportes a partir del dataset limpio (usa el caché en disco si es válido).
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        output_dir (str, optional): Directorio de salida. Si es None, usa BATCH_REPORTS_DIR
+        workers (int, optional): Procesos del pool de reportes
+        charts (bool): Si True, genera los gráficos PNG
+        read_workers (int, optional): Workers para la lectura paralela de los CSV
+
+    Returns:
+        pd.DataFrame: Resumen de cada entidad, o None si no hay datos
+    """
+    df = load_cleaned_dataset(start_date, end_date, workers=read_workers)
+    if df.empty:
+        print("✗ No hay datos para el rango indicado")
+        return None
+    return generate_reports(df, output_dir, workers=workers, charts=charts)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera reportes por país y continente en REPORTS_DIR")
+    parser.add_argument('start_date', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('end_date', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--output', default=None, help="Directorio de salida")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos del pool (por defecto, núcleos)")
+    parser.add_argument('--no-charts', action='store_true', help="No generar gráficos PNG")
+    parser.add_argument('--read-workers', type=int, default=None, help="Workers de lectura de los CSV")
+    args = parser.parse_args()
+
+    build_reports(args.start_date, args.end_date, output_dir=args.output, workers=args.workers,
+                  charts=not args.no_charts, read_workers=args.read_workers)
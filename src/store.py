@@ -0,0 +1,266 @@
+"""
+Almacén de datos procesados particionado por fecha (y opcionalmente continente)
+
+Guarda el dataset limpio en DATA_PROCESSED/store con un directorio por año y
+mes, estilo Hive:
+
+    store/year=2021/month=06/part-*.parquet
+    store/year=2021/month=06/continent=Europe/part-*.parquet   (con continentes)
+
+Los lectores descartan las particiones que no coinciden con el rango de fechas
+o los continentes pedidos a partir de los nombres de directorio, sin abrir sus
+archivos, y dentro de cada archivo filtran filas con los filtros de Parquet.
+
+Uso desde la línea de comandos:
+    python -m src.store 2020-01-22 2021-12-31 [--by-continent]
+"""
+
+import argparse
+import glob
+import logging
+import os
+import shutil
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from .cache import load_cleaned_dataset, save_cleaned_dataset
+from .config import DATA_PROCESSED, _notify
+
+logger = logging.getLogger('covid.store')
+
+# Directorio raíz del almacén particionado
+STORE_DIR = os.path.join(DATA_PROCESSED, 'store')
+
+# Valor de partición para filas sin continente asignado (por ejemplo cruceros)
+NULL_PARTITION = '__null__'
+
+
+def partition_dir(store_dir, year, month, continent=None):
+    """
+    Ruta del directorio de una partición año/mes (y continente, si se indica).
+
+    Args:
+        store_dir (str): Directorio raíz del almacén
+        year (int): Año
+        month (int): Mes (1-12)
+        continent (str, optional): Continente de la partición
+
+    Returns:
+        str: Ruta de la partición
+    """
+    path = os.path.join(store_dir, f"year={year:04d}", f"month={month:02d}")
+    if continent is not None:
+        value = NULL_PARTITION if pd.isna(continent) else quote(str(continent), safe='')
+        path = os.path.join(path, f"continent={value}")
+    return path
+
+
+def write_partitioned(df, store_dir=None, part_name='data', partition_by_continent=False):
+    """
+    Escribe un DataFrame limpio en el almacén, separado por año y mes de 'date'.
+
+    Cada partición recibe un archivo part-<part_name>.parquet; volver a escribir
+    el mismo part_name reemplaza el archivo anterior. Si una partición no se
+    puede escribir se detiene con OSError, para no informar un almacén
+    incompleto como escrito.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columna 'date'
+        store_dir (str, optional): Directorio raíz del almacén. Si es None, usa STORE_DIR
+        part_name (str): Sufijo del nombre del archivo dentro de cada partición
+        partition_by_continent (bool): Si True, agrega un nivel de partición por continente
+
+    Returns:
+        list: Rutas de los archivos escritos
+    """
+    if store_dir is None:
+        store_dir = STORE_DIR
+
+    written = []
+    if df.empty:
+        return written
+
+    dates = df['date']
+    keys = [dates.dt.year.rename('year'), dates.dt.month.rename('month')]
+    if partition_by_continent:
+        keys.append(df['continent'].astype(object).rename('continent_key'))
+
+    for key, part in df.groupby(keys, sort=True, dropna=False, observed=True):
+        year, month = key[0], key[1]
+        continent = key[2] if partition_by_continent else None
+        path = os.path.join(partition_dir(store_dir, year, month, continent), f"part-{part_name}.parquet")
+        if not save_cleaned_dataset(part.reset_index(drop=True), path, verbose=False):
+            raise OSError(f"No se pudo escribir la partición {path} "
+                          f"({len(written)} archivos escritos antes del error)")
+        written.append(path)
+    return written
+
+
+def write_store(df, store_dir=None, partition_by_continent=False, overwrite=True, verbose=True):
+    """
+    Escribe el dataset limpio completo en el almacén particionado.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpio con columnas 'date' y 'continent'
+        store_dir (str, optional): Directorio raíz del almacén. Si es None, usa STORE_DIR
+        partition_by_continent (bool): Si True, particiona también por continente
+        overwrite (bool): Si True, elimina el contenido previo del almacén
+        verbose (bool): Si True, muestra el resultado en consola; si False, lo
+            registra en el logger 'covid.store'
+
+    Returns:
+        list: Rutas de los archivos escritos
+    """
+    if store_dir is None:
+        store_dir = STORE_DIR
+
+    if overwrite and os.path.isdir(store_dir):
+        shutil.rmtree(store_dir)
+
+    written = write_partitioned(df, store_dir, partition_by_continent=partition_by_continent)
+    _notify(f"Almacén escrito: {len(written)} particiones en {store_dir}", logging.INFO, verbose, logger)
+    return written
+
+
+def list_partitions(store_dir=None):
+    """
+    Lista los archivos del almacén con los valores de partición de su ruta.
+
+    Args:
+        store_dir (str, optional): Directorio raíz del almacén. Si es None, usa STORE_DIR
+
+    Returns:
+        list: Diccionarios con 'year', 'month', 'continent' (o None) y 'path'
+    """
+    if store_dir is None:
+        store_dir = STORE_DIR
+
+    partitions = []
+    pattern = os.path.join(store_dir, 'year=*', 'month=*', '**', '*.parquet')
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        values = {}
+        for part in os.path.relpath(path, store_dir).split(os.sep)[:-1]:
+            key, _, value = part.partition('=')
+            values[key] = value
+
+        continent = values.get('continent')
+        if continent is not None:
+            continent = None if continent == NULL_PARTITION else unquote(continent)
+
+        partitions.append({
+            'year': int(values['year']),
+            'month': int(values['month']),
+            'continent': continent,
+            'partitioned_by_continent': 'continent' in values,
+            'path': path,
+        })
+    return partitions
+
+
+def read_store(store_dir=None, start_date=None, end_date=None, continents=None, columns=None):
+    """
+    Lee del almacén solo las particiones que coinciden con el rango y los continentes.
+
+    Ejemplo: read_store(start_date='2021-06-01', end_date='2021-08-31') abre
+    únicamente las particiones 2021-06, 2021-07 y 2021-08.
+
+    Args:
+        store_dir (str, optional): Directorio raíz del almacén. Si es None, usa STORE_DIR
+        start_date (str, optional): Fecha inicial en formato 'YYYY-MM-DD' (incluida)
+        end_date (str, optional): Fecha final en formato 'YYYY-MM-DD' (incluida)
+        continents (list, optional): Continentes a incluir. Si es None, todos
+        columns (list, optional): Columnas a leer. Si es None, todas
+
+    Returns:
+        pd.DataFrame: Filas seleccionadas, ordenadas por fecha
+    """
+    start = pd.to_datetime(start_date) if start_date else None
+    end = pd.to_datetime(end_date) if end_date else None
+    if continents is not None:
+        continents = set(continents)
+
+    # Poda de particiones por nombre de directorio (sin abrir archivos)
+    selected = []
+    for partition in list_partitions(store_dir):
+        month_start = pd.Timestamp(year=partition['year'], month=partition['month'], day=1)
+        month_end = month_start + pd.offsets.MonthEnd(0)
+        if start is not None and month_end < start.normalize():
+            continue
+        if end is not None and month_start > end:
+            continue
+        if (continents is not None and partition['partitioned_by_continent']
+                and partition['continent'] not in continents):
+            continue
+        selected.append(partition)
+
+    # Filtros de filas dentro de cada archivo (fechas parciales del mes y
+    # continentes cuando el almacén no está particionado por continente)
+    filters = []
+    if start is not None:
+        filters.append(('date', '>=', start))
+    if end is not None:
+        filters.append(('date', '<=', end))
+
+    read_columns = columns
+    if columns is not None:
+        read_columns = list(dict.fromkeys(list(columns) + ['date']))
+
+    dfs = []
+    for partition in selected:
+        partition_filters = list(filters)
+        if continents is not None and not partition['partitioned_by_continent']:
+            partition_filters.append(('continent', 'in', sorted(continents)))
+        if read_columns is not None and partition_filters:
+            file_columns = list(dict.fromkeys(read_columns + [f[0] for f in partition_filters]))
+        else:
+            file_columns = read_columns
+        df = pd.read_parquet(partition['path'], columns=file_columns, filters=partition_filters or None)
+        if len(df) > 0:
+            dfs.append(df)
+
+    if not dfs:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.concat(dfs, ignore_index=True)
+    df = df.sort_values('date', kind='stable').reset_index(drop=True)
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def build_store(start_date, end_date, store_dir=None, partition_by_continent=False, workers=None,
+                verbose=True):
+    """
+    Genera el almacén particionado a partir del pipeline de limpieza.
+
+    Usa load_cleaned_dataset, por lo que reutiliza el caché en disco si es válido.
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        store_dir (str, optional): Directorio raíz del almacén. Si es None, usa STORE_DIR
+        partition_by_continent (bool): Si True, particiona también por continente
+        workers (int, optional): Workers para la lectura paralela de los CSV
+        verbose (bool): Si True, muestra el progreso en consola; si False, lo
+            registra en los loggers del pipeline
+
+    Returns:
+        list: Rutas de los archivos escritos
+    """
+    df = load_cleaned_dataset(start_date, end_date, workers=workers, verbose=verbose)
+    if df.empty:
+        return []
+    return write_store(df, store_dir, partition_by_continent=partition_by_continent, verbose=verbose)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera el almacén particionado de datos procesados")
+    parser.add_argument('start_date', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('end_date', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--by-continent', action='store_true', help="Particionar también por continente")
+    parser.add_argument('--workers', type=int, default=None, help="Workers de lectura")
+    args = parser.parse_args()
+
+    build_store(args.start_date, args.end_date, partition_by_continent=args.by_continent,
+                workers=args.workers)
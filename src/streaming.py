@@ -0,0 +1,184 @@
+"""
+Ingesta por bloques (streaming) con memoria acotada
+
+load_daily_reports mantiene en memoria todos los DataFrames diarios y además el
+resultado concatenado, por lo que el pico de memoria es cercano al doble del
+dataset. Este módulo lee, limpia y asigna continentes por bloques de N días, y
+entrega cada bloque con un generador o lo escribe directamente en el almacén
+particionado (src/store.py). El pico de memoria queda acotado por el tamaño
+del bloque y no por el historial completo.
+
+En el almacén cada día se guarda en su propio archivo (part-YYYY-MM-DD.parquet
+dentro de su partición), por lo que volver a procesar un rango, con cualquier
+chunk_days, reemplaza solo los días de ese rango y conserva los demás.
+
+Uso desde la línea de comandos:
+    python -m src.streaming 2020-01-22 2021-12-31 --chunk-days 7
+"""
+
+import argparse
+import logging
+import os
+import shutil
+
+import pandas as pd
+
+from .config import (
+    DATA_RAW_COVID,
+    DATE_FORMAT,
+    _iter_daily_reports,
+    _notify,
+    clean_covid_data,
+    load_continent_mapping,
+)
+from .store import STORE_DIR, list_partitions, write_partitioned
+
+logger = logging.getLogger('covid.streaming')
+
+# Formato del nombre de los archivos por día (part-<fecha>.parquet)
+DAY_PART_FORMAT = '%Y-%m-%d'
+
+
+def iter_cleaned_chunks(start_date, end_date, chunk_days=1, data_dir=None, mapping_file=None,
+                        workers=None, verbose=True):
+    """
+    Genera bloques limpios y con continente asignado, de chunk_days días cada uno.
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        chunk_days (int): Número de días por bloque
+        data_dir (str, optional): Directorio de reportes diarios. Si es None, usa DATA_RAW_COVID
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+        workers (int, optional): Workers para leer en paralelo los archivos de cada bloque
+        verbose (bool): Si True, muestra los archivos faltantes o con error; si
+            False, los registra en el logger 'covid.streaming'
+
+    Yields:
+        pd.DataFrame: Bloque limpio (los días sin archivo o con error se omiten)
+    """
+    if data_dir is None:
+        data_dir = DATA_RAW_COVID
+    if chunk_days < 1:
+        raise ValueError("chunk_days debe ser mayor o igual a 1")
+
+    dates = pd.date_range(start=start_date, end=end_date, freq='D')
+
+    for offset in range(0, len(dates), chunk_days):
+        files = []
+        for date in dates[offset:offset + chunk_days]:
+            filename = date.strftime(DATE_FORMAT) + '.csv'
+            filepath = os.path.join(data_dir, filename)
+            if not os.path.exists(filepath):
+                _notify(f"Archivo no encontrado: {filename}", logging.WARNING, verbose, logger)
+                continue
+            files.append((filepath, date))
+
+        dfs = []
+        for (filepath, _), (df, error) in zip(files, _iter_daily_reports(files, workers=workers)):
+            if error is not None:
+                _notify(f"Error en {os.path.basename(filepath)}: {error}", logging.ERROR, verbose, logger)
+                continue
+            dfs.append(df)
+
+        if not dfs:
+            continue
+
+        chunk = pd.concat(dfs, ignore_index=True)
+        del dfs
+        chunk = clean_covid_data(chunk, verbose=False)
+        chunk = load_continent_mapping(chunk, mapping_file=mapping_file, verbose=False)
+        yield chunk
+
+
+def _remove_day_parts(store_dir, start_date, end_date):
+    """
+    Elimina del almacén los archivos por día cuyas fechas caen en el rango.
+
+    Args:
+        store_dir (str): Directorio raíz del almacén
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD' (incluida)
+        end_date (str): Fecha final en formato 'YYYY-MM-DD' (incluida)
+
+    Returns:
+        int: Número de archivos eliminados
+    """
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    removed = 0
+    for partition in list_partitions(store_dir):
+        name = os.path.basename(partition['path'])[len('part-'):-len('.parquet')]
+        day = pd.to_datetime(name, format=DAY_PART_FORMAT, errors='coerce')
+        if pd.notna(day) and start <= day <= end:
+            os.remove(partition['path'])
+            removed += 1
+    return removed
+
+
+def stream_to_store(start_date, end_date, store_dir=None, chunk_days=7, data_dir=None,
+                    mapping_file=None, workers=None, partition_by_continent=False, overwrite=False,
+                    verbose=True):
+    """
+    Procesa un rango de fechas por bloques y los escribe en el almacén particionado.
+
+    Cada bloque se escribe y se libera antes de leer el siguiente, un archivo
+    por día. Antes de escribir se eliminan los archivos por día del rango
+    pedido (incluidos los días que ya no tienen reporte), de modo que repetir
+    un rango no duplica filas y los meses fuera del rango no se tocan. No
+    combinar con un almacén escrito por write_store sin overwrite=True: sus
+    archivos part-data.parquet cubren el mes completo.
+
+    Args:
+        start_date (str): Fecha inicial en formato 'YYYY-MM-DD'
+        end_date (str): Fecha final en formato 'YYYY-MM-DD'
+        store_dir (str, optional): Directorio del almacén. Si es None, usa STORE_DIR
+        chunk_days (int): Número de días por bloque
+        data_dir (str, optional): Directorio de reportes diarios. Si es None, usa DATA_RAW_COVID
+        mapping_file (str, optional): Archivo de continentes. Si es None, usa CONTINENT_MAPPING_FILE
+        workers (int, optional): Workers para leer en paralelo los archivos de cada bloque
+        partition_by_continent (bool): Si True, particiona también por continente
+        overwrite (bool): Si True, elimina todo el contenido previo del almacén
+            (también fuera del rango)
+        verbose (bool): Si True, muestra el progreso en consola; si False, lo
+            registra en el logger 'covid.streaming'
+
+    Returns:
+        dict: Resumen con 'chunks', 'rows' y 'files' (rutas escritas)
+    """
+    if store_dir is None:
+        store_dir = STORE_DIR
+
+    if overwrite and os.path.isdir(store_dir):
+        shutil.rmtree(store_dir)
+    elif os.path.isdir(store_dir):
+        _remove_day_parts(store_dir, start_date, end_date)
+
+    summary = {'chunks': 0, 'rows': 0, 'files': []}
+
+    for chunk in iter_cleaned_chunks(start_date, end_date, chunk_days=chunk_days, data_dir=data_dir,
+                                     mapping_file=mapping_file, workers=workers, verbose=verbose):
+        for date, day in chunk.groupby('date', sort=True):
+            summary['files'].extend(write_partitioned(
+                day, store_dir, part_name=date.strftime(DAY_PART_FORMAT),
+                partition_by_continent=partition_by_continent
+            ))
+        summary['chunks'] += 1
+        summary['rows'] += len(chunk)
+
+    _notify(f"{summary['chunks']} bloques escritos: {summary['rows']:,} registros "
+            f"en {len(summary['files'])} archivos", logging.INFO, verbose, logger)
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ingesta por bloques hacia el almacén particionado")
+    parser.add_argument('start_date', help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument('end_date', help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument('--chunk-days', type=int, default=7, help="Días por bloque")
+    parser.add_argument('--workers', type=int, default=None, help="Workers de lectura por bloque")
+    parser.add_argument('--by-continent', action='store_true', help="Particionar también por continente")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="Eliminar todo el almacén antes de escribir (no solo el rango)")
+    args = parser.parse_args()
+
+    stream_to_store(args.start_date, args.end_date, chunk_days=args.chunk_days, workers=args.workers,
+                    partition_by_continent=args.by_continent, overwrite=args.overwrite)
@@ -0,0 +1,89 @@
+"""Pruebas de src/aggregates.py."""
+
+import numpy as np
+import pandas as pd
+
+from src.aggregates import (build_country_cube, build_snapshot_table, compute_kpis, daily_totals, json_number,
+                            snapshot_at, snapshot_top)
+
+
+def test_json_number_converts_numpy_scalars():
+    assert json_number(np.int64(5)) == 5 and isinstance(json_number(np.float64(5.0)), int)
+    assert json_number(np.float32(np.nan)) is None
+    assert json_number(np.inf) is None
+    assert json_number(2 / 3, 4) == 0.6667
+    assert json_number(2 / 3) == 2 / 3
+
+
+def _daily(**columns):
+    """Totales diarios de dos fechas con las columnas indicadas."""
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(['2020-03-02', '2020-03-01'], name='date'))
+
+
+def test_compute_kpis_deltas_from_cumulative_differences():
+    kpis = compute_kpis(_daily(confirmed=[110, 100], deaths=[7, 5], recovered=[20, 10], active_cases=[83, 85]))
+    assert kpis['total_confirmed'] == 110 and kpis['fatality_rate'] == 7 / 110 * 100
+    assert (kpis['delta_confirmed'], kpis['delta_deaths'], kpis['delta_active']) == (10, 2, -2)
+
+
+def test_compute_kpis_deltas_all_come_from_incidence():
+    kpis = compute_kpis(_daily(confirmed=[110, 100], deaths=[7, 5], recovered=[20, 10], active_cases=[83, 85],
+                               new_confirmed=[15, 100], new_deaths=[3, 5], new_recovered=[4, 10]))
+    assert (kpis['delta_confirmed'], kpis['delta_deaths'], kpis['delta_active']) == (15, 3, 8)
+
+
+def test_build_country_cube_sums_provinces_and_keeps_unmapped_countries():
+    df = pd.DataFrame({
+        'continent': ['Asia', 'Asia', 'Asia', None],
+        'country_region': ['China', 'China', 'China', 'Diamond Princess'],
+        'province_state': ['Hubei', 'Beijing', 'Hubei', None],
+        'date': pd.to_datetime(['2020-03-01', '2020-03-01', '2020-03-02', '2020-03-01']),
+        'confirmed': [100, 10, 120, 700],
+        'deaths': [5, 0, 6, 1],
+    })
+    cube = build_country_cube(df)
+
+    assert list(cube.columns) == ['continent', 'country_region', 'date', 'confirmed', 'deaths']
+    china = cube[cube['country_region'] == 'China']
+    assert china['confirmed'].tolist() == [110, 120] and china['deaths'].tolist() == [5, 6]
+    assert cube.loc[cube['country_region'] == 'Diamond Princess', 'continent'].isna().all()
+    assert daily_totals(cube)['confirmed'].tolist() == daily_totals(df)['confirmed'].tolist() == [810, 120]
+
+
+def _snapshot_cube():
+    """Cubo de tres países: Peru deja de reportar el 03-02 y Japan empieza ese día."""
+    rows = [
+        ('South America', 'Chile', '2020-03-01', 900, 9),
+        ('South America', 'Peru', '2020-03-01', 2000, 100),
+        ('South America', 'Chile', '2020-03-02', 1000, 50),
+        ('Asia', 'Japan', '2020-03-02', 3000, 30),
+        ('South America', 'Chile', '2020-03-03', 1001, 50),
+        ('Asia', 'Japan', '2020-03-03', 3100, 31),
+    ]
+    cube = pd.DataFrame(rows, columns=['continent', 'country_region', 'date', 'confirmed', 'deaths'])
+    cube['date'] = pd.to_datetime(cube['date'])
+    return cube
+
+
+def test_snapshot_at_carries_forward_the_last_report():
+    snapshots = build_snapshot_table(_snapshot_cube())
+
+    day2 = snapshot_at(snapshots, '2020-03-02')
+    assert day2['country_region'].tolist() == ['Japan', 'Peru', 'Chile']
+    assert day2['confirmed'].tolist() == [3000, 2000, 1000]
+    assert day2['rank'].tolist() == [1, 2, 3] and day2['continent_rank'].tolist() == [1, 1, 2]
+    # Un día sin snapshot propio usa el anterior; antes del primero no hay filas
+    assert snapshot_at(snapshots, '2020-03-10')['date'].eq(pd.Timestamp('2020-03-03')).all()
+    assert snapshot_at(snapshots, '2020-02-01').empty
+    assert snapshot_at(snapshots)['confirmed'].tolist() == [3100, 2000, 1001]
+
+
+def test_snapshot_top_fatality_needs_more_than_the_minimum():
+    snapshots = build_snapshot_table(_snapshot_cube())
+
+    # Chile tiene exactamente 1000 confirmados el 03-02: no entra al ranking
+    fatality = snapshot_top(snapshots, date='2020-03-02', by='fatality_rate')
+    assert fatality['country_region'].tolist() == ['Peru', 'Japan']
+    assert snapshot_top(snapshots, by='fatality_rate')['country_region'].tolist() == ['Chile', 'Peru', 'Japan']
+    assert snapshot_top(snapshots, n=1, continent='South America')['country_region'].tolist() == ['Peru']
+    assert snapshot_top(snapshots, countries=['Chile', 'Japan'], by='deaths')['deaths'].tolist() == [50, 31]
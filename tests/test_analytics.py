@@ -0,0 +1,60 @@
+"""Pruebas de src/analytics.py."""
+
+import numpy as np
+import pandas as pd
+
+from src.analytics import add_growth_metrics, global_growth_metrics
+
+
+def _cube():
+    """Dos países con 20 días de acumulados, desordenados."""
+    dates = pd.date_range('2020-03-01', periods=20)
+    rng = np.random.default_rng(0)
+    frames = []
+    for country in ('Spain', 'Chile'):
+        confirmed = np.cumsum(rng.integers(0, 50, size=len(dates))) + 1
+        frames.append(pd.DataFrame({'country_region': country, 'date': dates, 'confirmed': confirmed}))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def test_add_growth_metrics_matches_groupby_rolling():
+    result = add_growth_metrics(_cube(), windows=[7], growth_window=5)
+
+    expected = _cube().sort_values(['country_region', 'date']).reset_index(drop=True)
+    grouped = expected.groupby('country_region', sort=False)['confirmed']
+    new_cases = grouped.diff().fillna(0.0)
+    previous = grouped.shift(1)
+
+    np.testing.assert_allclose(result['new_cases'], new_cases)
+    np.testing.assert_allclose(result['new_cases_avg_7'],
+                               new_cases.groupby(expected['country_region'], sort=False)
+                               .transform(lambda s: s.rolling(7, min_periods=1).mean()))
+    np.testing.assert_allclose(result['growth_rate'], (new_cases / previous * 100).fillna(0.0))
+    np.testing.assert_allclose(result['growth_5d'], grouped.pct_change(5) * 100)
+    assert result['country_region'].tolist()[:20] == ['Chile'] * 20
+
+
+def _global(confirmed):
+    """Totales diarios globales con 'date' como índice."""
+    return pd.DataFrame({'confirmed': confirmed},
+                        index=pd.date_range('2020-03-01', periods=len(confirmed), name='date'))
+
+
+def test_doubling_time_of_a_doubling_series():
+    result = global_growth_metrics(_global([1, 2, 4, 8, 16, 16, 16]), growth_window=2)
+
+    assert result['new_cases'].tolist() == [0, 1, 2, 4, 8, 0, 0]
+    np.testing.assert_allclose(result['doubling_time'].iloc[2:5], 1.0)
+    assert result['doubling_time'].iloc[[0, 1, 6]].isna().all()
+
+
+def test_outbreak_marks_the_growth_spike():
+    result = global_growth_metrics(_global([10, 11, 12, 13, 26, 27, 28]))
+    assert result['outbreak'].tolist() == [False, False, False, False, True, False, False]
+
+
+def test_new_cases_column_replaces_the_difference():
+    daily = pd.DataFrame({'date': pd.date_range('2020-03-01', periods=3), 'confirmed': [10, 12, 11],
+                          'new_confirmed': [10, 2, 0]})
+    result = global_growth_metrics(daily, new_cases_column='new_confirmed')
+    assert result['new_cases'].tolist() == [10, 2, 0]
@@ -0,0 +1,62 @@
+"""Pruebas de src/array_store.py."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.array_store import country_series, export_country_arrays, load_country_arrays
+
+
+def _cleaned_frame():
+    """Dos países: Spain sin reporte el 03-02 y Chile desde el 03-02 con dos provincias."""
+    rows = [
+        ('Europe', 'Spain', None, '2020-03-01', 10),
+        ('Europe', 'Spain', None, '2020-03-03', 30),
+        ('South America', 'Chile', 'A', '2020-03-02', 5),
+        ('South America', 'Chile', 'B', '2020-03-02', 1),
+        ('South America', 'Chile', 'A', '2020-03-03', 7),
+        ('South America', 'Chile', 'B', '2020-03-03', 2),
+    ]
+    df = pd.DataFrame(rows, columns=['continent', 'country_region', 'province_state', 'date', 'confirmed'])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def test_export_and_load_round_trip(tmp_path):
+    meta = export_country_arrays(_cleaned_frame(), str(tmp_path), metrics=['confirmed'], verbose=False)
+    assert meta['shape'] == [2, 3] and meta['start_date'] == '2020-03-01'
+
+    store = load_country_arrays(str(tmp_path))
+    assert store['countries'] == ['Chile', 'Spain']
+    assert store['continents'] == ['South America', 'Europe']
+    assert isinstance(store['arrays']['confirmed'], np.memmap)
+    np.testing.assert_array_equal(store['arrays']['confirmed'], [[0, 6, 9], [10, 10, 30]])
+
+    dates, values = country_series(store, 'Spain', start_date='2020-03-02')
+    assert dates.tolist() == list(np.arange('2020-03-02', '2020-03-04', dtype='datetime64[D]'))
+    assert values.tolist() == [10, 30]
+
+
+def test_incidence_metrics_fill_missing_days_with_zero(tmp_path):
+    export_country_arrays(_cleaned_frame(), str(tmp_path), metrics=['confirmed', 'new_confirmed'], fill=None,
+                          verbose=False)
+    store = load_country_arrays(str(tmp_path), mmap_mode=None)
+    np.testing.assert_array_equal(store['arrays']['new_confirmed'], [[0, 6, 3], [10, 0, 20]])
+    assert np.isnan(store['arrays']['confirmed'][1, 1])
+
+
+def test_load_country_arrays_validates_the_store(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_country_arrays(str(tmp_path))
+
+    export_country_arrays(_cleaned_frame(), str(tmp_path), metrics=['confirmed'], verbose=False)
+    with pytest.raises(KeyError):
+        load_country_arrays(str(tmp_path), metrics=['deaths'])
+
+    meta_path = tmp_path / 'meta.json'
+    meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    meta_path.write_text(json.dumps(dict(meta, version=0)), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_country_arrays(str(tmp_path))
@@ -0,0 +1,69 @@
+"""Pruebas de src/cache.py."""
+
+import glob
+import os
+
+import pandas as pd
+
+from src import cache
+from src.cache import compute_source_fingerprint, load_cleaned_dataset, save_cleaned_dataset
+
+HEADER = 'Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered\n'
+
+
+def _write_sources(directory):
+    """Dos reportes diarios y un archivo de continentes en directory."""
+    (directory / '03-01-2020.csv').write_text(HEADER + ',Chile,2020-03-01T10:00:00,1,0,0\n', encoding='utf-8')
+    (directory / '03-02-2020.csv').write_text(HEADER + ',Chile,2020-03-02T10:00:00,3,0,0\n', encoding='utf-8')
+    (directory / 'continents.csv').write_text('country,continent\nChile,South America\n', encoding='utf-8')
+    return str(directory), str(directory / 'continents.csv')
+
+
+def _load(data_dir, mapping_file, cache_dir):
+    return load_cleaned_dataset('2020-03-01', '2020-03-02', data_dir=data_dir, mapping_file=mapping_file,
+                                cache_dir=cache_dir, verbose=False)
+
+
+def test_second_load_reads_the_cache(tmp_path, monkeypatch):
+    data_dir, mapping_file = _write_sources(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    first = _load(data_dir, mapping_file, cache_dir)
+    assert len(glob.glob(os.path.join(cache_dir, '*.parquet'))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería volver a leer los CSV")
+
+    monkeypatch.setattr(cache, 'load_daily_reports', fail)
+    second = _load(data_dir, mapping_file, cache_dir)
+    assert second['continent'].tolist() == ['South America', 'South America']
+    pd.testing.assert_frame_equal(second, first, check_dtype=False)
+
+
+def test_changed_sources_invalidate_the_cache(tmp_path):
+    data_dir, mapping_file = _write_sources(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    _load(data_dir, mapping_file, cache_dir)
+    before = compute_source_fingerprint('2020-03-01', '2020-03-02', data_dir, mapping_file)
+
+    (tmp_path / '03-02-2020.csv').write_text(HEADER + ',Chile,2020-03-02T10:00:00,30,1,0\n', encoding='utf-8')
+    assert compute_source_fingerprint('2020-03-01', '2020-03-02', data_dir, mapping_file) != before
+    df = _load(data_dir, mapping_file, cache_dir)
+
+    assert df['confirmed'].tolist() == [1, 30]
+    # El caché del contenido anterior se elimina
+    assert len(glob.glob(os.path.join(cache_dir, '*.parquet'))) == 1
+
+
+def test_mapping_file_is_part_of_the_fingerprint(tmp_path):
+    data_dir, mapping_file = _write_sources(tmp_path)
+    before = compute_source_fingerprint('2020-03-01', '2020-03-02', data_dir, mapping_file)
+    (tmp_path / 'continents.csv').write_text('country,continent\nChile,Americas\n', encoding='utf-8')
+    assert compute_source_fingerprint('2020-03-01', '2020-03-02', data_dir, mapping_file) != before
+
+
+def test_save_cleaned_dataset_reports_failures(tmp_path):
+    df = pd.DataFrame({'confirmed': [1, 2]})
+    assert save_cleaned_dataset(df, str(tmp_path / 'ok' / 'data.parquet'), verbose=False)
+    (tmp_path / 'file').write_text('no es un directorio')
+    assert not save_cleaned_dataset(df, str(tmp_path / 'file' / 'data.parquet'), verbose=False)
+    assert not os.path.exists(tmp_path / 'file' / 'data.parquet.tmp')
@@ -0,0 +1,236 @@
+"""Pruebas de src/config.py."""
+
+import logging
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from src import config
+from src.config import (SCHEMA_COLUMNS, _notify, add_stage_hook, clean_covid_data, consolidate_duplicate_columns,
+                        detect_schema_era, format_report, get_country_table, homogenize_country_names,
+                        load_continent_mapping, load_daily_reports, optimize_dtypes, parse_last_update,
+                        remove_stage_hook, resolve_country, run_stage)
+
+
+def test_parse_last_update_uses_each_era_format():
+    values = pd.Series(['1/22/2020 17:00', '2020-03-22T23:45:00', '3/8/20 5:31',
+                        '2020-06-01 02:33:44', None, 'no es fecha'])
+    parsed = parse_last_update(values)
+    assert parsed.tolist()[:4] == [pd.Timestamp('2020-01-22 17:00'), pd.Timestamp('2020-03-22 23:45'),
+                                   pd.Timestamp('2020-03-08 05:31'), pd.Timestamp('2020-06-01 02:33:44')]
+    assert parsed.iloc[4:].isna().all()
+
+
+def test_parse_last_update_clears_the_memo_on_overflow(monkeypatch):
+    monkeypatch.setattr(config, 'LAST_UPDATE_CACHE_SIZE', 3)
+    monkeypatch.setattr(config, '_LAST_UPDATE_CACHE', {'2020-01-01 00:00': 'valor viejo'})
+    values = pd.Series([f'2020-04-0{day} 10:00' for day in range(1, 6)] + ['2020-04-01 10:00'])
+
+    parsed = parse_last_update(values)
+
+    # El memo se vació antes de guardar los textos nuevos y el resultado no depende de él
+    assert '2020-01-01 00:00' not in config._LAST_UPDATE_CACHE
+    assert parsed.tolist() == [pd.Timestamp(f'2020-04-0{day} 10:00') for day in range(1, 6)] + \
+        [pd.Timestamp('2020-04-01 10:00')]
+
+
+def test_parse_last_update_survives_a_memo_cleared_concurrently(monkeypatch):
+    class ClearedByAnotherThread(dict):
+        """Memo que otro hilo vacía justo después de cada consulta o actualización."""
+
+        def get(self, key, default=None):
+            value = super().get(key, default)
+            self.clear()
+            return value
+
+        def update(self, *args, **kwargs):
+            super().update(*args, **kwargs)
+            self.clear()
+
+    memo = ClearedByAnotherThread({'2020-04-01 10:00': pd.Timestamp('2020-04-01 10:00').to_datetime64()})
+    monkeypatch.setattr(config, '_LAST_UPDATE_CACHE', memo)
+    parsed = parse_last_update(pd.Series(['2020-04-01 10:00', '2020-04-02 10:00']))
+    assert parsed.tolist() == [pd.Timestamp('2020-04-01 10:00'), pd.Timestamp('2020-04-02 10:00')]
+
+
+def test_optimize_dtypes_downcasts_only_floats_that_round_trip():
+    df = pd.DataFrame({
+        'country_region': ['Chile', 'Chile', 'Peru'],
+        'confirmed': [1, 2, 300],
+        'incident_rate': [0.1, 2.5, float('nan')],
+        'huge': [1e300, 1.0, 2.0],
+        'count_with_nulls': [16_777_217.0, float('nan'), 3.0],
+        'date': pd.to_datetime(['2020-03-01', '2020-03-02', '2020-03-02']),
+    })
+    report = []
+    result = optimize_dtypes(df, verbose=False, report=report)
+
+    assert isinstance(result['country_region'].dtype, pd.CategoricalDtype)
+    assert result['confirmed'].dtype == 'int16'
+    assert result['incident_rate'].dtype == 'float32'
+    assert result['huge'].dtype == 'float64' and result['count_with_nulls'].dtype == 'float64'
+    assert result['date'].dtype == df['date'].dtype
+    assert report[0]['stage'] == 'optimize_dtypes'
+    assert report[0]['memory_deep_after_mb'] < report[0]['memory_deep_before_mb']
+
+
+def _write_daily_reports(directory):
+    """Tres reportes diarios (dos eras de esquema) y un día faltante (03-03-2020)."""
+    files = {
+        '03-01-2020.csv': 'Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered\n'
+                          ',Chile,2020-03-01T10:00:00,1,,\nHubei,Mainland China,2020-03-01T10:00:00,100,5,20\n',
+        '03-02-2020.csv': 'Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered,Latitude,Longitude\n'
+                          ',Chile,2020-03-02T10:00:00,3,0,0,-30.0,-71.0\n',
+        '03-04-2020.csv': 'FIPS,Admin2,Province_State,Country_Region,Last_Update,Lat,Long_,Confirmed,Deaths,'
+                          'Recovered,Active,Combined_Key,Incidence_Rate,Case-Fatality_Ratio\n'
+                          ',,,Chile,2020-03-04 10:00:00,-30.0,-71.0,8,1,2,5,Chile,0.04,12.5\n',
+    }
+    for name, text in files.items():
+        (directory / name).write_text(text, encoding='utf-8')
+    return str(directory)
+
+
+def test_load_daily_reports_parallel_matches_sequential(tmp_path):
+    data_dir = _write_daily_reports(tmp_path)
+    sequential = load_daily_reports('2020-03-01', '2020-03-04', data_dir=data_dir, verbose=False)
+    threads = load_daily_reports('2020-03-01', '2020-03-04', data_dir=data_dir, workers=2, verbose=False)
+    processes = load_daily_reports('2020-03-01', '2020-03-04', data_dir=data_dir, workers=2,
+                                   executor='process', verbose=False)
+
+    assert len(sequential) == 4
+    assert sequential['Date'].dt.day.tolist() == [1, 1, 2, 4]
+    pd.testing.assert_frame_equal(threads, sequential)
+    pd.testing.assert_frame_equal(processes, sequential)
+
+
+def test_load_daily_reports_rejects_unknown_executor(tmp_path):
+    with pytest.raises(ValueError):
+        load_daily_reports('2020-03-01', '2020-03-04', data_dir=_write_daily_reports(tmp_path), workers=2,
+                           executor='gpu', verbose=False)
+
+
+def test_detect_schema_era_from_header():
+    assert detect_schema_era(['Province/State', 'Country/Region', 'Last Update', 'Confirmed']) == 'slash_headers'
+    assert detect_schema_era(['FIPS', 'Province_State', 'Country_Region', 'Last_Update']) == 'underscore_headers'
+    assert detect_schema_era(['Country', 'Confirmed']) is None
+
+
+def test_load_daily_reports_normalizes_every_era(tmp_path):
+    df = load_daily_reports('2020-03-01', '2020-03-04', data_dir=_write_daily_reports(tmp_path), verbose=False)
+
+    assert set(df.columns) == set(SCHEMA_COLUMNS) | {'Date'}
+    assert df['Confirmed'].dtype == 'float64'
+    assert df['Last_Update'].tolist()[-1] == '2020-03-04 10:00:00'
+    assert df['Incident_Rate'].tolist()[-1] == 0.04 and df['Case_Fatality_Ratio'].tolist()[-1] == 12.5
+    assert df['Active'].iloc[:3].isna().all()
+
+
+def test_clean_covid_data_reports_each_stage_to_the_list_and_hooks(tmp_path):
+    df = load_daily_reports('2020-03-01', '2020-03-04', data_dir=_write_daily_reports(tmp_path), verbose=False)
+    report, hooked = [], []
+    add_stage_hook(hooked.append)
+    try:
+        clean_covid_data(df, verbose=False, report=report)
+    finally:
+        remove_stage_hook(hooked.append)
+
+    stages = [record['stage'] for record in report]
+    assert stages[0] == 'standardize_column_names' and 'homogenize_country_names' in stages
+    assert hooked == report
+    assert all(record['rows_in'] == len(df) for record in report)
+    table = format_report(report)
+    assert table.splitlines()[0].startswith('Etapa') and table.splitlines()[-1].startswith('Total')
+
+
+def test_run_stage_without_listeners_skips_measuring(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería medir la etapa")
+
+    monkeypatch.setattr(config, 'record_stage', fail)
+    df = pd.DataFrame({'x': [1, 2]})
+    assert run_stage('doble', lambda frame: frame * 2, df)['x'].tolist() == [2, 4]
+
+
+def test_notify_uses_a_single_channel(capsys, caplog):
+    log = logging.getLogger('covid.test')
+    with caplog.at_level(logging.INFO, logger='covid.test'):
+        _notify("en consola", logging.WARNING, verbose=True, log=log)
+        _notify("en el logger", logging.ERROR, verbose=False, log=log)
+
+    assert capsys.readouterr().out == "⚠ en consola\n"
+    assert [(record.levelno, record.getMessage()) for record in caplog.records] == [(logging.ERROR, "en el logger")]
+
+
+def test_consolidate_duplicate_columns_takes_the_first_non_null_value():
+    df = pd.DataFrame([[1.0, 'Chile', None, None, 'x'],
+                       [None, 'Peru', 2.0, 5.0, 'y'],
+                       [None, None, None, 6.0, 'z']],
+                      columns=['confirmed', 'country', 'confirmed', 'confirmed', 'country'])
+    result = consolidate_duplicate_columns(df, verbose=False)
+
+    assert list(result.columns) == ['confirmed', 'country']
+    assert result['confirmed'].tolist() == [1.0, 2.0, 6.0]
+    assert result['country'].tolist() == ['Chile', 'Peru', 'z']
+
+
+def test_consolidate_duplicate_columns_mixed_dtypes_and_no_duplicates():
+    df = pd.DataFrame([[None, 3], [1.5, 4]], columns=['rate', 'rate'])
+    assert consolidate_duplicate_columns(df, verbose=False)['rate'].tolist() == [3.0, 1.5]
+
+    unique = pd.DataFrame({'a': [1], 'b': [2]})
+    assert consolidate_duplicate_columns(unique, verbose=False) is unique
+
+
+def test_country_table_resolves_names_and_reloads_a_changed_file(tmp_path):
+    mapping_file = tmp_path / 'continents.csv'
+    mapping_file.write_text('country,continent\nSouth Korea,Asia\nChile,South America\n', encoding='utf-8')
+    table = get_country_table(mapping_file=str(mapping_file))
+
+    assert resolve_country(table, 'Korea, South') == ('South Korea', 'Asia')
+    assert resolve_country(table, 'Atlantis') == ('Atlantis', None)
+    assert get_country_table(mapping_file=str(mapping_file)) is table
+
+    mapping_file.write_text('country,continent\nSouth Korea,Asia\nChile,Americas\nPeru,Americas\n',
+                            encoding='utf-8')
+    reloaded = get_country_table(mapping_file=str(mapping_file))
+    assert reloaded is not table and reloaded['countries'] == 3
+    assert resolve_country(reloaded, 'Chile') == ('Chile', 'Americas')
+
+
+@pytest.mark.parametrize('dtype', ['str', 'category'])
+def test_homogenize_and_map_continents_keep_the_column_type(tmp_path, dtype):
+    mapping_file = tmp_path / 'continents.csv'
+    mapping_file.write_text('country,continent\nChina,Asia\nUnited States,North America\n', encoding='utf-8')
+    df = pd.DataFrame({'country_region': pd.Series(['Mainland China', 'US', 'China', None, 'MS Zaandam'],
+                                                   dtype=dtype)})
+
+    df = homogenize_country_names(df, verbose=False)
+    df = load_continent_mapping(df, mapping_file=str(mapping_file), verbose=False)
+
+    assert df['country_region'].dtype == dtype
+    assert df['country_region'].tolist()[:3] == ['China', 'United States', 'China']
+    assert df['continent'].tolist()[:3] == ['Asia', 'North America', 'Asia']
+    assert df['continent'].iloc[3:].isna().all()
+
+
+def test_load_continent_mapping_without_file_leaves_continent_empty(tmp_path, caplog):
+    df = pd.DataFrame({'country_region': ['Chile']})
+    with caplog.at_level(logging.ERROR, logger='covid.pipeline'):
+        df = load_continent_mapping(df, mapping_file=str(tmp_path / 'missing.csv'), verbose=False)
+    assert df['continent'].isna().all()
+    assert caplog.records
+
+
+def test_importing_config_does_not_load_pandas():
+    probe = ("import sys; from src.config import COUNTRY_MAPPING, DATA_PROCESSED; "
+             "print(sorted(m for m in ('pandas', 'numpy', 'concurrent.futures') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True,
+                            cwd=config.BASE_DIR)
+    assert result.stdout.strip() == '[]'
+
+
+def test_lazy_modules_resolve_on_first_use():
+    assert config.pd.Timestamp('2020-03-01') == pd.Timestamp('2020-03-01')
+    assert config.pd is pd
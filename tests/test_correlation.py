@@ -0,0 +1,52 @@
+"""Pruebas de src/correlation.py."""
+
+import numpy as np
+import pandas as pd
+
+from src.correlation import (build_correlation_engine, country_correlation_engine, rolling_correlation,
+                             window_correlation)
+
+
+def _incidence(country, seed, days=60):
+    """Incidencia diaria sintética de un país, con valores grandes para probar la precisión."""
+    rng = np.random.default_rng(seed)
+    new_confirmed = rng.poisson(5000, size=days) + np.arange(days) * 100
+    new_deaths = rng.binomial(new_confirmed, 0.02)
+    new_recovered = rng.binomial(new_confirmed, 0.7)
+    return pd.DataFrame({'country_region': country, 'date': pd.date_range('2020-04-01', periods=days),
+                         'new_confirmed': new_confirmed, 'new_deaths': new_deaths,
+                         'new_recovered': new_recovered})
+
+
+def test_window_correlation_matches_pandas_corr():
+    df = _incidence('Chile', 0)
+    engine = build_correlation_engine(df)
+    expected_frame = df.assign(new_active=df['new_confirmed'] - df['new_deaths'] - df['new_recovered'])
+    metrics = engine['metrics']
+    assert metrics == ['new_confirmed', 'new_deaths', 'new_recovered', 'new_active']
+
+    pd.testing.assert_frame_equal(window_correlation(engine), expected_frame[metrics].corr())
+    in_range = expected_frame['date'].between('2020-04-10', '2020-05-05')
+    pd.testing.assert_frame_equal(window_correlation(engine, '2020-04-10', '2020-05-05'),
+                                  expected_frame.loc[in_range, metrics].corr())
+    assert window_correlation(engine, '2020-04-10', '2020-04-10').isna().all().all()
+
+
+def test_country_windows_do_not_mix_series():
+    df = pd.concat([_incidence('Chile', 0), _incidence('Peru', 1)], ignore_index=True)
+    engine = country_correlation_engine(df, metrics=['new_confirmed', 'new_deaths'])
+    peru = df[df['country_region'] == 'Peru']
+    assert np.isclose(window_correlation(engine, group='Peru').iloc[0, 1],
+                      peru['new_confirmed'].corr(peru['new_deaths']))
+    assert window_correlation(engine, group='Atlantis').isna().all().all()
+
+
+def test_rolling_correlation_matches_pandas_rolling():
+    df = pd.concat([_incidence('Chile', 0), _incidence('Peru', 1)], ignore_index=True)
+    engine = country_correlation_engine(df, metrics=['new_confirmed', 'new_deaths'])
+    result = rolling_correlation(engine, window=14)
+
+    for country, group in df.groupby('country_region'):
+        expected = group['new_confirmed'].rolling(14).corr(group['new_deaths']).to_numpy()
+        actual = result.loc[result['country_region'] == country, 'corr_new_confirmed__new_deaths'].to_numpy()
+        np.testing.assert_allclose(actual, expected, equal_nan=True)
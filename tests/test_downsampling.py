@@ -0,0 +1,47 @@
+"""Pruebas de src/downsampling.py."""
+
+import numpy as np
+import pandas as pd
+
+from src.downsampling import downsample_frame, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_point_count():
+    x = np.arange(1000)
+    y = np.sin(x / 20.0)
+    selected = lttb_indices(x, y, 50)
+    assert len(selected) == 50
+    assert selected[0] == 0 and selected[-1] == 999
+    assert (np.diff(selected) > 0).all()
+
+
+def test_lttb_keeps_an_isolated_peak():
+    y = np.zeros(300)
+    y[137] = 100.0
+    assert 137 in lttb_indices(np.arange(300), y, 20)
+
+
+def test_lttb_returns_everything_when_asked_for_more_points():
+    assert lttb_indices(np.arange(10), np.arange(10), 50).tolist() == list(range(10))
+
+
+def test_downsample_frame_methods_by_length():
+    dates = pd.date_range('2020-01-01', periods=120)
+    df = pd.DataFrame({'date': dates, 'new_confirmed': np.arange(120.0)})
+    assert downsample_frame(df, ['new_confirmed'], max_points=200)[1] == 'raw'
+    frame, method = downsample_frame(df, ['new_confirmed'], max_points=80)
+    assert method == 'lttb' and len(frame) == 80
+    assert downsample_frame(df, ['new_confirmed'], max_points=80, weekly_factor=1)[1] == 'weekly'
+
+
+def test_weekly_aggregation_keeps_peaks_and_last_cumulative():
+    dates = pd.date_range('2020-01-06', periods=14)  # dos semanas completas (lunes a domingo)
+    new = np.ones(14)
+    new[3] = 50.0
+    df = pd.DataFrame({'date': dates, 'new_confirmed': new, 'confirmed': np.cumsum(new)})
+
+    weekly, method = downsample_frame(df, ['new_confirmed', 'confirmed'], max_points=3)
+
+    assert method == 'weekly'
+    assert weekly['new_confirmed'].tolist() == [50.0, 1.0]
+    assert weekly['confirmed'].tolist() == [new[:7].sum(), new.sum()]
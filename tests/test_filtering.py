@@ -0,0 +1,79 @@
+"""Pruebas de src/filtering.py."""
+
+import pandas as pd
+
+from src.filtering import build_filter_index, filter_with_index, normalize_selection
+
+
+def _frame():
+    """Cuatro países de dos continentes con cuatro días desordenados."""
+    rows = []
+    for continent, country in (('Europe', 'Spain'), ('Asia', 'Japan'), ('Europe', 'Italy'), ('Asia', 'China')):
+        for day in (4, 2, 1, 3):
+            rows.append((continent, country, pd.Timestamp(f'2020-03-0{day}'), day))
+    return pd.DataFrame(rows, columns=['continent', 'country_region', 'date', 'confirmed'])
+
+
+def _masked(df, continent='Todos', countries=None, date_range=None):
+    """Filtro de referencia con máscaras booleanas."""
+    mask = pd.Series(True, index=df.index)
+    if continent != 'Todos':
+        mask &= df['continent'] == continent
+    if countries:
+        mask &= df['country_region'].isin(countries)
+    if date_range is not None:
+        mask &= df['date'].between(pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1]))
+    return df[mask].sort_values(['continent', 'country_region', 'date']).reset_index(drop=True)
+
+
+def test_filter_with_index_matches_boolean_masks():
+    df = _frame()
+    index = build_filter_index(df)
+    selections = [
+        {},
+        {'continent': 'Europe'},
+        {'countries': ['China', 'Spain']},
+        {'continent': 'Asia', 'countries': ['Spain']},
+        {'continent': 'Europe', 'date_range': ('2020-03-02', '2020-03-03')},
+        {'countries': ['Italy', 'Japan'], 'date_range': ('2020-03-04', '2020-03-10')},
+        {'continent': 'Oceania'},
+    ]
+    for selection in selections:
+        result = filter_with_index(index, **selection).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, _masked(df, **selection))
+
+
+def test_build_filter_index_offsets():
+    index = build_filter_index(_frame())
+    assert index['continents'] == {'Asia': ['China', 'Japan'], 'Europe': ['Italy', 'Spain']}
+    assert index['countries']['Japan'] == (4, 8)
+    assert index['date_bounds'] == (pd.Timestamp('2020-03-01'), pd.Timestamp('2020-03-04'))
+
+
+def test_normalize_selection_is_canonical():
+    index = build_filter_index(_frame())
+    everything = ('Europe', (), None)
+    assert normalize_selection(index, 'Europe') == everything
+    assert normalize_selection(index, 'Europe', ['Spain', 'Italy', 'China']) == everything
+    assert normalize_selection(index, 'Europe', ['Spain'], ('2020-02-01', '2020-03-04')) == \
+        normalize_selection(index, 'Europe', ['Spain'], ('2020-03-01', '2020-03-10')) == \
+        ('Europe', ('Spain',), None)
+    assert normalize_selection(index, 'Todos', ['Spain'], ('2020-03-02', '2020-03-03')) == \
+        ('Todos', ('Spain',), ('2020-03-02', '2020-03-03'))
+    assert normalize_selection(index, 'Asia', ['Spain']) == ('Asia', ('Spain',), None)
+
+
+def test_filtering_a_normalized_selection_gives_the_same_rows():
+    # El dashboard cachea los agregados por la selección normalizada: filtrar con
+    # ella debe dar lo mismo que filtrar con la selección original
+    index = build_filter_index(_frame())
+    selections = [
+        ('Europe', ['Spain', 'Italy', 'China'], ('2020-01-01', '2020-12-31')),
+        ('Todos', ['Japan'], ('2020-03-02', '2020-03-09')),
+        ('Asia', ['Spain'], None),
+        ('Todos', None, ('2020-03-03', '2020-03-03')),
+    ]
+    for continent, countries, date_range in selections:
+        key_continent, key_countries, key_range = normalize_selection(index, continent, countries, date_range)
+        pd.testing.assert_frame_equal(filter_with_index(index, key_continent, list(key_countries), key_range),
+                                      filter_with_index(index, continent, countries, date_range))
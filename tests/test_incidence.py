@@ -0,0 +1,29 @@
+"""Pruebas de regresión de src/incidence.py."""
+
+import pandas as pd
+
+from src.incidence import build_incidence_cube, compute_incidence
+
+
+def _national_to_provincial():
+    """Serie nacional 1000/1010/1020 reemplazada por provincias A y B (515 cada una)."""
+    dates = pd.date_range('2020-03-01', periods=5)
+    rows = [('Europe', 'X', None, dates[i], value) for i, value in enumerate([1000, 1010, 1020])]
+    rows += [('Europe', 'X', province, dates[3], 515) for province in 'AB']
+    rows += [('Europe', 'X', province, dates[4], 520) for province in 'AB']
+    return pd.DataFrame(rows, columns=['continent', 'country_region', 'province_state', 'date', 'confirmed'])
+
+
+def test_national_to_provincial_switch_counts_only_the_change():
+    cube = build_incidence_cube(_national_to_provincial(), metrics=['confirmed'])
+    assert cube['new_confirmed'].tolist() == [1000, 10, 10, 10, 10]
+    assert cube['new_confirmed'].sum() == cube['confirmed'].iloc[-1]
+
+
+def test_new_province_without_replacement_is_counted():
+    df = _national_to_provincial()
+    df = df[df['province_state'] != 'B']
+    df.loc[df['province_state'].isna(), 'province_state'] = 'A0'
+    late = pd.DataFrame([('Europe', 'X', 'C', pd.Timestamp('2020-03-03'), 40)], columns=df.columns)
+    incidence = compute_incidence(pd.concat([df, late], ignore_index=True), metrics=['confirmed'])
+    assert incidence.loc[incidence['province_state'] == 'C', 'new_confirmed'].tolist() == [40]
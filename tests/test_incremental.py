@@ -0,0 +1,68 @@
+"""Pruebas de src/incremental.py."""
+
+import json
+
+from src import incremental
+from src.incremental import MANIFEST_FILENAME, load_incremental_dataset, update_incremental_dataset
+
+HEADER = 'Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered\n'
+
+
+def _write_report(directory, name, confirmed):
+    (directory / name).write_text(HEADER + f',Chile,2020-03-01T10:00:00,{confirmed},0,0\n', encoding='utf-8')
+
+
+def _setup(tmp_path):
+    """Directorio fuente con dos días, archivo de continentes y directorio del dataset."""
+    data_dir = tmp_path / 'raw'
+    data_dir.mkdir()
+    _write_report(data_dir, '03-01-2020.csv', 1)
+    _write_report(data_dir, '03-02-2020.csv', 3)
+    mapping_file = tmp_path / 'continents.csv'
+    mapping_file.write_text('country,continent\nChile,South America\n', encoding='utf-8')
+    return data_dir, str(mapping_file), str(tmp_path / 'store')
+
+
+def _update(data_dir, mapping_file, store_dir):
+    return update_incremental_dataset(data_dir=str(data_dir), store_dir=store_dir,
+                                      mapping_file=mapping_file, verbose=False)
+
+
+def test_update_processes_only_the_delta(tmp_path):
+    data_dir, mapping_file, store_dir = _setup(tmp_path)
+    first = _update(data_dir, mapping_file, store_dir)
+    assert first['new'] == ['03-01-2020.csv', '03-02-2020.csv'] and first['rows_added'] == 2
+
+    assert _update(data_dir, mapping_file, store_dir)['rows_added'] == 0
+
+    _write_report(data_dir, '03-02-2020.csv', 30)
+    _write_report(data_dir, '03-03-2020.csv', 40)
+    (data_dir / '03-01-2020.csv').unlink()
+    summary = _update(data_dir, mapping_file, store_dir)
+
+    assert (summary['new'], summary['changed'], summary['removed']) == \
+        (['03-03-2020.csv'], ['03-02-2020.csv'], ['03-01-2020.csv'])
+    with open(f'{store_dir}/{MANIFEST_FILENAME}', encoding='utf-8') as f:
+        assert sorted(json.load(f)['files']) == ['03-02-2020.csv', '03-03-2020.csv']
+    df = load_incremental_dataset(store_dir)
+    assert df['confirmed'].tolist() == [30, 40]
+    assert load_incremental_dataset(store_dir, start_date='2020-03-03')['confirmed'].tolist() == [40]
+
+
+def test_failed_saves_are_retried_next_time(tmp_path, monkeypatch):
+    data_dir, mapping_file, store_dir = _setup(tmp_path)
+    monkeypatch.setattr(incremental, 'save_cleaned_dataset', lambda *args, **kwargs: False)
+    summary = _update(data_dir, mapping_file, store_dir)
+    assert summary['failed'] == ['03-01-2020.csv', '03-02-2020.csv'] and summary['rows_added'] == 0
+
+    monkeypatch.undo()
+    assert _update(data_dir, mapping_file, store_dir)['new'] == ['03-01-2020.csv', '03-02-2020.csv']
+
+
+def test_changed_mapping_reprocesses_everything(tmp_path):
+    data_dir, mapping_file, store_dir = _setup(tmp_path)
+    _update(data_dir, mapping_file, store_dir)
+    (tmp_path / 'continents.csv').write_text('country,continent\nChile,Americas\n', encoding='utf-8')
+
+    assert _update(data_dir, mapping_file, store_dir)['new'] == ['03-01-2020.csv', '03-02-2020.csv']
+    assert load_incremental_dataset(store_dir)['continent'].tolist() == ['Americas', 'Americas']
@@ -0,0 +1,61 @@
+"""Pruebas de src/query_service.py."""
+
+import threading
+from urllib.error import HTTPError
+
+import pandas as pd
+import pytest
+
+from src.query_service import QueryError, _selection, build_query_state, make_server, query, query_kpis
+
+
+def _state():
+    """Estado del servicio con tres países y tres días (un nombre con coma)."""
+    rows = []
+    for continent, country, confirmed in (('Asia', 'Korea, South', [10, 20, 40]), ('Asia', 'Japan', [1, 2, 3]),
+                                          ('Europe', 'Spain', [5, 6, 9])):
+        for day, value in enumerate(confirmed, 1):
+            rows.append((continent, country, None, pd.Timestamp(f'2020-03-0{day}'), value, 0, 0, value))
+    df = pd.DataFrame(rows, columns=['continent', 'country_region', 'province_state', 'date',
+                                     'confirmed', 'deaths', 'recovered', 'active_cases'])
+    return build_query_state(df)
+
+
+def test_selection_keeps_country_names_with_commas():
+    state = _state()
+    assert _selection(state, {'country': ['Korea, South']}) == ('Todos', ('Korea, South',), None)
+    assert _selection(state, {'continent': ['Asia'], 'country': ['Japan', 'Korea, South']}) == ('Asia', (), None)
+    assert _selection(state, {'country': ['Spain', ''], 'start': ['2020-03-02']}) == \
+        ('Todos', ('Spain',), ('2020-03-02', '2020-03-03'))
+
+
+@pytest.mark.parametrize('params', [{'country': ['Korea']}, {'continent': ['Atlantis']}, {'start': ['ayer']}])
+def test_selection_rejects_unknown_values(params):
+    with pytest.raises(QueryError):
+        _selection(_state(), params)
+
+
+def test_kpis_use_the_selection_and_cache_it():
+    state = _state()
+    body = query_kpis(state, {'country': ['Korea, South', 'Spain']})
+    assert body['date'] == '2020-03-03'
+    assert body['kpis']['total_confirmed'] == 49 and body['kpis']['delta_confirmed'] == 23
+    assert len(state['cache']) == 1
+
+
+def test_http_round_trip():
+    server = make_server(_state(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        top = query(base_url, 'top', metric='confirmed', n=2)
+        assert [row['country'] for row in top['countries']] == ['Korea, South', 'Spain']
+        series = query(base_url, 'timeseries', country=['Korea, South'], metrics='confirmed')
+        assert series['confirmed'] == [10, 20, 40]
+        with pytest.raises(HTTPError) as error:
+            query(base_url, 'kpis', country='Korea')
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
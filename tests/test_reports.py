@@ -0,0 +1,46 @@
+"""Pruebas de src/reports.py."""
+
+import json
+import os
+
+import pandas as pd
+
+from src.reports import SUMMARY_COLUMNS, _slug, generate_reports
+
+
+def _cleaned_frame():
+    """Dos países de Europa con tres días de acumulados."""
+    dates = pd.date_range('2020-03-01', periods=3)
+    rows = []
+    for country, confirmed in (('Italy', [10, 30, 60]), ('Côte d\'Ivoire', [1, 2, 2])):
+        for date, value in zip(dates, confirmed):
+            rows.append(('Europe', country, None, date, value, 0, 0, value))
+    return pd.DataFrame(rows, columns=['continent', 'country_region', 'province_state', 'date',
+                                       'confirmed', 'deaths', 'recovered', 'active_cases'])
+
+
+def test_generate_reports_with_no_rows_returns_an_empty_summary(tmp_path):
+    summary = generate_reports(_cleaned_frame().iloc[0:0], str(tmp_path), workers=1, charts=False,
+                               verbose=False)
+    assert summary.empty
+    assert list(summary.columns) == SUMMARY_COLUMNS
+
+
+def test_generate_reports_writes_each_entity(tmp_path):
+    summary = generate_reports(_cleaned_frame(), str(tmp_path), workers=1, charts=False, verbose=False)
+
+    countries = summary[summary['type'] == 'country'].set_index('entity')
+    assert countries.loc['Italy', 'confirmed'] == 60
+    assert countries.loc['Italy', 'peak_new_cases'] == 30
+    assert summary.loc[summary['type'] == 'continent', 'confirmed'].tolist() == [62]
+
+    with open(tmp_path / 'index.json', encoding='utf-8') as f:
+        index = json.load(f)
+    assert index['countries'] == 2 and index['continents'] == 1
+    assert os.path.exists(tmp_path / 'countries' / 'cote_d_ivoire.csv')
+    assert pd.read_csv(tmp_path / 'summary_countries.csv')['entity'].tolist() == ['Italy', 'Côte d\'Ivoire']
+
+
+def test_slug_is_ascii():
+    assert _slug('Côte d\'Ivoire') == 'cote_d_ivoire'
+    assert _slug('***') == 'sin_nombre'
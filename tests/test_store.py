@@ -0,0 +1,55 @@
+"""Pruebas de src/store.py."""
+
+import pandas as pd
+import pytest
+
+from src import store
+from src.store import list_partitions, read_store, write_partitioned, write_store
+
+
+def _cleaned_frame():
+    """Tres meses de datos de dos continentes y un crucero sin continente."""
+    dates = pd.to_datetime(['2021-05-31', '2021-06-15', '2021-07-01'])
+    rows = []
+    for continent, country in (('Europe', 'Spain'), ('South America', 'Chile'), (None, 'MS Zaandam')):
+        for day, date in enumerate(dates, 1):
+            rows.append((continent, country, date, day))
+    return pd.DataFrame(rows, columns=['continent', 'country_region', 'date', 'confirmed'])
+
+
+@pytest.mark.parametrize('by_continent', [False, True])
+def test_read_store_prunes_partitions_and_filters_rows(tmp_path, monkeypatch, by_continent):
+    store_dir = str(tmp_path)
+    write_store(_cleaned_frame(), store_dir, partition_by_continent=by_continent, verbose=False)
+
+    opened = []
+    read_parquet = pd.read_parquet
+
+    def tracking_read_parquet(path, **kwargs):
+        opened.append(path)
+        return read_parquet(path, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_parquet', tracking_read_parquet)
+    df = read_store(store_dir, start_date='2021-06-01', end_date='2021-06-30', continents=['Europe'],
+                    columns=['country_region', 'confirmed'])
+
+    assert df.to_dict('list') == {'country_region': ['Spain'], 'confirmed': [2]}
+    assert len(opened) == 1 and 'month=06' in opened[0]
+
+
+def test_store_round_trip_keeps_null_continents(tmp_path):
+    df = _cleaned_frame()
+    write_store(df, str(tmp_path), partition_by_continent=True, verbose=False)
+
+    continents = {partition['continent'] for partition in list_partitions(str(tmp_path))}
+    assert continents == {'Europe', 'South America', None}
+    result = read_store(str(tmp_path))
+    assert len(result) == len(df)
+    assert result['continent'].isna().sum() == 3
+    assert read_store(str(tmp_path), start_date='2022-01-01').empty
+
+
+def test_write_partitioned_raises_when_a_partition_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, 'save_cleaned_dataset', lambda *args, **kwargs: False)
+    with pytest.raises(OSError):
+        write_partitioned(_cleaned_frame(), str(tmp_path))
@@ -0,0 +1,47 @@
+"""Pruebas de src/streaming.py."""
+
+from src.store import read_store
+from src.streaming import stream_to_store
+
+HEADER = 'Province/State,Country/Region,Last Update,Confirmed,Deaths,Recovered\n'
+
+
+def _setup(tmp_path):
+    """Reportes del 27-02-2020 al 02-03-2020 (dos meses) y archivo de continentes."""
+    data_dir = tmp_path / 'raw'
+    data_dir.mkdir()
+    for confirmed, name in enumerate(['02-27-2020', '02-28-2020', '02-29-2020', '03-01-2020', '03-02-2020'], 1):
+        (data_dir / f'{name}.csv').write_text(
+            HEADER + f',Chile,2020-03-01T10:00:00,{confirmed},0,0\n,Peru,2020-03-01T10:00:00,1,0,0\n',
+            encoding='utf-8')
+    mapping_file = tmp_path / 'continents.csv'
+    mapping_file.write_text('country,continent\nChile,South America\nPeru,South America\n', encoding='utf-8')
+    return data_dir, str(mapping_file), str(tmp_path / 'store')
+
+
+def _stream(data_dir, mapping_file, store_dir, start_date, end_date, chunk_days):
+    return stream_to_store(start_date, end_date, store_dir=store_dir, chunk_days=chunk_days,
+                           data_dir=str(data_dir), mapping_file=mapping_file, verbose=False)
+
+
+def test_restreaming_an_overlapping_range_does_not_duplicate_rows(tmp_path):
+    data_dir, mapping_file, store_dir = _setup(tmp_path)
+    summary = _stream(data_dir, mapping_file, store_dir, '2020-02-27', '2020-03-02', 2)
+    assert summary['chunks'] == 3 and summary['rows'] == 10 and len(summary['files']) == 5
+
+    (data_dir / '02-29-2020.csv').unlink()
+    _stream(data_dir, mapping_file, store_dir, '2020-02-28', '2020-03-01', 3)
+
+    df = read_store(store_dir)
+    assert len(df) == 8
+    assert df['date'].dt.day.tolist() == [27, 27, 28, 28, 1, 1, 2, 2]
+    assert df.loc[df['country_region'] == 'Chile', 'confirmed'].tolist() == [1, 2, 4, 5]
+
+
+def test_restreaming_keeps_months_outside_the_range(tmp_path):
+    data_dir, mapping_file, store_dir = _setup(tmp_path)
+    _stream(data_dir, mapping_file, store_dir, '2020-02-27', '2020-03-02', 7)
+    _stream(data_dir, mapping_file, store_dir, '2020-03-01', '2020-03-02', 1)
+
+    assert read_store(store_dir, end_date='2020-02-29')['confirmed'].sum() == 1 + 2 + 3 + 3
+    assert len(read_store(store_dir, start_date='2020-03-01')) == 4
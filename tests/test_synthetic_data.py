@@ -0,0 +1,38 @@
+"""Pruebas de benchmarks/synthetic_data.py."""
+
+import csv
+
+import pandas as pd
+
+from benchmarks.synthetic_data import ERA_HEADERS, generate_daily_reports, schema_era
+from src.config import clean_covid_data, detect_schema_era, load_daily_reports
+
+# Un día de cada era de esquema
+ERA_DAYS = ['2020-01-31', '2020-03-01', '2020-03-22', '2020-05-29', '2020-11-09']
+
+
+def test_generate_daily_reports_writes_each_era(tmp_path):
+    for day in ERA_DAYS:
+        summary = generate_daily_reports(str(tmp_path), day, day, n_countries=22, provinces_per_country=2,
+                                         counties=5)
+        assert summary['files'] == 1
+
+    for day in ERA_DAYS:
+        date = pd.Timestamp(day)
+        with open(tmp_path / date.strftime('%m-%d-%Y.csv'), newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ERA_HEADERS[schema_era(date)]
+        assert detect_schema_era(rows[0]) is not None
+        # 22 países por fila en las eras con barra; US por condado y el resto por provincia después
+        assert len(rows) - 1 == (22 if date < pd.Timestamp('2020-03-22') else 5 + 21 * 2)
+
+
+def test_generated_reports_go_through_the_pipeline(tmp_path):
+    generate_daily_reports(str(tmp_path), '2020-03-20', '2020-03-23', n_countries=20, counties=5)
+    df = clean_covid_data(load_daily_reports('2020-03-20', '2020-03-23', data_dir=str(tmp_path),
+                                             verbose=False), verbose=False)
+
+    assert df['date'].nunique() == 4
+    countries = set(df['country_region'])
+    assert {'United States', 'China', 'South Korea'} <= countries
+    assert not {'US', 'Mainland China', 'Korea, South'} & countries